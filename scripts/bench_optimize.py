@@ -0,0 +1,71 @@
+"""Per-combination overhead of the optimizer's evaluation loop, before and after the slim runner.
+
+"full" is what the grid search used to do for every combination: construct a
+Backtest and build the complete stats Series (trades and equity DataFrames)
+to read five numbers. "slim" constructs the Backtest once per dataset and
+computes only those numbers (``_metrics_runner``).
+
+Usage: PYTHONPATH=src python scripts/bench_optimize.py [--bars 2000] [--strategy macd] [--engine reference]
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from meta_strategy.backtest import PARAM_GRIDS, STRATEGIES, _extract_metrics, _metrics_runner, _prepare, run_strategy
+
+
+def _bars(n: int) -> pd.DataFrame:
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(0).normal(0.0003, 0.02, n)))
+    return pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1e3)},
+        index=pd.date_range("2015-01-01", periods=n, freq="D"),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=2000)
+    parser.add_argument("--strategy", default="macd", choices=list(STRATEGIES))
+    parser.add_argument("--engine", default="reference", choices=["reference", "fast"])
+    args = parser.parse_args()
+
+    data = _prepare(_bars(args.bars), args.engine)
+    strategy_cls = STRATEGIES[args.strategy]
+    grid = PARAM_GRIDS[args.strategy]
+    combos = [dict(zip(grid, c, strict=True)) for c in itertools.product(*grid.values())]
+    warnings.simplefilter("ignore")
+
+    def full() -> None:
+        for params in combos:
+            _extract_metrics(run_strategy(data, strategy_cls, 100_000.0, 0.001, args.engine, **params))
+
+    def slim() -> None:
+        run = _metrics_runner(data, strategy_cls, 100_000.0, 0.001, args.engine)
+        for params in combos:
+            _extract_metrics(run(**params)[0])
+
+    full()  # warm the indicator cache so both loops measure evaluation only
+    timings = {}
+    for name, loop in (("full", full), ("slim", slim)):
+        best = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            loop()
+            best = min(best, time.perf_counter() - started)
+        timings[name] = best / len(combos) * 1e3
+
+    print(f"{args.strategy} on {args.bars} bars, {len(combos)} combinations, {args.engine} engine")
+    for name, ms in timings.items():
+        print(f"  {name:<5} {ms:8.2f} ms / combination")
+    print(f"  speedup {timings['full'] / timings['slim']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
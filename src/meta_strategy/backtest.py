@@ -6,7 +6,15 @@ but runs locally with real market data via yfinance + backtesting.py.
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import heapq
+import itertools
+import json
+import math
+import os
+import time
+import warnings
+from contextlib import contextmanager
+from typing import IO, TYPE_CHECKING, Any, NamedTuple
 
 import numpy as np
 import pandas as pd
@@ -18,30 +26,53 @@ from backtesting.lib import (
     crossover,
 )
 
+from .batch import ema_matrix, rolling_mean_matrix, rolling_std_matrix, rsi_matrix
+from .indicator_cache import INDICATOR_CACHE, cached_indicator, seed_indicator
+from .journal import Journal
+from .parallel import Throughput, iter_tasks
+from .search import (
+    BAYES_INITIAL,
+    SEARCHES,
+    bayes_suggest,
+    grid_combo,
+    grid_size,
+    halving_rungs,
+    random_sample,
+    survivors,
+)
+from .space import feasible_seqs
+from .store import active_store, data_hash, fingerprint_base, run_fingerprint, store_meta
+
 if TYPE_CHECKING:
-    from collections.abc import Generator
+    from collections.abc import Callable, Generator, Sequence
+    from pathlib import Path
+
+    from .data import DataProvider
+    from .fast import FastData
+    from .store import ResultStore
+
+
+@contextmanager
+def _patched(obj: Any, attr: str, val: Any) -> Generator[None, None, None]:
+    orig = getattr(obj, attr)
+    setattr(obj, attr, val)
+    try:
+        yield
+    finally:
+        setattr(obj, attr, orig)
 
 
 class Backtest(_FractionalBacktest):
     """FractionalBacktest with numpy read-only array workaround."""
 
+    _calendar: FastData | None = None
+
     def run(self, **kwargs: Any) -> pd.Series:  # type: ignore[override]
         # Workaround: FractionalBacktest.run() does `indicator /= unit` which
         # fails on read-only numpy arrays. We make them writable first.
-        from contextlib import contextmanager
-
         original_run = _FractionalBacktest.__bases__[0].run  # Backtest.run
 
-        @contextmanager
-        def _patch(obj: Any, attr: str, val: Any) -> Generator[None, None, None]:
-            orig = getattr(obj, attr)
-            setattr(obj, attr, val)
-            try:
-                yield
-            finally:
-                setattr(obj, attr, orig)
-
-        with _patch(self, "_data", self._FractionalBacktest__data):
+        with _patched(self, "_data", self._FractionalBacktest__data):
             result = original_run(self, **kwargs)
 
         trades = result["_trades"]
@@ -56,161 +87,241 @@ class Backtest(_FractionalBacktest):
 
         return result  # type: ignore[return-value, no-any-return]
 
+    def run_metrics(self, **kwargs: Any) -> tuple[dict[str, Any], np.ndarray]:
+        """Run without building the stats Series; returns the optimizer's stats and the equity curve.
+
+        backtesting.py's compute_stats (trade and equity DataFrames, ~30
+        stats) is swapped for the five reductions _extract_metrics reads. The
+        Sharpe ratio uses the fast engine's calendar, which replicates
+        compute_stats, so the values equal run()'s.
+        """
+        import backtesting.backtesting as bt_module
+
+        from .fast import prepare, sharpe_ratio
+
+        captured: dict[str, Any] = {}
+
+        def _capture(**kw: Any) -> None:
+            captured.update(kw)
+
+        original_run = _FractionalBacktest.__bases__[0].run
+        with _patched(self, "_data", self._FractionalBacktest__data), _patched(bt_module, "compute_stats", _capture):
+            original_run(self, **kwargs)
+
+        if self._calendar is None:
+            self._calendar = prepare(self._data)
+        equity = captured["equity"]
+        pnl = np.array([t.pl for t in captured["trades"]], dtype=float)
+        drawdown = 1 - equity / np.maximum.accumulate(equity)
+        stats = {
+            "Return [%]": (equity[-1] - equity[0]) / equity[0] * 100,
+            "Sharpe Ratio": sharpe_ratio(equity, self._calendar),
+            "# Trades": len(pnl),
+            "Max. Drawdown [%]": -np.nan_to_num(drawdown.max()) * 100,
+            "Win Rate [%]": (pnl > 0).mean() * 100 if len(pnl) else np.nan,
+        }
+        return stats, equity
+
 
 # === Indicator functions (used by backtesting.py's self.I()) ===
+#
+# Every indicator is memoized through meta_strategy.indicator_cache, keyed on
+# its parameters and a fingerprint of the input arrays. Composite indicators
+# call the cached building blocks (sma, rolling_std, ema, rsi) so shared
+# pieces such as the MACD EMAs or the Bollinger basis are computed once. The
+# building blocks are single columns of the grid kernels in
+# meta_strategy.batch, which optimize_strategy uses to seed the cache for a
+# whole parameter grid at once.
+
+
+def _column(matrix: np.ndarray, close: pd.Series) -> pd.Series:
+    return pd.Series(matrix[:, 0], index=close.index, name=close.name)
+
+
+@cached_indicator
+def rolling_std(close: pd.Series, length: int = 20) -> pd.Series:
+    """Population (ddof=0) rolling standard deviation (see meta_strategy.batch for its agreement with pandas)."""
+    close = pd.Series(close)
+    return _column(rolling_std_matrix(close.to_numpy(), [length]), close)
 
 
+@cached_indicator
 def bollinger_upper(close: pd.Series, length: int = 20, mult: float = 2.0) -> pd.Series:
     close = pd.Series(close)
-    basis = close.rolling(length).mean()
-    dev = mult * close.rolling(length).std(ddof=0)
-    return basis + dev
+    return sma(close, length) + mult * rolling_std(close, length)
 
 
+@cached_indicator
 def bollinger_lower(close: pd.Series, length: int = 20, mult: float = 2.0) -> pd.Series:
     close = pd.Series(close)
-    basis = close.rolling(length).mean()
-    dev = mult * close.rolling(length).std(ddof=0)
-    return basis - dev
+    return sma(close, length) - mult * rolling_std(close, length)
 
 
-def supertrend_line(
-    high: pd.Series, low: pd.Series, close: pd.Series, period: int = 10, factor: float = 3.0
-) -> pd.Series:
-    """Calculate SuperTrend line. Returns the supertrend value per bar."""
-    high, low, close = pd.Series(high), pd.Series(low), pd.Series(close)
-    hl2 = (high + low) / 2
-    # ATR calculation
-    tr = pd.concat([high - low, (high - close.shift(1)).abs(), (low - close.shift(1)).abs()], axis=1).max(axis=1)
-    atr = tr.rolling(period).mean()
+class SuperTrend(NamedTuple):
+    """Outputs of the fused SuperTrend kernel, one value per bar."""
 
-    upper_band = hl2 + factor * atr
-    lower_band = hl2 - factor * atr
+    line: np.ndarray  # final_lower while bullish, final_upper while bearish (0.0 before the first valid bar)
+    direction: np.ndarray  # +1 bullish (green), -1 bearish (red)
+    upper: np.ndarray  # final (ratcheted) upper band
+    lower: np.ndarray  # final (ratcheted) lower band
 
-    n = len(close)
-    st = np.zeros(n)
-    direction = np.ones(n, dtype=int)
-    final_upper = upper_band.values.copy()
-    final_lower = lower_band.values.copy()
 
-    for i in range(1, n):
-        if np.isnan(lower_band.iloc[i]) or np.isnan(upper_band.iloc[i]):
+def _supertrend_loop(
+    upper_band: Any,
+    lower_band: Any,
+    close: Any,
+    st: Any,
+    direction: Any,
+    final_upper: Any,
+    final_lower: Any,
+) -> None:
+    """Band ratchet and direction recurrence, filling the output sequences in place.
+
+    Runs on NumPy arrays under numba, or on plain lists (fast scalar indexing) without it.
+    """
+    for i in range(1, len(close)):
+        if math.isnan(lower_band[i]) or math.isnan(upper_band[i]):
             continue
         # Initialize on first valid bar
-        if np.isnan(final_lower[i - 1]):
-            final_lower[i] = lower_band.iloc[i]
-            final_upper[i] = upper_band.iloc[i]
+        if math.isnan(final_lower[i - 1]):
+            final_lower[i] = lower_band[i]
+            final_upper[i] = upper_band[i]
             st[i] = final_lower[i]
             continue
         # Lower band (support) — only moves up
-        if lower_band.iloc[i] > final_lower[i - 1] or close.iloc[i - 1] < final_lower[i - 1]:
-            final_lower[i] = lower_band.iloc[i]
+        if lower_band[i] > final_lower[i - 1] or close[i - 1] < final_lower[i - 1]:
+            final_lower[i] = lower_band[i]
         else:
             final_lower[i] = final_lower[i - 1]
-
         # Upper band (resistance) — only moves down
-        if upper_band.iloc[i] < final_upper[i - 1] or close.iloc[i - 1] > final_upper[i - 1]:
-            final_upper[i] = upper_band.iloc[i]
+        if upper_band[i] < final_upper[i - 1] or close[i - 1] > final_upper[i - 1]:
+            final_upper[i] = upper_band[i]
         else:
             final_upper[i] = final_upper[i - 1]
-
         # Direction: bullish checks lower band (support), bearish checks upper band (resistance)
-        if direction[i - 1] == 1 and close.iloc[i] < final_lower[i]:
+        if direction[i - 1] == 1 and close[i] < final_lower[i]:
             direction[i] = -1
-        elif direction[i - 1] == -1 and close.iloc[i] > final_upper[i]:
+        elif direction[i - 1] == -1 and close[i] > final_upper[i]:
             direction[i] = 1
         else:
             direction[i] = direction[i - 1]
-
         st[i] = final_lower[i] if direction[i] == 1 else final_upper[i]
 
-    return pd.Series(st, index=close.index)
 
+try:  # optional JIT; the list-based loop below is the fallback
+    from numba import njit  # type: ignore[import-not-found, import-untyped, unused-ignore]
+
+    _supertrend_jit: Any = njit(cache=True)(_supertrend_loop)
+except ImportError:
+    _supertrend_jit = None
 
-def supertrend_direction(
-    high: pd.Series, low: pd.Series, close: pd.Series, period: int = 10, factor: float = 3.0
-) -> pd.Series:
-    """Returns +1 for bullish (green), -1 for bearish (red)."""
-    high, low, close = pd.Series(high), pd.Series(low), pd.Series(close)
-    hl2 = (high + low) / 2
-    tr = pd.concat([high - low, (high - close.shift(1)).abs(), (low - close.shift(1)).abs()], axis=1).max(axis=1)
-    atr = tr.rolling(period).mean()
 
+@cached_indicator
+def supertrend(
+    high: pd.Series | np.ndarray,
+    low: pd.Series | np.ndarray,
+    close: pd.Series | np.ndarray,
+    period: int = 10,
+    factor: float = 3.0,
+) -> SuperTrend:
+    """Fused SuperTrend: ATR bands, ratcheted final bands, direction and line in one pass.
+
+    The ATR is pandas' rolling mean of the true range, as in the original
+    per-bar implementation (a single period per call gains nothing from the
+    prefix-sum kernels in meta_strategy.batch, which differ from pandas in
+    the last bits). Uses numba when installed, otherwise a pure-Python loop
+    over lists; both match the original implementation bit for bit.
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+    with np.errstate(invalid="ignore"):
+        tr = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+    atr = pd.Series(tr).rolling(period).mean().to_numpy()
+    hl2 = (high + low) / 2
     upper_band = hl2 + factor * atr
     lower_band = hl2 - factor * atr
 
     n = len(close)
-    direction = np.ones(n, dtype=int)
-    final_upper = upper_band.values.copy()
-    final_lower = lower_band.values.copy()
+    if _supertrend_jit is not None:
+        st, direction = np.zeros(n), np.ones(n, dtype=np.int64)
+        final_upper, final_lower = upper_band.copy(), lower_band.copy()
+        _supertrend_jit(upper_band, lower_band, close, st, direction, final_upper, final_lower)
+        return SuperTrend(st, direction, final_upper, final_lower)
 
-    for i in range(1, n):
-        if np.isnan(lower_band.iloc[i]) or np.isnan(upper_band.iloc[i]):
-            continue
-        # Initialize on first valid bar
-        if np.isnan(final_lower[i - 1]):
-            final_lower[i] = lower_band.iloc[i]
-            final_upper[i] = upper_band.iloc[i]
-            continue
-        # Lower band (support) — only moves up
-        if lower_band.iloc[i] > final_lower[i - 1] or close.iloc[i - 1] < final_lower[i - 1]:
-            final_lower[i] = lower_band.iloc[i]
-        else:
-            final_lower[i] = final_lower[i - 1]
-        # Upper band (resistance) — only moves down
-        if upper_band.iloc[i] < final_upper[i - 1] or close.iloc[i - 1] > final_upper[i - 1]:
-            final_upper[i] = upper_band.iloc[i]
-        else:
-            final_upper[i] = final_upper[i - 1]
-        # Direction: bullish checks lower band (support), bearish checks upper band (resistance)
-        if direction[i - 1] == 1 and close.iloc[i] < final_lower[i]:
-            direction[i] = -1
-        elif direction[i - 1] == -1 and close.iloc[i] > final_upper[i]:
-            direction[i] = 1
-        else:
-            direction[i] = direction[i - 1]
+    upper_list, lower_list = upper_band.tolist(), lower_band.tolist()
+    st_list, dir_list, final_upper_list, final_lower_list = [0.0] * n, [1] * n, upper_list[:], lower_list[:]
+    _supertrend_loop(upper_list, lower_list, close.tolist(), st_list, dir_list, final_upper_list, final_lower_list)
+    return SuperTrend(
+        np.array(st_list), np.array(dir_list, dtype=np.int64), np.array(final_upper_list), np.array(final_lower_list)
+    )
 
-    return pd.Series(direction, index=close.index)
 
+def supertrend_line(
+    high: pd.Series, low: pd.Series, close: pd.Series, period: int = 10, factor: float = 3.0
+) -> pd.Series:
+    """Calculate SuperTrend line. Returns the supertrend value per bar."""
+    index = close.index if isinstance(close, pd.Series) else None
+    return pd.Series(supertrend(high, low, close, period, factor).line, index=index)
 
+
+def supertrend_direction(
+    high: pd.Series, low: pd.Series, close: pd.Series, period: int = 10, factor: float = 3.0
+) -> pd.Series:
+    """Returns +1 for bullish (green), -1 for bearish (red)."""
+    index = close.index if isinstance(close, pd.Series) else None
+    return pd.Series(supertrend(high, low, close, period, factor).direction, index=index)
+
+
+@cached_indicator
 def ema(close: pd.Series, length: int = 21) -> pd.Series:
     """Exponential Moving Average."""
     close = pd.Series(close)
-    return close.ewm(span=length, adjust=False).mean()
+    return _column(ema_matrix(close.to_numpy(), [length]), close)
 
 
+@cached_indicator
 def rsi(close: pd.Series, length: int = 14) -> pd.Series:
     """Relative Strength Index."""
     close = pd.Series(close)
-    delta = close.diff()
-    gain = delta.clip(lower=0)
-    loss = (-delta).clip(lower=0)
-    avg_gain = gain.ewm(alpha=1 / length, min_periods=length, adjust=False).mean()
-    avg_loss = loss.ewm(alpha=1 / length, min_periods=length, adjust=False).mean()
-    rs = avg_gain / avg_loss
-    return 100 - (100 / (1 + rs))
+    return _column(rsi_matrix(close.to_numpy(), [length]), close)
 
 
+@cached_indicator
 def macd_line(close: pd.Series, fast: int = 12, slow: int = 26) -> pd.Series:
     """MACD line (fast EMA - slow EMA)."""
     close = pd.Series(close)
-    return close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
+    return ema(close, fast) - ema(close, slow)
 
 
+@cached_indicator
 def macd_signal(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.Series:
     """MACD signal line."""
-    close = pd.Series(close)
-    ml = close.ewm(span=fast, adjust=False).mean() - close.ewm(span=slow, adjust=False).mean()
-    return ml.ewm(span=signal, adjust=False).mean()
+    return ema(macd_line(close, fast, slow), signal)
 
 
+@cached_indicator
 def sma(close: pd.Series, length: int = 200) -> pd.Series:
-    """Simple Moving Average."""
+    """Simple Moving Average; within a few ulps of ``rolling(length).mean()`` (see meta_strategy.batch)."""
     close = pd.Series(close)
-    return close.rolling(length).mean()
+    return _column(rolling_mean_matrix(close.to_numpy(), [length]), close)
 
 
 # === Strategy classes ===
+#
+# Each strategy also exposes ``signals(data, **params)`` for the vectorized
+# engine in ``meta_strategy.fast``: boolean entry/exit arrays evaluated on every
+# bar exactly as ``next()`` would, plus the indicator arrays used for warmup.
+# ``grid_indicators`` maps the batchable building blocks a strategy uses to the
+# parameters holding their lengths (see _seed_grid).
+
+
+def _cross_above(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Vectorized backtesting.lib.crossover(a, b) evaluated at every bar."""
+    out = np.zeros(len(a), dtype=bool)
+    out[1:] = (a[:-1] < b[:-1]) & (a[1:] > b[1:])
+    return out
 
 
 class BollingerBandsStrategy(Strategy):
@@ -223,6 +334,7 @@ class BollingerBandsStrategy(Strategy):
 
     length = 20
     mult = 2.0
+    grid_indicators = {"sma": ("length",), "rolling_std": ("length",)}
 
     def init(self) -> None:
         self.upper = self.I(bollinger_upper, self.data.Close, self.length, self.mult)
@@ -240,6 +352,15 @@ class BollingerBandsStrategy(Strategy):
         close = data["Close"]
         return [bollinger_upper(close, cls.length, cls.mult), bollinger_lower(close, cls.length, cls.mult)]
 
+    @classmethod
+    def signals(cls, data: pd.DataFrame, **params: Any) -> tuple[np.ndarray, np.ndarray, list[np.ndarray]]:
+        length, mult = params.get("length", cls.length), params.get("mult", cls.mult)
+        close = data["Close"]
+        upper = bollinger_upper(close, length, mult).to_numpy()
+        lower = bollinger_lower(close, length, mult).to_numpy()
+        price = close.to_numpy()
+        return price > upper, price < lower, [upper, lower]
+
 
 class SuperTrendStrategy(Strategy):
     """SuperTrend trend-following.
@@ -265,7 +386,17 @@ class SuperTrendStrategy(Strategy):
 
     @classmethod
     def warmup_indicators(cls, data: pd.DataFrame) -> list[pd.Series]:
-        return [supertrend_direction(data["High"], data["Low"], data["Close"], cls.period, cls.factor)]
+        return [pd.Series(supertrend(data["High"], data["Low"], data["Close"], cls.period, cls.factor).direction)]
+
+    @classmethod
+    def signals(cls, data: pd.DataFrame, **params: Any) -> tuple[np.ndarray, np.ndarray, list[np.ndarray]]:
+        period, factor = params.get("period", cls.period), params.get("factor", cls.factor)
+        direction = supertrend(data["High"], data["Low"], data["Close"], period, factor).direction
+        entries = np.zeros(len(direction), dtype=bool)
+        exits = np.zeros(len(direction), dtype=bool)
+        entries[1:] = (direction[1:] == 1) & (direction[:-1] == -1)
+        exits[1:] = (direction[1:] == -1) & (direction[:-1] == 1)
+        return entries, exits, [direction]
 
 
 class BullMarketSupportBandStrategy(Strategy):
@@ -279,6 +410,7 @@ class BullMarketSupportBandStrategy(Strategy):
 
     sma_length = 20
     ema_length = 21
+    grid_indicators = {"sma": ("sma_length",), "ema": ("ema_length",)}
 
     def init(self) -> None:
         self.sma = self.I(sma, self.data.Close, self.sma_length)
@@ -296,6 +428,13 @@ class BullMarketSupportBandStrategy(Strategy):
         close = data["Close"]
         return [sma(close, cls.sma_length), ema(close, cls.ema_length)]
 
+    @classmethod
+    def signals(cls, data: pd.DataFrame, **params: Any) -> tuple[np.ndarray, np.ndarray, list[np.ndarray]]:
+        close = data["Close"]
+        sma_val = sma(close, params.get("sma_length", cls.sma_length)).to_numpy()
+        ema_val = ema(close, params.get("ema_length", cls.ema_length)).to_numpy()
+        return _cross_above(ema_val, sma_val), _cross_above(sma_val, ema_val), [sma_val, ema_val]
+
 
 class RSIStrategy(Strategy):
     """RSI overbought/oversold with 200 SMA trend filter.
@@ -308,6 +447,7 @@ class RSIStrategy(Strategy):
     overbought = 70
     oversold = 30
     sma_length = 200
+    grid_indicators = {"rsi": ("rsi_length",), "sma": ("sma_length",)}
 
     def init(self) -> None:
         self.rsi_val = self.I(rsi, self.data.Close, self.rsi_length)
@@ -325,6 +465,15 @@ class RSIStrategy(Strategy):
         close = data["Close"]
         return [rsi(close, cls.rsi_length), sma(close, cls.sma_length)]
 
+    @classmethod
+    def signals(cls, data: pd.DataFrame, **params: Any) -> tuple[np.ndarray, np.ndarray, list[np.ndarray]]:
+        close = data["Close"]
+        rsi_val = rsi(close, params.get("rsi_length", cls.rsi_length)).to_numpy()
+        sma_val = sma(close, params.get("sma_length", cls.sma_length)).to_numpy()
+        entries = (rsi_val < params.get("oversold", cls.oversold)) & (close.to_numpy() > sma_val)
+        exits = rsi_val > params.get("overbought", cls.overbought)
+        return entries, exits, [rsi_val, sma_val]
+
 
 class MACDStrategy(Strategy):
     """MACD crossover strategy.
@@ -336,6 +485,7 @@ class MACDStrategy(Strategy):
     fast = 12
     slow = 26
     signal_length = 9
+    grid_indicators = {"ema": ("fast", "slow")}
 
     def init(self) -> None:
         self.macd = self.I(macd_line, self.data.Close, self.fast, self.slow)
@@ -353,6 +503,14 @@ class MACDStrategy(Strategy):
         close = data["Close"]
         return [macd_line(close, cls.fast, cls.slow), macd_signal(close, cls.fast, cls.slow, cls.signal_length)]
 
+    @classmethod
+    def signals(cls, data: pd.DataFrame, **params: Any) -> tuple[np.ndarray, np.ndarray, list[np.ndarray]]:
+        fast, slow = params.get("fast", cls.fast), params.get("slow", cls.slow)
+        close = data["Close"]
+        macd = macd_line(close, fast, slow).to_numpy()
+        signal = macd_signal(close, fast, slow, params.get("signal_length", cls.signal_length)).to_numpy()
+        return _cross_above(macd, signal), _cross_above(signal, macd), [macd, signal]
+
 
 class ConfluenceStrategy(Strategy):
     """Multi-indicator confluence strategy.
@@ -368,6 +526,12 @@ class ConfluenceStrategy(Strategy):
     macd_fast = 12
     macd_slow = 26
     macd_signal_len = 9
+    grid_indicators = {
+        "sma": ("bb_length",),
+        "rolling_std": ("bb_length",),
+        "rsi": ("rsi_length",),
+        "ema": ("macd_fast", "macd_slow"),
+    }
 
     def init(self) -> None:
         self.bb_upper = self.I(bollinger_upper, self.data.Close, self.bb_length, self.bb_mult)
@@ -398,6 +562,21 @@ class ConfluenceStrategy(Strategy):
             macd_signal(close, cls.macd_fast, cls.macd_slow, cls.macd_signal_len),
         ]
 
+    @classmethod
+    def signals(cls, data: pd.DataFrame, **params: Any) -> tuple[np.ndarray, np.ndarray, list[np.ndarray]]:
+        bb_length, bb_mult = params.get("bb_length", cls.bb_length), params.get("bb_mult", cls.bb_mult)
+        fast, slow = params.get("macd_fast", cls.macd_fast), params.get("macd_slow", cls.macd_slow)
+        close = data["Close"]
+        upper = bollinger_upper(close, bb_length, bb_mult).to_numpy()
+        lower = bollinger_lower(close, bb_length, bb_mult).to_numpy()
+        rsi_val = rsi(close, params.get("rsi_length", cls.rsi_length)).to_numpy()
+        macd = macd_line(close, fast, slow).to_numpy()
+        signal = macd_signal(close, fast, slow, params.get("macd_signal_len", cls.macd_signal_len)).to_numpy()
+        price = close.to_numpy()
+        entries = (price > upper) & (rsi_val < 70) & (macd > signal)
+        exits = (price < lower) | (rsi_val > 80)
+        return entries, exits, [upper, lower, rsi_val, macd, signal]
+
 
 # === Data fetching ===
 
@@ -412,14 +591,21 @@ def fetch_data(
     start: str = "2018-01-01",
     end: str | None = None,
     interval: str = "1d",
+    use_cache: bool | None = None,
 ) -> pd.DataFrame:
     """Fetch OHLCV data via yfinance.
 
     For sub-daily intervals, yfinance limits lookback to ~730 days.
     Start date is auto-clamped if needed.
+
+    Bars are served from the on-disk cache (see ``meta_strategy.data``) and
+    only bars after the last cached timestamp are downloaded. ``use_cache=None``
+    follows the process-wide setting from ``configure_cache()``.
     """
     import yfinance as yf
 
+    from .data import CACHE_SETTINGS, cached_history
+
     if interval not in VALID_INTERVALS:
         raise ValueError(f"Unsupported interval: {interval}. Valid: {sorted(VALID_INTERVALS)}")
 
@@ -433,9 +619,13 @@ def fetch_data(
         if requested < max_start:
             start = max_start.strftime("%Y-%m-%d")
 
-        df = ticker.history(start=start, end=end, interval=interval, auto_adjust=True)
+    def download(dl_start: str, dl_end: str | None) -> pd.DataFrame:
+        return ticker.history(start=dl_start, end=dl_end, interval=interval, auto_adjust=True)  # type: ignore[no-any-return]
+
+    if CACHE_SETTINGS.enabled if use_cache is None else use_cache:
+        df = cached_history(download, symbol, start, end, interval, refresh=CACHE_SETTINGS.refresh)
     else:
-        df = ticker.history(start=start, end=end, interval=interval, auto_adjust=True)
+        df = download(start, end)
 
     # backtesting.py expects columns: Open, High, Low, Close, Volume
     df = df[["Open", "High", "Low", "Close", "Volume"]]
@@ -443,6 +633,27 @@ def fetch_data(
     return df  # type: ignore[return-value, no-any-return]
 
 
+def load_data(
+    data: pd.DataFrame | DataProvider | None,
+    symbol: str,
+    start: str,
+    end: str | None = None,
+    interval: str = "1d",
+) -> pd.DataFrame:
+    """Resolve injected data: a preloaded DataFrame, a provider, or the configured default provider.
+
+    The default provider is yfinance via fetch_data() unless changed with
+    ``meta_strategy.data.configure_data_source()`` (CLI: ``--data-source``).
+    """
+    if isinstance(data, pd.DataFrame):
+        return data
+    if data is None:
+        from .data import default_provider
+
+        data = default_provider()
+    return data.load(symbol, start, end, interval)
+
+
 # === Run backtest ===
 
 STRATEGIES = {
@@ -455,6 +666,85 @@ STRATEGIES = {
 }
 
 
+ENGINES = ("reference", "fast")
+
+
+def _check_engine(engine: str) -> None:
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, got '{engine}'")
+
+
+def _prepare(data: pd.DataFrame, engine: str) -> pd.DataFrame | FastData:
+    """Precompute per-dataset state once so repeated runs on ``data`` share it."""
+    if engine == "fast":
+        from .fast import prepare
+
+        return prepare(data)
+    return data
+
+
+_GRID_KERNELS: dict[str, tuple[Callable[..., pd.Series], Callable[..., np.ndarray]]] = {
+    "sma": (sma, rolling_mean_matrix),
+    "rolling_std": (rolling_std, rolling_std_matrix),
+    "ema": (ema, ema_matrix),
+    "rsi": (rsi, rsi_matrix),
+}
+
+
+def _seed_grid(data: pd.DataFrame | FastData, strategy_cls: type[Strategy], combos: list[dict[str, Any]]) -> None:
+    """Compute the indicator columns a whole grid needs in batched calls and seed INDICATOR_CACHE.
+
+    Each kernel runs once per dataset with every length found in ``combos``,
+    on the same close array the engine will pass to the indicator, so each
+    combination's indicator calls are cache hits.
+    """
+    wanted: dict[str, tuple[str, ...]] = getattr(strategy_cls, "grid_indicators", {})
+    if not wanted or INDICATOR_CACHE.max_bytes <= 0:
+        return
+    if isinstance(data, pd.DataFrame):
+        from .fast import FRACTIONAL_UNIT
+
+        close: pd.Series | np.ndarray = (data["Close"] * FRACTIONAL_UNIT).to_numpy()  # as Backtest scales it
+        index, name = None, None
+    else:
+        close = data.frame["Close"]
+        index, name = close.index, close.name
+
+    for indicator, params in wanted.items():
+        func, kernel = _GRID_KERNELS[indicator]
+        found = {combo.get(p, getattr(strategy_cls, p)) for combo in combos for p in params}
+        # Invalid lengths are left to the per-combination call, which reports them.
+        lengths = sorted(v for v in found if isinstance(v, int | np.integer) and not isinstance(v, bool) and v >= 1)
+        if not lengths:
+            continue
+        matrix = kernel(np.asarray(close), lengths)
+        for j, length in enumerate(lengths):
+            seed_indicator(func, (close, length), pd.Series(matrix[:, j], index=index, name=name))
+
+
+def run_strategy(
+    data: pd.DataFrame | FastData,
+    strategy_cls: type[Strategy],
+    cash: float = 100_000.0,
+    commission: float = 0.001,
+    engine: str = "reference",
+    **params: Any,
+) -> Any:
+    """Run one backtest on the chosen engine and return its stats.
+
+    ``reference`` is backtesting.py; ``fast`` is the vectorized engine in
+    meta_strategy.fast, which returns the same stats keys for the built-in
+    strategies.
+    """
+    _check_engine(engine)
+    if engine == "fast":
+        from .fast import run_fast
+
+        return run_fast(strategy_cls, data, cash=cash, commission=commission, **params)
+    bt = Backtest(data, strategy_cls, cash=cash, commission=commission, exclusive_orders=True)
+    return bt.run(**params)
+
+
 def run_backtest(
     strategy_name: str,
     symbol: str = "BTC-USD",
@@ -463,34 +753,65 @@ def run_backtest(
     cash: float = 100_000.0,
     commission: float = 0.001,
     interval: str = "1d",
+    data: pd.DataFrame | DataProvider | None = None,
+    engine: str = "reference",
+    include_stats: bool = False,
 ) -> dict:
-    """Run a backtest and return results as a dict."""
+    """Run a backtest and return results as a dict.
+
+    ``data`` may be a preloaded OHLCV DataFrame or a DataProvider; by
+    default the bars come from the configured default provider.
+    ``engine`` selects backtesting.py ("reference") or the vectorized "fast" engine.
+    ``include_stats`` adds the full stats under ``"_stats"`` so follow-up
+    analyses (``risk.monte_carlo``, ``risk.run_risk_analysis``) can reuse the run.
+    Without it, a run already in the result store (``store.configure_result_store``)
+    is returned from there.
+    """
     if strategy_name not in STRATEGIES:
         raise ValueError(f"Unknown strategy: {strategy_name}. Available: {list(STRATEGIES.keys())}")
+    _check_engine(engine)
 
-    data = fetch_data(symbol, start, end, interval=interval)
+    data = load_data(data, symbol, start, end, interval)
     strategy_cls = STRATEGIES[strategy_name]
-    warmup = detect_warmup(strategy_cls, data)
 
-    bt = Backtest(data, strategy_cls, cash=cash, commission=commission, exclusive_orders=True)
-    stats = bt.run()
+    store = None if include_stats else active_store()
+    try:
+        if store is not None:
+            base = fingerprint_base(
+                "backtest", strategy_cls, data_hash(data), cash, commission, interval, symbol, engine, start=start
+            )
+            fingerprint = run_fingerprint(base, {})
+            stored = store.get(fingerprint)
+            if stored is not None:
+                return stored
 
-    result = {
-        "strategy": strategy_name,
-        "symbol": symbol,
-        "period": f"{start} → {data.index[-1].strftime('%Y-%m-%d')}",
-        "return_pct": round(float(stats["Return [%]"]), 2),
-        "buy_hold_return_pct": round(float(stats["Buy & Hold Return [%]"]), 2),
-        "win_rate_pct": round(float(stats["Win Rate [%]"]), 2) if not pd.isna(stats["Win Rate [%]"]) else 0.0,
-        "num_trades": int(stats["# Trades"]),
-        "max_drawdown_pct": round(float(stats["Max. Drawdown [%]"]), 2),
-        "sharpe_ratio": round(float(stats["Sharpe Ratio"]), 2) if not pd.isna(stats["Sharpe Ratio"]) else 0.0,
-        "final_equity": round(float(stats["Equity Final [$]"]), 2),
-        "warmup_bars": warmup,
-    }
-    if warmup > 0:
-        result["effective_start"] = data.index[warmup].strftime("%Y-%m-%d")
-    return result
+        warmup = detect_warmup(strategy_cls, data)
+
+        stats = run_strategy(data, strategy_cls, cash, commission, engine)
+
+        result = {
+            "strategy": strategy_name,
+            "symbol": symbol,
+            "period": f"{start} → {data.index[-1].strftime('%Y-%m-%d')}",
+            "return_pct": round(float(stats["Return [%]"]), 2),
+            "buy_hold_return_pct": round(float(stats["Buy & Hold Return [%]"]), 2),
+            "win_rate_pct": round(float(stats["Win Rate [%]"]), 2) if not pd.isna(stats["Win Rate [%]"]) else 0.0,
+            "num_trades": int(stats["# Trades"]),
+            "max_drawdown_pct": round(float(stats["Max. Drawdown [%]"]), 2),
+            "sharpe_ratio": round(float(stats["Sharpe Ratio"]), 2) if not pd.isna(stats["Sharpe Ratio"]) else 0.0,
+            "final_equity": round(float(stats["Equity Final [$]"]), 2),
+            "warmup_bars": warmup,
+        }
+        if warmup > 0:
+            result["effective_start"] = data.index[warmup].strftime("%Y-%m-%d")
+        if include_stats:
+            result["_stats"] = stats
+        if store is not None:
+            store.put_many([(fingerprint, store_meta(base, {}, strategy_name), result)])
+        return result
+    finally:
+        if store is not None:
+            store.close()
 
 
 def detect_warmup(strategy_cls: type[Strategy], data: pd.DataFrame) -> int:
@@ -516,15 +837,22 @@ def detect_warmup(strategy_cls: type[Strategy], data: pd.DataFrame) -> int:
     return first_valid
 
 
-def run_all_backtests(symbol: str = "BTC-USD", start: str = "2018-01-01", **kwargs: Any) -> list[dict[str, Any]]:
+def run_all_backtests(
+    symbol: str = "BTC-USD",
+    start: str = "2018-01-01",
+    data: pd.DataFrame | DataProvider | None = None,
+    **kwargs: Any,
+) -> list[dict[str, Any]]:
     """Run all strategies with normalized B&H baseline.
 
     Each strategy runs on full data (so strategy returns are unaffected),
     but B&H is recalculated from the max warmup bar across all strategies
     so every strategy shows the same B&H for fair comparison.
+
+    Data is loaded once and shared by warmup detection and every strategy run.
     """
     interval = kwargs.get("interval", "1d")
-    data = fetch_data(symbol, start, kwargs.get("end"), interval=interval)
+    data = load_data(data, symbol, start, kwargs.get("end"), interval)
 
     # Determine which strategies to run (skip BMSB on sub-daily)
     strategies_to_run = dict(STRATEGIES)
@@ -547,7 +875,7 @@ def run_all_backtests(symbol: str = "BTC-USD", start: str = "2018-01-01", **kwar
 
     results = []
     for name in strategies_to_run:
-        result = run_backtest(name, symbol=symbol, start=start, **kwargs)
+        result = run_backtest(name, symbol=symbol, start=start, data=data, **kwargs)
         result["buy_hold_return_pct"] = normalized_bh
         result["effective_start"] = effective_start
         result["warmup_bars_trimmed"] = max_warmup
@@ -569,14 +897,18 @@ def run_multi_asset(
     strategy_name: str,
     symbols: list[str] | None = None,
     start: str = "2018-01-01",
+    data: DataProvider | None = None,
     **kwargs: Any,
 ) -> list[dict[str, Any]]:
-    """Run a strategy across multiple assets."""
+    """Run a strategy across multiple assets.
+
+    Pass a DataProvider (e.g. SharedDataProvider) as ``data`` to choose where bars come from.
+    """
     symbols = symbols or DEFAULT_ASSETS
     results = []
     for sym in symbols:
         try:
-            result = run_backtest(strategy_name, symbol=sym, start=start, **kwargs)
+            result = run_backtest(strategy_name, symbol=sym, start=start, data=data, **kwargs)
             results.append(result)
         except Exception as e:
             results.append(
@@ -638,6 +970,385 @@ def _extract_metrics(stats: Any) -> dict[str, Any]:
     }
 
 
+# Keys optimize_strategy can rank by; the second group is computed by risk.compute_risk_metrics_batch.
+RISK_RANK_METRICS = (
+    "sortino_ratio",
+    "calmar_ratio",
+    "profit_factor",
+    "recovery_factor",
+    "annual_return_pct",
+    "max_consecutive_wins",
+    "max_consecutive_losses",
+    "downside_deviation",
+)
+RANK_METRICS = ("sharpe_ratio", "return_pct", "max_drawdown_pct", "win_rate_pct", *RISK_RANK_METRICS)
+
+
+def _metrics_runner(
+    data: pd.DataFrame | FastData, strategy_cls: type[Strategy], cash: float, commission: float, engine: str
+) -> Callable[..., tuple[dict[str, Any], np.ndarray]]:
+    """Slim per-dataset evaluator for grid searches: ``run(**params) -> (stats, equity)``.
+
+    The reference engine constructs its Backtest once per dataset and skips
+    compute_stats (Backtest.run_metrics); the fast engine's stats build no
+    trade or equity frames. Only the scalar stats _extract_metrics reads and
+    the equity array come back.
+    """
+    if engine == "fast":
+        from .fast import run_fast
+
+        def run(**params: Any) -> tuple[dict[str, Any], np.ndarray]:
+            stats = run_fast(strategy_cls, data, cash=cash, commission=commission, **params)
+            return stats, stats.arrays[1]
+
+        return run
+    bt = Backtest(data, strategy_cls, cash=cash, commission=commission, exclusive_orders=True)
+    return bt.run_metrics
+
+
+def _evaluate_params(
+    train_run: Callable[..., tuple[dict[str, Any], np.ndarray]],
+    test_run: Callable[..., tuple[dict[str, Any], np.ndarray]] | None,
+    params: dict[str, Any],
+    curves: list[tuple[np.ndarray, np.ndarray | None]] | None = None,
+) -> dict[str, Any]:
+    """Run one parameter combination on train (and test) data and build its result entry.
+
+    ``train_run``/``test_run`` come from _metrics_runner(). With ``curves``,
+    the train (and test) equity curves are appended to it.
+    """
+    train_stats, train_equity = train_run(**params)
+    entry: dict[str, Any] = {"params": params}
+    train_metrics = _extract_metrics(train_stats)
+    test_equity = None
+
+    if test_run is not None:
+        entry["is_return_pct"] = train_metrics["return_pct"]
+        entry["is_sharpe_ratio"] = train_metrics["sharpe_ratio"]
+        entry["is_num_trades"] = train_metrics["num_trades"]
+        entry["is_max_drawdown_pct"] = train_metrics["max_drawdown_pct"]
+        entry["is_win_rate_pct"] = train_metrics["win_rate_pct"]
+
+        test_stats, test_equity = test_run(**params)
+        oos_metrics = _extract_metrics(test_stats)
+        entry["return_pct"] = oos_metrics["return_pct"]
+        entry["sharpe_ratio"] = oos_metrics["sharpe_ratio"]
+        entry["num_trades"] = oos_metrics["num_trades"]
+        entry["max_drawdown_pct"] = oos_metrics["max_drawdown_pct"]
+        entry["win_rate_pct"] = oos_metrics["win_rate_pct"]
+    else:
+        entry.update(train_metrics)
+    if curves is not None:
+        curves.append((train_equity, test_equity))
+    return entry
+
+
+def _attach_risk_metrics(entries: list[dict[str, Any]], curves: list[tuple[np.ndarray, np.ndarray | None]]) -> None:
+    """Add the extended risk metrics of every entry's equity curves, computed as one batch per dataset.
+
+    Metrics the entries already carry (drawdown, return) are not overwritten;
+    with a train/test split the train-side metrics get an ``is_`` prefix.
+    """
+    from .risk import compute_risk_metrics_batch
+
+    if not entries:
+        return
+    sides = [("", [train for train, _ in curves])]
+    if curves[0][1] is not None:
+        sides = [("is_", sides[0][1]), ("", [test for _, test in curves if test is not None])]
+    for prefix, equity in sides:
+        batch = compute_risk_metrics_batch(np.vstack(equity))
+        for key, values in batch.items():
+            if key in RISK_RANK_METRICS:
+                for entry, value in zip(entries, values.tolist(), strict=True):
+                    entry[prefix + key] = value
+
+
+# Combinations per optimizer task: bounds the rows in flight, whatever the grid size.
+OPTIMIZE_CHUNK = 1000
+# Smaller chunks when progress events are requested, so they arrive while the grid runs.
+EVENTS_CHUNK = 100
+
+
+class TopK:
+    """Optimizer results ranked best first by ``rank_by``, keeping at most ``k`` (all when None).
+
+    A bounded min-heap holds the ``k`` best seen so far. Ties keep grid order
+    (the lower sequence number ranks first), so the result equals sorting
+    every row and truncating.
+    """
+
+    def __init__(self, k: int | None, rank_by: str) -> None:
+        self.k = k
+        self.rank_by = rank_by
+        # Lower is better for losing streaks and downside deviation; NaN metrics rank last either way.
+        self._sign = -1.0 if rank_by in ("max_consecutive_losses", "downside_deviation") else 1.0
+        self._heap: list[tuple[float, int, dict[str, Any]]] = []
+
+    def score(self, entry: dict[str, Any]) -> float:
+        """Higher-is-better ranking value of a result (-inf for NaN)."""
+        value = entry[self.rank_by]
+        return self._sign * float(value) if not pd.isna(value) else -np.inf
+
+    def push(self, seq: int, entry: dict[str, Any]) -> None:
+        """Offer the result of combination number ``seq``."""
+        item = (self.score(entry), -seq, entry)
+        if self.k is None:
+            self._heap.append(item)
+        elif len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def results(self) -> list[dict[str, Any]]:
+        """The kept results, best first."""
+        return [entry for *_, entry in sorted(self._heap, key=lambda item: item[:2], reverse=True)]
+
+
+def _task_seqs(task: _ComboTask) -> Sequence[int]:
+    """Sequence numbers of the combinations an optimizer task evaluates."""
+    lo, hi, only = task[2], task[3], task[-1]
+    return range(lo, hi) if only is None else [lo + j for j in only]
+
+
+# (strategy_cls, grid, lo, hi, split_idx, cash, commission, engine, risk_metrics, keep_equity, only)
+_ComboTask = tuple[
+    type[Strategy], dict[str, list[Any]], int, int, int | None, float, float, str, bool, bool, list[int] | None
+]
+
+
+# A failed walk-forward evaluation: (params, error) for a grid combination, (None, error) for a whole fold
+_Failure = tuple[dict[str, Any] | None, str]
+
+
+class _ComboResult(NamedTuple):
+    """One evaluated grid combination, as sent back by an optimizer task."""
+
+    params: dict[str, Any]
+    entry: dict[str, Any] | None
+    error: str | None
+    seconds: float
+    worker: int
+
+
+def _event_metrics(entry: dict[str, Any]) -> dict[str, Any]:
+    """The metrics of a result entry, without params and NumPy payloads, for progress events."""
+    return {k: v for k, v in entry.items() if k != "params" and not k.startswith("_")}
+
+
+def _evaluate_combos(
+    data: pd.DataFrame,
+    task: _ComboTask,
+) -> list[_ComboResult]:
+    """Evaluate combinations ``lo:hi`` of a grid; returns one _ComboResult per combination.
+
+    When the task's last field lists offsets into ``lo:hi``, only those
+    combinations are evaluated (a sampled search, or the others came from
+    the journal or result store).
+    Module-level so it can run in a parallel.iter_tasks() worker.
+    """
+    strategy_cls, grid, lo, hi, split_idx, cash, commission, engine, risk_metrics, keep_equity, only = task
+    combos = [grid_combo(grid, seq) for seq in _task_seqs(task)]
+    if split_idx is None:
+        train_data, test_data = _prepare(data, engine), None
+    else:
+        train_data, test_data = _prepare(data.iloc[:split_idx], engine), _prepare(data.iloc[split_idx:], engine)
+    for prepared in (train_data, test_data):
+        if prepared is not None:
+            _seed_grid(prepared, strategy_cls, combos)
+    train_run = _metrics_runner(train_data, strategy_cls, cash, commission, engine)
+    test_run = None if test_data is None else _metrics_runner(test_data, strategy_cls, cash, commission, engine)
+
+    curves: list[tuple[np.ndarray, np.ndarray | None]] | None = [] if risk_metrics or keep_equity else None
+    out: list[_ComboResult] = []
+    worker = os.getpid()
+    for params in combos:
+        started = time.perf_counter()
+        try:
+            entry = _evaluate_params(train_run, test_run, params, curves)
+            out.append(_ComboResult(params, entry, None, time.perf_counter() - started, worker))
+        except Exception as e:
+            out.append(_ComboResult(params, None, f"{type(e).__name__}: {e}", time.perf_counter() - started, worker))
+    entries = [r.entry for r in out if r.entry is not None]
+    if risk_metrics and curves is not None:
+        _attach_risk_metrics(entries, curves)
+    if keep_equity and curves is not None:
+        for entry, (train, test) in zip(entries, curves, strict=True):
+            entry["_equity"] = train if test is None else test
+            if test is not None:
+                entry["_is_equity"] = train
+    return out
+
+
+class _ComboRunner:
+    """Evaluates batches of grid combinations for optimize_strategy(), whatever the search strategy.
+
+    Combinations are addressed by sequence number. Each batch is served from
+    the journal and result store where possible; the rest is chunked into
+    tasks for parallel.iter_tasks(). Full evaluations feed the top-K heap,
+    spill file, store and journal; prefix evaluations (successive halving)
+    only return scores. Every evaluation emits a progress event.
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        strategy_name: str,
+        grid: dict[str, list[Any]],
+        split_idx: int | None,
+        cash: float,
+        commission: float,
+        engine: str,
+        jobs: int,
+        ranked: TopK,
+        keep_equity: bool,
+        store: ResultStore | None,
+        log: Journal | None,
+        base: dict[str, Any],
+        spill_file: IO[str] | None,
+        on_event: Callable[[dict[str, Any]], None] | None,
+    ) -> None:
+        self.data = data
+        self.strategy_name = strategy_name
+        self.grid = grid
+        self.split_idx = split_idx
+        self.jobs = jobs
+        self.ranked = ranked
+        self.store = store
+        self.log = log
+        self.base = base
+        self.spill_file = spill_file
+        self.on_event = on_event
+        self._task = (STRATEGIES[strategy_name], grid, cash, commission, engine, ranked.rank_by in RISK_RANK_METRICS)
+        self.keep_equity = keep_equity
+        self.throughput = Throughput(0)
+        self.evaluated = 0
+
+    def start(self, total: int, search: str, pruned: int = 0) -> None:
+        self.throughput = Throughput(total)
+        self._emit(
+            {"event": "start", "kind": "optimize", "strategy": self.strategy_name, "search": search, "pruned": pruned}
+        )
+
+    def end(self) -> None:
+        self._emit({"event": "end", "kind": "optimize", "evaluated": self.evaluated, **self.throughput.step(0)})
+
+    def _emit(self, event: dict[str, Any]) -> None:
+        if self.on_event is not None:
+            if "total" not in event:
+                event["total"] = self.throughput.total
+            self.on_event(event)
+
+    def _tasks(self, seqs: Sequence[int], split_idx: int | None, keep_equity: bool) -> list[_ComboTask]:
+        """Chunk sorted ``seqs`` into tasks; a run of consecutive combinations needs no offset list."""
+        # A few chunks per worker: balances load and amortizes per-dataset preparation.
+        chunk = min(-(-len(seqs) // (self.jobs * 4)), OPTIMIZE_CHUNK) if self.jobs > 1 else OPTIMIZE_CHUNK
+        if self.on_event is not None:
+            chunk = min(chunk, EVENTS_CHUNK)
+        strategy_cls, grid, cash, commission, engine, risk_metrics = self._task
+        tasks: list[_ComboTask] = []
+        for i in range(0, len(seqs), chunk):
+            part = seqs[i : i + chunk]
+            lo, hi = part[0], part[-1] + 1
+            only = None if hi - lo == len(part) else [seq - lo for seq in part]
+            tasks.append(
+                (strategy_cls, grid, lo, hi, split_idx, cash, commission, engine, risk_metrics, keep_equity, only)
+            )
+        return tasks
+
+    def _accept(self, seq: int, entry: dict[str, Any]) -> None:
+        if self.spill_file is not None:
+            row = {k: v for k, v in entry.items() if not k.startswith("_")}
+            self.spill_file.write(json.dumps(row) + "\n")
+        self.ranked.push(seq, entry)
+
+    def _failed(self, params: dict[str, Any], error: str | None) -> None:
+        warnings.warn(f"{self.strategy_name} {params} failed: {error}", RuntimeWarning, stacklevel=4)
+
+    def _served(self, seqs: Sequence[int], scores: dict[int, float]) -> list[int]:
+        """Take the journaled and stored combinations among ``seqs``; returns the ones still to evaluate."""
+        if self.store is None and self.log is None:
+            return list(seqs)
+        missing = []
+        for lo in range(0, len(seqs), OPTIMIZE_CHUNK):
+            part = seqs[lo : lo + OPTIMIZE_CHUNK]
+            combos = [grid_combo(self.grid, seq) for seq in part]
+            fingerprints = [run_fingerprint(self.base, params) for params in combos] if self.store is not None else []
+            stored = self.store.get_many(fingerprints) if self.store is not None else {}
+            for offset, (seq, params) in enumerate(zip(part, combos, strict=True)):
+                done = self.log.done.get(seq) if self.log is not None else None
+                if done is None and fingerprints and fingerprints[offset] in stored:
+                    done = {"entry": stored[fingerprints[offset]]}
+                if done is None:
+                    missing.append(seq)
+                elif "error" in done:
+                    self._failed(params, done["error"])
+                    scores[seq] = -np.inf
+                else:
+                    self._accept(seq, done["entry"])
+                    scores[seq] = self.ranked.score(done["entry"])
+        served = len(seqs) - len(missing)
+        if served:
+            self._emit({"event": "cached", "count": served, **self.throughput.skip(served)})
+        return missing
+
+    def run(self, seqs: Sequence[int], bars: int | None = None) -> dict[int, float]:
+        """Evaluate the combinations ``seqs`` (sorted); returns their higher-is-better scores.
+
+        With ``bars``, they run on the first ``bars`` bars only (no split),
+        and the results are neither kept, stored nor journaled.
+        """
+        scores: dict[int, float] = {}
+        full = bars is None
+        if full:
+            data, split_idx, keep_equity = self.data, self.split_idx, self.keep_equity
+            seqs = self._served(seqs, scores)
+        else:
+            data, split_idx, keep_equity = self.data.iloc[:bars], None, False
+        tasks = self._tasks(seqs, split_idx, keep_equity)
+        for i, chunk in iter_tasks(data, _evaluate_combos, tasks, self.jobs):
+            if isinstance(chunk, BaseException):
+                raise chunk
+            new_rows = []
+            finished: list[tuple[int, dict[str, Any]]] = []
+            for seq, (params, entry, error, seconds, worker) in zip(_task_seqs(tasks[i]), chunk, strict=True):
+                self.evaluated += 1
+                outcome = {"error": error} if entry is None else {"metrics": _event_metrics(entry)}
+                self._emit(
+                    {
+                        "event": "combo",
+                        "seq": seq,
+                        "params": params,
+                        **({} if full else {"bars": bars}),
+                        **outcome,
+                        "seconds": round(seconds, 6),
+                        "worker": worker,
+                        **self.throughput.step(),
+                    }
+                )
+                scores[seq] = -np.inf if entry is None else self.ranked.score(entry)
+                if not full:
+                    continue
+                if entry is None:
+                    self._failed(params, error)
+                    finished.append((seq, {"error": error}))
+                    continue
+                self._accept(seq, entry)
+                finished.append((seq, {"entry": entry}))
+                if self.store is not None:
+                    new_rows.append(
+                        (run_fingerprint(self.base, params), store_meta(self.base, params, self.strategy_name), entry)
+                    )
+            if self.store is not None and new_rows:
+                self.store.put_many(new_rows)
+            if self.log is not None and finished:
+                self.log.record_many(finished)
+        return scores
+
+
 def optimize_strategy(
     strategy_name: str,
     symbol: str = "BTC-USD",
@@ -648,74 +1359,173 @@ def optimize_strategy(
     param_grid: dict[str, list] | None = None,
     split: float = 0.7,
     interval: str = "1d",
+    data: pd.DataFrame | DataProvider | None = None,
+    engine: str = "reference",
+    jobs: int = 1,
+    rank_by: str = "sharpe_ratio",
+    keep_equity: bool = False,
+    top: int | None = None,
+    spill: str | Path | None = None,
+    journal: str | Path | None = None,
+    resume: bool = False,
+    on_event: Callable[[dict[str, Any]], None] | None = None,
+    search: str = "grid",
+    budget: int | None = None,
+    seed: int = 42,
+    constraints: Sequence[str] | None = None,
 ) -> list[dict[str, Any]]:
-    """Grid search over parameter combinations with optional train/test split.
+    """Search parameter combinations with optional train/test split.
+
+    Combinations that raise are skipped and reported with a RuntimeWarning
+    naming the parameters and the error.
 
     Args:
         split: Fraction of data for training (0.0-1.0). Default 0.7 = 70% train, 30% test.
                Use 1.0 for legacy behavior (no split).
+        data: Preloaded OHLCV DataFrame or DataProvider (default: configured provider).
+        engine: "reference" (backtesting.py) or "fast" (vectorized signal arrays).
+        jobs: Worker processes. Above 1, combinations are spread over a process
+              pool that reads the bars from shared memory; results are identical.
+        rank_by: Result key to sort by, best first (out-of-sample when split).
+                 Any of ``RANK_METRICS``; the extended risk metrics (Sortino,
+                 Calmar, profit factor, ...) are then added to every result,
+                 computed in one batch per dataset.
+        keep_equity: Keep each combination's equity curve (NumPy array) under
+                     ``"_equity"`` (out-of-sample when split, with the train
+                     curve under ``"_is_equity"``), e.g. for meta_strategy.significance.
+        top: Return only the best ``top`` results. They are kept in a bounded
+             heap while the grid runs, so memory does not grow with the grid.
+        spill: Also write every successful result (without equity curves) to
+               this JSONL file as it arrives, for auditing a ``top``-limited run.
+        journal: Checkpoint every finished combination to this append-only
+                 JSONL file (meta_strategy.journal) as each chunk completes.
+        resume: Reload the combinations already in ``journal`` instead of
+                running them again; the results are identical to an
+                uninterrupted run. Raises ValueError when the journal belongs
+                to a different run.
+        on_event: Called with a JSON-serializable dict per event: ``start``
+                  (planned evaluations), ``cached`` (served from the journal
+                  or store), one ``combo`` per evaluated combination (params,
+                  metrics or error, wall seconds, worker pid, done/total,
+                  rate and ETA; ``bars`` for a halving prefix) and ``end``.
+        search: Which combinations to evaluate (see meta_strategy.search):
+                ``grid`` (all), ``random``, ``halving`` (successive halving
+                on growing prefixes of the training bars) or ``bayes``
+                (Gaussian-process expected improvement). Every mode returns
+                the same result entries and uses the same split.
+        budget: Combinations to evaluate for ``random`` and ``bayes``, or
+                starting candidates for ``halving``; required by those modes.
+        seed: Seed of the random draws of ``random``, ``halving`` and ``bayes``.
+        constraints: Expressions over parameter names that every combination
+                     must meet, e.g. ``["fast < slow"]`` (meta_strategy.space).
+                     Infeasible combinations are pruned before any backtest
+                     runs; searches and budgets only see the feasible ones.
+
+    With the result store on (``store.configure_result_store``), combinations
+    already evaluated under the same fingerprint (strategy, parameters, bars,
+    cash, commission, split, engine, version) are read back instead of run,
+    and new ones are recorded. ``keep_equity`` runs bypass the store.
     """
     if strategy_name not in STRATEGIES:
         raise ValueError(f"Unknown strategy: {strategy_name}")
     if not 0.0 < split <= 1.0:
         raise ValueError(f"split must be in (0, 1.0], got {split}")
+    _check_engine(engine)
+    if jobs < 1:
+        raise ValueError(f"jobs must be >= 1, got {jobs}")
+    if rank_by not in RANK_METRICS:
+        raise ValueError(f"Unknown rank metric: {rank_by}. Available: {', '.join(RANK_METRICS)}")
+    if top is not None and top < 1:
+        raise ValueError(f"top must be >= 1, got {top}")
+    if journal is not None and keep_equity:
+        raise ValueError("keep_equity runs cannot be journaled (equity curves are not checkpointed)")
+    if search not in SEARCHES:
+        raise ValueError(f"Unknown search: {search}. Available: {', '.join(SEARCHES)}")
+    if search == "grid" and budget is not None:
+        raise ValueError("budget applies to the random, halving and bayes searches")
+    if search != "grid" and (budget is None or budget < 1):
+        raise ValueError(f"search {search!r} needs a budget >= 1")
 
     grid = param_grid or PARAM_GRIDS.get(strategy_name, {})
     if not grid:
         raise ValueError(f"No parameter grid defined for {strategy_name}")
 
-    data = fetch_data(symbol, start, end, interval=interval)
+    data = load_data(data, symbol, start, end, interval)
     strategy_cls = STRATEGIES[strategy_name]
-
-    has_split = split < 1.0
-    if has_split:
-        split_idx = int(len(data) * split)
-        train_data = data.iloc[:split_idx]
-        test_data = data.iloc[split_idx:]
-    else:
-        train_data = data
-        test_data = None
-
-    import itertools
-
-    param_names = list(grid.keys())
-    param_values = list(grid.values())
-    combinations = list(itertools.product(*param_values))
-
-    results: list[dict[str, Any]] = []
-    for combo in combinations:
-        params = dict(zip(param_names, combo, strict=True))
-        try:
-            bt_train = Backtest(train_data, strategy_cls, cash=cash, commission=commission, exclusive_orders=True)
-            train_stats = bt_train.run(**params)
-            entry = {"params": params}
-            train_metrics = _extract_metrics(train_stats)
-
-            if has_split:
-                entry["is_return_pct"] = train_metrics["return_pct"]
-                entry["is_sharpe_ratio"] = train_metrics["sharpe_ratio"]
-                entry["is_num_trades"] = train_metrics["num_trades"]
-                entry["is_max_drawdown_pct"] = train_metrics["max_drawdown_pct"]
-                entry["is_win_rate_pct"] = train_metrics["win_rate_pct"]
-
-                bt_test = Backtest(test_data, strategy_cls, cash=cash, commission=commission, exclusive_orders=True)
-                test_stats = bt_test.run(**params)
-                oos_metrics = _extract_metrics(test_stats)
-                entry["return_pct"] = oos_metrics["return_pct"]
-                entry["sharpe_ratio"] = oos_metrics["sharpe_ratio"]
-                entry["num_trades"] = oos_metrics["num_trades"]
-                entry["max_drawdown_pct"] = oos_metrics["max_drawdown_pct"]
-                entry["win_rate_pct"] = oos_metrics["win_rate_pct"]
-            else:
-                entry.update(train_metrics)
-
-            results.append(entry)
-        except Exception:
-            pass
-
-    sort_key = "sharpe_ratio"
-    results.sort(key=lambda r: float(r[sort_key]), reverse=True)
-    return results
+    split_idx = int(len(data) * split) if split < 1.0 else None
+
+    n_combos = grid_size(grid)
+    feasible = feasible_seqs(grid, constraints)
+    space: Sequence[int] = range(n_combos) if feasible is None else feasible
+    if not space:
+        raise ValueError(f"No combination of the grid satisfies the constraints: {', '.join(constraints or ())}")
+    limit = min(budget, len(space)) if budget is not None else len(space)
+    ranked = TopK(top, rank_by)
+    store = None if keep_equity else active_store()
+    base = fingerprint_base(
+        "optimize",
+        strategy_cls,
+        data_hash(data) if store is not None or journal is not None else "",
+        cash,
+        commission,
+        interval,
+        symbol,
+        engine,
+        split=split_idx,
+        risk_metrics=rank_by in RISK_RANK_METRICS,
+    )
+    run_id = run_fingerprint(base, {"grid": grid, **({"constraints": list(constraints)} if constraints else {})})
+    log = Journal(journal, run_id, resume) if journal is not None else None
+    spill_file = open(spill, "w") if spill is not None else None  # noqa: SIM115
+    runner = _ComboRunner(
+        data,
+        strategy_name,
+        grid,
+        split_idx,
+        cash,
+        commission,
+        engine,
+        jobs,
+        ranked,
+        keep_equity,
+        store,
+        log,
+        base,
+        spill_file,
+        on_event,
+    )
+    try:
+        if search == "grid":
+            runner.start(len(space), search, n_combos - len(space))
+            runner.run(space)
+        elif search == "random":
+            runner.start(limit, search, n_combos - len(space))
+            runner.run([space[i] for i in random_sample(len(space), limit, seed)])
+        elif search == "halving":
+            rungs = halving_rungs(limit, split_idx or len(data))
+            runner.start(sum(n for _, n in rungs), search, n_combos - len(space))
+            candidates = [space[i] for i in random_sample(len(space), limit, seed)]
+            for (bars, _), (_, keep) in itertools.pairwise(rungs):
+                candidates = survivors(runner.run(candidates, bars=bars), keep)
+            runner.run(candidates)
+        else:  # bayes
+            runner.start(limit, search, n_combos - len(space))
+            scores = runner.run([space[i] for i in random_sample(len(space), min(BAYES_INITIAL, limit), seed)])
+            while len(scores) < limit:
+                batch = min(limit - len(scores), jobs)
+                suggested = [seq for seq in bayes_suggest(grid, scores, batch, seed, feasible) if seq not in scores]
+                if not suggested:
+                    break  # nothing new to propose: stop short of the budget rather than spin
+                scores.update(runner.run(suggested))
+        runner.end()
+    finally:
+        if spill_file is not None:
+            spill_file.close()
+        if store is not None:
+            store.close()
+        if log is not None:
+            log.close()
+    return ranked.results()
 
 
 def check_overfitting(result: dict, threshold: float = 2.0) -> dict | None:
@@ -742,47 +1552,57 @@ def check_overfitting(result: dict, threshold: float = 2.0) -> dict | None:
 
 
 def _optimize_on_data(
-    train_data: pd.DataFrame, strategy_cls: type[Strategy], grid: dict[str, list[Any]], cash: float, commission: float
-) -> tuple[dict[str, Any], float]:
-    """Find best params by grid search on training data. Returns (best_params, best_sharpe)."""
+    train_data: pd.DataFrame,
+    strategy_cls: type[Strategy],
+    grid: dict[str, list[Any]],
+    cash: float,
+    commission: float,
+    engine: str = "reference",
+    seqs: range | None = None,
+) -> tuple[dict[str, Any], float, list[_Failure]]:
+    """Find best params by grid search on training data. Returns (best_params, best_sharpe, failures).
+
+    ``seqs`` restricts the search to those combinations (grid order); ties keep the earliest.
+    """
     best_params = {}
     best_sharpe = -999.0
+    failures: list[_Failure] = []
     if grid:
-        import itertools
+        prepared = _prepare(train_data, engine)
 
-        param_names = list(grid.keys())
-        for combo in itertools.product(*grid.values()):
-            params = dict(zip(param_names, combo, strict=True))
+        combos = [grid_combo(grid, seq) for seq in (range(grid_size(grid)) if seqs is None else seqs)]
+        _seed_grid(prepared, strategy_cls, combos)
+        run = _metrics_runner(prepared, strategy_cls, cash, commission, engine)
+        for params in combos:
             try:
-                bt = Backtest(train_data, strategy_cls, cash=cash, commission=commission, exclusive_orders=True)
-                stats = bt.run(**params)
+                stats, _ = run(**params)
                 sharpe = float(stats["Sharpe Ratio"]) if not pd.isna(stats["Sharpe Ratio"]) else -999.0
                 if sharpe > best_sharpe:
                     best_sharpe = sharpe
                     best_params = params
-            except Exception:
-                pass
-    return best_params, best_sharpe
+            except Exception as e:
+                failures.append((params, f"{type(e).__name__}: {e}"))
+    return best_params, best_sharpe, failures
 
 
-def _evaluate_fold(
+def _test_fold(
     train_data: pd.DataFrame,
     test_data: pd.DataFrame,
     strategy_cls: type[Strategy],
-    grid: dict[str, list[Any]],
+    best_params: dict[str, Any],
+    best_sharpe: float,
     cash: float,
     commission: float,
     fold_num: int,
-) -> dict[str, Any] | None:
-    """Optimize on train, evaluate on test. Returns fold dict or None."""
-    best_params, best_sharpe = _optimize_on_data(train_data, strategy_cls, grid, cash, commission)
+    engine: str = "reference",
+) -> tuple[dict[str, Any] | None, _Failure | None]:
+    """Evaluate the train-optimal params on test. Returns the fold dict, or None and the fold's failure."""
     try:
-        bt = Backtest(test_data, strategy_cls, cash=cash, commission=commission, exclusive_orders=True)
-        test_stats = bt.run(**best_params)
+        test_stats = run_strategy(test_data, strategy_cls, cash, commission, engine, **best_params)
         train_period = f"{train_data.index[0].strftime('%Y-%m-%d')} → {train_data.index[-1].strftime('%Y-%m-%d')}"
         test_period = f"{test_data.index[0].strftime('%Y-%m-%d')} → {test_data.index[-1].strftime('%Y-%m-%d')}"
         test_sharpe = round(float(test_stats["Sharpe Ratio"]), 2) if not pd.isna(test_stats["Sharpe Ratio"]) else 0.0
-        return {
+        fold = {
             "fold": fold_num,
             "train_period": train_period,
             "test_period": test_period,
@@ -793,66 +1613,87 @@ def _evaluate_fold(
             "test_trades": int(test_stats["# Trades"]),
             "test_max_dd_pct": round(float(test_stats["Max. Drawdown [%]"]), 2),
         }
-    except Exception:
-        return None
+    except Exception as e:
+        return None, (None, f"{type(e).__name__}: {e}")
+    return fold, None
 
 
 def _sequential_folds(
     data: pd.DataFrame, n_splits: int, train_pct: float
-) -> Generator[tuple[pd.DataFrame, pd.DataFrame, int], None, None]:
-    """Generate (train_data, test_data, fold_num) for sequential non-overlapping windows."""
+) -> Generator[tuple[slice, slice, int], None, None]:
+    """Generate (train_bars, test_bars, fold_num) positional slices for sequential non-overlapping windows."""
     n = len(data)
     window_size = n // n_splits
     for i in range(n_splits):
         fold_start = i * window_size
         fold_end = min((i + 1) * window_size, n)
-        fold_data = data.iloc[fold_start:fold_end]
-        if len(fold_data) < 50:
+        fold_bars = range(fold_start, fold_end)
+        if len(fold_bars) < 50:
             continue
-        train_end = int(len(fold_data) * train_pct)
-        train_data = fold_data.iloc[:train_end]
-        test_data = fold_data.iloc[train_end:]
-        if len(train_data) < 30 or len(test_data) < 10:
+        train_end = int(len(fold_bars) * train_pct)
+        train_bars = fold_bars[:train_end]
+        test_bars = fold_bars[train_end:]
+        if len(train_bars) < 30 or len(test_bars) < 10:
             continue
-        yield train_data, test_data, i + 1
+        yield slice(train_bars.start, train_bars.stop), slice(test_bars.start, test_bars.stop), i + 1
 
 
-def _rolling_folds(
-    data: pd.DataFrame, train_bars: int, step: int
-) -> Generator[tuple[pd.DataFrame, pd.DataFrame, int], None, None]:
-    """Generate (train_data, test_data, fold_num) for rolling fixed-size window."""
+def _rolling_folds(data: pd.DataFrame, train_bars: int, step: int) -> Generator[tuple[slice, slice, int], None, None]:
+    """Generate (train_bars, test_bars, fold_num) positional slices for a rolling fixed-size window."""
     n = len(data)
     fold_num = 0
     i = 0
     while i + train_bars + step <= n:
         fold_num += 1
-        train_data = data.iloc[i : i + train_bars]
-        test_data = data.iloc[i + train_bars : i + train_bars + step]
-        if len(train_data) < 30 or len(test_data) < 10:
+        if train_bars < 30 or step < 10:
             i += step
             continue
-        yield train_data, test_data, fold_num
+        yield slice(i, i + train_bars), slice(i + train_bars, i + train_bars + step), fold_num
         i += step
 
 
-def _expanding_folds(
-    data: pd.DataFrame, train_bars: int, step: int
-) -> Generator[tuple[pd.DataFrame, pd.DataFrame, int], None, None]:
-    """Generate (train_data, test_data, fold_num) for expanding window (train grows from start)."""
+def _expanding_folds(data: pd.DataFrame, train_bars: int, step: int) -> Generator[tuple[slice, slice, int], None, None]:
+    """Generate (train_bars, test_bars, fold_num) positional slices for an expanding window (train grows from start)."""
     n = len(data)
     fold_num = 0
     train_end = train_bars
     while train_end + step <= n:
         fold_num += 1
-        train_data = data.iloc[:train_end]
-        test_data = data.iloc[train_end : train_end + step]
-        if len(train_data) < 30 or len(test_data) < 10:
+        if train_end < 30 or step < 10:
             train_end += step
             continue
-        yield train_data, test_data, fold_num
+        yield slice(0, train_end), slice(train_end, train_end + step), fold_num
         train_end += step
 
 
+# (train_bars, fold_num, strategy_cls, grid, cash, commission, engine, lo, hi)
+_FoldTask = tuple[slice, int, type[Strategy], dict[str, list[Any]], float, float, str, int, int]
+
+
+def _run_fold_chunk(
+    data: pd.DataFrame,
+    task: _FoldTask,
+) -> tuple[dict[str, Any], float, list[_Failure], float, int]:
+    """Search combinations ``lo:hi`` of one fold's grid on its training bars.
+
+    Returns (best_params, best_sharpe, failures, wall seconds, worker pid).
+    Module-level so it can run in a parallel.iter_tasks() worker.
+    """
+    train_bars, _, strategy_cls, grid, cash, commission, engine, lo, hi = task
+    started = time.perf_counter()
+    best_params, best_sharpe, failures = _optimize_on_data(
+        data.iloc[train_bars], strategy_cls, grid, cash, commission, engine, range(lo, hi)
+    )
+    return best_params, best_sharpe, failures, time.perf_counter() - started, os.getpid()
+
+
+def _fold_chunks(n_combos: int, n_folds: int, jobs: int) -> list[tuple[int, int]]:
+    """``(lo, hi)`` slices of a fold's grid: one per fold, or enough to keep ``jobs`` workers busy on few folds."""
+    parts = min(-(-jobs // n_folds), n_combos) if n_folds else 1
+    bounds = [n_combos * k // parts for k in range(parts + 1)]
+    return list(itertools.pairwise(bounds))
+
+
 def walk_forward(
     strategy_name: str,
     symbol: str = "BTC-USD",
@@ -866,6 +1707,13 @@ def walk_forward(
     train_bars: int | None = None,
     step: int | None = None,
     interval: str = "1d",
+    data: pd.DataFrame | DataProvider | None = None,
+    engine: str = "reference",
+    jobs: int = 1,
+    progress: Callable[[int, int, dict[str, Any] | None], None] | None = None,
+    journal: str | Path | None = None,
+    resume: bool = False,
+    on_event: Callable[[dict[str, Any]], None] | None = None,
 ) -> dict:
     """Walk-forward analysis with multiple windowing modes.
 
@@ -878,13 +1726,39 @@ def walk_forward(
         mode: 'sequential', 'rolling', or 'expanding'.
         train_bars: Training window size in bars (rolling/expanding modes).
         step: Step size in bars for sliding the window (rolling/expanding modes).
+        data: Preloaded OHLCV DataFrame or DataProvider (default: configured provider).
+        engine: "reference" (backtesting.py) or "fast" (vectorized signal arrays).
+        jobs: Worker processes. Above 1, folds run on a process pool reading the
+              bars from shared memory, and when there are fewer folds than
+              workers each fold's grid is split across several of them;
+              folds are merged back in order and are identical to a serial run.
+        progress: Called as ``progress(done, total, fold)`` each time a fold
+                  finishes (completion order); ``fold`` is None for a skipped fold.
+        journal: Checkpoint every finished fold to this append-only JSONL
+                 file (meta_strategy.journal) as it completes.
+        resume: Reload the folds already in ``journal`` instead of running them
+                again; folds, averages and the stability report are identical
+                to an uninterrupted run. Raises ValueError when the journal
+                belongs to a different run.
+        on_event: Called with a JSON-serializable dict per event: ``start``,
+                  one ``fold`` per evaluated fold (the fold or None when
+                  skipped, the errors of failed combinations or of the fold,
+                  wall seconds summed over its grid chunks, the pid of the
+                  worker that ran its last chunk, done/total, rate and ETA)
+                  and ``end``.
+
+    Grid combinations and folds that raise are skipped and reported with a
+    RuntimeWarning naming the fold, the parameters and the error.
     """
     if strategy_name not in STRATEGIES:
         raise ValueError(f"Unknown strategy: {strategy_name}")
+    _check_engine(engine)
+    if jobs < 1:
+        raise ValueError(f"jobs must be >= 1, got {jobs}")
     if mode not in ("sequential", "rolling", "expanding"):
         raise ValueError(f"mode must be 'sequential', 'rolling', or 'expanding', got '{mode}'")
 
-    data = fetch_data(symbol, start, end, interval=interval)
+    data = load_data(data, symbol, start, end, interval)
     strategy_cls = STRATEGIES[strategy_name]
     grid = PARAM_GRIDS.get(strategy_name, {})
 
@@ -899,11 +1773,103 @@ def walk_forward(
         st = step or 100
         fold_gen = _expanding_folds(data, tb, st)
 
-    folds = []
-    for train_data, test_data, fold_num in fold_gen:
-        result = _evaluate_fold(train_data, test_data, strategy_cls, grid, cash, commission, fold_num)
-        if result:
-            folds.append(result)
+    tasks = [(train, test, fold_num) for train, test, fold_num in fold_gen]
+    log = None
+    if journal is not None:
+        base = fingerprint_base(
+            "walk-forward",
+            strategy_cls,
+            data_hash(data),
+            cash,
+            commission,
+            interval,
+            symbol,
+            engine,
+            folds=[(t[0].start, t[0].stop, t[1].start, t[1].stop, t[2]) for t in tasks],
+        )
+        log = Journal(journal, run_fingerprint(base, {"grid": grid}), resume)
+    # Folds already in the journal keep their result (None = skipped); the rest run now.
+    by_fold: dict[int, dict[str, Any] | None] = {}
+    if log is not None:
+        by_fold.update((t[2], log.done[t[2]]) for t in tasks if t[2] in log.done)
+    pending = [t for t in tasks if t[2] not in by_fold]
+    throughput = Throughput(len(tasks))
+    cached = throughput.skip(len(by_fold))
+    if on_event is not None:
+        on_event({"event": "start", "kind": "walk-forward", "strategy": strategy_name, "total": len(tasks)})
+        if by_fold:
+            on_event({"event": "cached", "count": len(by_fold), **cached})
+
+    # Each fold's grid search runs as one or more chunks; a fold is finished
+    # (tested out of sample, journaled, reported) once all of its chunks are in.
+    chunks = _fold_chunks(grid_size(grid), len(pending), jobs)
+    chunk_tasks: list[_FoldTask] = [
+        (train, fold_num, strategy_cls, grid, cash, commission, engine, lo, hi)
+        for train, _, fold_num in pending
+        for lo, hi in chunks
+    ]
+    arrived: dict[int, dict[int, tuple[dict[str, Any], float, list[_Failure], float, int]]] = {}
+    try:
+        for i, result in iter_tasks(data, _run_fold_chunk, chunk_tasks, jobs):
+            if isinstance(result, BaseException):
+                raise result
+            train, test, fold_num = pending[i // len(chunks)]
+            parts = arrived.setdefault(fold_num, {})
+            parts[i % len(chunks)] = result
+            if len(parts) < len(chunks):
+                continue
+            # Merge in grid order with a strict comparison, as one serial search would.
+            best_params: dict[str, Any] = {}
+            best_sharpe = -999.0
+            failures: list[_Failure] = []
+            for k in range(len(chunks)):
+                chunk_params, sharpe, chunk_failures, _, _ = parts[k]
+                failures.extend(chunk_failures)
+                if sharpe > best_sharpe:
+                    best_params, best_sharpe = chunk_params, sharpe
+            started = time.perf_counter()
+            fold, failure = _test_fold(
+                data.iloc[train],
+                data.iloc[test],
+                strategy_cls,
+                best_params,
+                best_sharpe,
+                cash,
+                commission,
+                fold_num,
+                engine,
+            )
+            if failure is not None:
+                failures.append(failure)
+            seconds = time.perf_counter() - started + sum(part[3] for part in parts.values())
+            by_fold[fold_num] = fold
+            del arrived[fold_num]
+            for params, error in failures:
+                subject = f"fold {fold_num}" if params is None else f"fold {fold_num} {params}"
+                warnings.warn(f"{strategy_name} {subject} failed: {error}", RuntimeWarning, stacklevel=2)
+            counts = throughput.step()
+            if log is not None:
+                log.record_many([(fold_num, fold)])
+            if on_event is not None:
+                on_event(
+                    {
+                        "event": "fold",
+                        "fold": fold_num,
+                        "result": fold,
+                        "errors": [{"params": params, "error": error} for params, error in failures],
+                        "seconds": round(seconds, 6),
+                        "worker": result[4],
+                        **counts,
+                    }
+                )
+            if progress:
+                progress(counts["done"], len(tasks), fold)
+    finally:
+        if log is not None:
+            log.close()
+    if on_event is not None:
+        on_event({"event": "end", "kind": "walk-forward", "evaluated": len(pending), **throughput.step(0)})
+    folds = [fold for t in tasks if (fold := by_fold[t[2]])]
 
     avg_test_return = np.mean([f["test_return_pct"] for f in folds]) if folds else 0.0
     avg_test_sharpe = np.mean([f["test_sharpe"] for f in folds]) if folds else 0.0
@@ -1,6 +1,9 @@
 """Meta Strategy CLI — TradingView indicator-to-strategy converter."""
 
+import functools
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
 import typer
 import yaml
@@ -15,6 +18,97 @@ app = typer.Typer(
 )
 
 
+@app.callback()
+def data_options(
+    cache: bool = typer.Option(True, "--cache/--no-cache", help="Read and write the on-disk OHLCV cache"),
+    refresh_cache: bool = typer.Option(False, help="Ignore cached bars and re-download them"),
+    cache_dir: Path | None = typer.Option(None, help="Cache directory (default: ~/.cache/meta-strategy)"),
+    data_source: str = typer.Option("yfinance", help="Market data backend: yfinance, dir (CSV/Parquet) or npy (mmap)"),
+    data_path: Path | None = typer.Option(None, help="Root directory for the dir and npy data sources"),
+    store: bool = typer.Option(
+        True, "--store/--no-store", help="Serve repeated backtest/optimize runs from the result store"
+    ),
+) -> None:
+    """Global market-data options, applied before any command runs."""
+    from .data import configure_cache, configure_data_source
+    from .store import configure_result_store
+
+    configure_cache(enabled=cache, refresh=refresh_cache, directory=cache_dir)
+    configure_result_store(enabled=store)
+    try:
+        configure_data_source(data_source, data_path)
+    except ValueError as e:
+        typer.echo(f"❌ {e}", err=True)
+        raise typer.Exit(1) from e
+
+
+def _echo_indicator_cache(echo: Callable[..., None] = typer.echo) -> None:
+    from .indicator_cache import INDICATOR_CACHE
+
+    stats = INDICATOR_CACHE.stats()
+    echo(
+        f"🧮 Indicator cache: {stats['hits']} hits / {stats['misses']} misses "
+        f"({stats['hit_rate_pct']:.1f}% hit rate, {stats['bytes'] / 1024**2:.1f} MB)"
+    )
+
+
+EVENT_FORMATS = ("jsonl",)
+
+
+def _status_echo(events: str | None) -> Callable[..., None]:
+    """typer.echo for a command's human-readable output: stderr while ``--events`` keeps stdout pure JSON lines."""
+    return functools.partial(typer.echo, err=events is not None)
+
+
+def _event_sink(events: str | None, unit: str) -> Callable[[dict[str, Any]], None]:
+    """Progress-event handler: JSON lines on stdout with ``--events jsonl``, plus a live rate/ETA line on stderr.
+
+    With events on, stdout carries nothing but the JSON lines; commands print
+    their human-readable output through _status_echo(), which moves it to stderr.
+
+    The live line is redrawn in place at most twice a second on a terminal,
+    and printed every 5 seconds otherwise (logs, orchestration).
+    """
+    import json
+    import sys
+    import time
+    from datetime import timedelta
+
+    if events is not None and events not in EVENT_FORMATS:
+        typer.echo(f"❌ Unknown events format: {events}. Available: {', '.join(EVENT_FORMATS)}", err=True)
+        raise typer.Exit(1)
+    tty = sys.stderr.isatty()
+    last = 0.0
+
+    def handle(event: dict[str, Any]) -> None:
+        nonlocal last
+        if events == "jsonl":
+            typer.echo(json.dumps(event, default=str))
+        if event["event"] == "start":
+            return
+        if event["event"] == "cached":
+            typer.echo(f"♻️  {event['count']:,} of {event['total']:,} {unit} already done", err=True)
+            return
+        final = event["event"] == "end"
+        now = time.monotonic()
+        if not final and now - last < (0.5 if tty else 5.0):
+            return
+        last = now
+        eta = str(timedelta(seconds=round(event["eta_s"]))) if event["eta_s"] is not None else "-"
+        line = f"⏳ {event['done']:,}/{event['total']:,} {unit} · {event['rate_per_s']:,.1f} {unit}/s · ETA {eta}"
+        typer.echo(f"\r{line}" if tty else line, err=True, nl=final or not tty)
+
+    return handle
+
+
+def _check_engine(engine: str) -> None:
+    from .backtest import ENGINES
+
+    if engine not in ENGINES:
+        typer.echo(f"❌ Unknown engine: {engine}. Available: {', '.join(ENGINES)}", err=True)
+        raise typer.Exit(1)
+
+
 @app.command()
 def generate(
     definition_path: Path = typer.Argument(..., help="Path to YAML strategy definition"),
@@ -55,6 +149,14 @@ def validate(
         typer.echo(f"   Entry: {defn.entry_condition}")
         typer.echo(f"   Exit: {defn.exit_condition}")
         typer.echo(f"   Special instructions: {len(defn.special_instructions)}")
+        if defn.strategy_params:
+            from .space import parameter_space, prune_report
+
+            pruning = prune_report(*parameter_space(defn))
+            typer.echo(
+                f"   Parameter space: {pruning['combinations']} combinations, "
+                f"{pruning['feasible']} meeting {len(defn.constraints)} constraint(s)"
+            )
     except Exception as e:
         typer.echo(f"❌ Invalid: {e}", err=True)
         raise typer.Exit(1) from e
@@ -121,6 +223,7 @@ def backtest(
     cash: float = typer.Option(100_000.0, help="Initial capital"),
     commission: float = typer.Option(0.001, help="Commission rate (0.001 = 0.1%)"),
     interval: str = typer.Option("1d", help="Candle interval (1h, 4h, 1d, etc.)"),
+    engine: str = typer.Option("reference", help="Backtest engine: reference (backtesting.py) or fast (vectorized)"),
 ) -> None:
     """Run a backtest for a single strategy."""
     from .backtest import STRATEGIES, SUB_DAILY_INTERVALS, run_backtest
@@ -129,13 +232,21 @@ def backtest(
         typer.echo(f"❌ Unknown strategy: {strategy_name}", err=True)
         typer.echo(f"   Available: {', '.join(STRATEGIES.keys())}", err=True)
         raise typer.Exit(1)
+    _check_engine(engine)
 
     if strategy_name == "bull-market-support-band" and interval in SUB_DAILY_INTERVALS:
         typer.echo(f"⚠️  BMSB uses weekly moving averages — results on {interval} may not be meaningful")
 
     typer.echo(f"📊 Running {strategy_name} on {symbol} ({start} → {end or 'today'}, {interval})...")
     result = run_backtest(
-        strategy_name, symbol=symbol, start=start, end=end, cash=cash, commission=commission, interval=interval
+        strategy_name,
+        symbol=symbol,
+        start=start,
+        end=end,
+        cash=cash,
+        commission=commission,
+        interval=interval,
+        engine=engine,
     )
 
     typer.echo(f"\n{'=' * 60}")
@@ -166,11 +277,15 @@ def backtest_all(
 ) -> None:
     """Run all strategies and show comparison table."""
     from .backtest import run_all_backtests
+    from .data import SharedDataProvider
 
     typer.echo(f"📊 Running all strategies on {symbol} ({start} → {end or 'today'}, {interval})...\n")
+    provider = SharedDataProvider()
     results = run_all_backtests(
-        symbol=symbol, start=start, end=end, cash=cash, commission=commission, interval=interval
+        symbol=symbol, start=start, end=end, cash=cash, commission=commission, interval=interval, data=provider
     )
+    n_run = sum(1 for r in results if not r.get("skipped"))
+    typer.echo(f"📥 Data fetches: {provider.fetches} (shared by {n_run} strategies)\n")
 
     if results:
         r0 = next((r for r in results if not r.get("skipped")), None)
@@ -254,11 +369,16 @@ def multi_asset_cmd(
 ) -> None:
     """Run a strategy across multiple assets."""
     from .backtest import run_multi_asset
+    from .data import SharedDataProvider
 
     symbol_list = [s.strip() for s in symbols.split(",")]
     typer.echo(f"📊 Running {strategy_name} across {len(symbol_list)} assets...\n")
 
-    results = run_multi_asset(strategy_name, symbols=symbol_list, start=start, cash=cash, commission=commission)
+    provider = SharedDataProvider()
+    results = run_multi_asset(
+        strategy_name, symbols=symbol_list, start=start, cash=cash, commission=commission, data=provider
+    )
+    typer.echo(f"📥 Data fetches: {provider.fetches} for {len(symbol_list)} assets\n")
 
     header = f"{'Symbol':<12} {'Return%':>10} {'B&H%':>10} {'WinRate%':>10} {'Trades':>8} {'MaxDD%':>10} {'Sharpe':>8}"
     sep = "-" * len(header)
@@ -287,33 +407,129 @@ def optimize(
     strategy_name: str = typer.Argument(..., help="Strategy name"),
     symbol: str = typer.Option("BTC-USD", help="Asset symbol"),
     start: str = typer.Option("2018-01-01", help="Start date"),
-    top: int = typer.Option(10, help="Show top N results"),
+    top: int = typer.Option(10, help="Show top N results (only these are kept in memory)"),
     cash: float = typer.Option(100_000.0, help="Initial capital"),
     split: float = typer.Option(0.7, help="Train/test split ratio (0.7 = 70%% train). Use 1.0 for no split."),
     interval: str = typer.Option("1d", help="Candle interval (1h, 4h, 1d, etc.)"),
+    engine: str = typer.Option("reference", help="Backtest engine: reference (backtesting.py) or fast (vectorized)"),
+    jobs: int = typer.Option(1, min=1, help="Worker processes for the grid search (1 = serial)"),
+    rank_by: str = typer.Option(
+        "sharpe_ratio",
+        help="Metric to rank by: sharpe_ratio, return_pct, sortino_ratio, calmar_ratio, profit_factor, ...",
+    ),
+    overfitting: bool = typer.Option(
+        False, help="Report the probability of backtest overfitting (CSCV) and Deflated Sharpe over the whole grid"
+    ),
+    partitions: int = typer.Option(16, help="With --overfitting: time partitions for CSCV (even)"),
+    spill: Path | None = typer.Option(None, help="Also write every combination's result to this JSONL file"),
+    journal: Path | None = typer.Option(
+        None, help="Checkpoint every finished combination to this file (off by default; not with --overfitting)"
+    ),
+    resume: bool = typer.Option(
+        False,
+        help="Journal the run and skip the combinations already checkpointed by an interrupted one "
+        "(default journal: <cache_dir>/journals/optimize-<strategy>-<symbol>-<interval>.jsonl)",
+    ),
+    events: str | None = typer.Option(
+        None,
+        help="Stream one event per evaluated combination to stdout: jsonl (params, metrics, time, worker); "
+        "all other output then goes to stderr",
+    ),
+    search: str = typer.Option("grid", help="Search strategy: grid (exhaustive), random, halving or bayes"),
+    budget: int | None = typer.Option(
+        None, help="Combinations to evaluate (random, bayes) or starting candidates (halving)"
+    ),
+    seed: int = typer.Option(42, help="Seed of the random, halving and bayes searches"),
+    space: Path | None = typer.Option(
+        None, help="YAML strategy definition whose strategy_params and constraints give the parameter space"
+    ),
 ) -> None:
-    """Grid search parameter optimization with train/test split."""
-    from .backtest import PARAM_GRIDS, optimize_strategy
+    """Parameter optimization (grid, random, successive halving or Bayesian search) with train/test split."""
+    from .backtest import PARAM_GRIDS, RANK_METRICS, RISK_RANK_METRICS, STRATEGIES, optimize_strategy
+    from .journal import journal_path
+    from .space import load_space, prune_report
+
+    _check_engine(engine)
+    if rank_by not in RANK_METRICS:
+        typer.echo(f"❌ Unknown rank metric: {rank_by}", err=True)
+        typer.echo(f"   Available: {', '.join(RANK_METRICS)}", err=True)
+        raise typer.Exit(1)
+    on_event = _event_sink(events, "combos")
+    echo = _status_echo(events)
+    if overfitting and (resume or journal is not None):
+        flag = "--resume" if resume else "--journal"
+        typer.echo(f"❌ {flag} cannot be combined with --overfitting (equity curves are not checkpointed)", err=True)
+        raise typer.Exit(1)
+    if resume and journal is None:
+        journal = journal_path("optimize", strategy_name, symbol, interval)
 
     grid = PARAM_GRIDS.get(strategy_name, {})
-    n_combos = 1
-    for v in grid.values():
-        n_combos *= len(v)
+    constraints: list[str] = []
+    if space is not None:
+        try:
+            grid, constraints = load_space(space)
+        except (OSError, ValueError) as e:
+            typer.echo(f"❌ {e}", err=True)
+            raise typer.Exit(1) from None
+        strategy_cls = STRATEGIES.get(strategy_name)
+        unknown = [name for name in grid if strategy_cls is not None and not hasattr(strategy_cls, name)]
+        if unknown:
+            typer.echo(f"❌ {space} sets parameters {strategy_name} does not have: {', '.join(unknown)}", err=True)
+            raise typer.Exit(1)
+    pruning = prune_report(grid, constraints)
+    n_combos = pruning["feasible"]
 
     has_split = split < 1.0
     split_label = f", {split:.0%} train" if has_split else ""
-    typer.echo(f"🔍 Optimizing {strategy_name} on {symbol} ({n_combos} combinations{split_label}, {interval})...\n")
+    jobs_label = f", {jobs} jobs" if jobs > 1 else ""
+    search_label = f"{search} search, budget {budget} of " if search != "grid" else ""
+    echo(
+        f"🔍 Optimizing {strategy_name} on {symbol} "
+        f"({search_label}{n_combos} combinations{split_label}, {interval}{jobs_label})...\n"
+    )
+    if pruning["pruned"]:
+        echo(
+            f"✂️  Constraints pruned {pruning['pruned']} of {pruning['combinations']} combinations "
+            f"({pruning['pruned'] / pruning['combinations']:.0%}): {pruning['pruned']} backtests saved\n"
+        )
 
-    results = optimize_strategy(strategy_name, symbol=symbol, start=start, cash=cash, split=split, interval=interval)
+    try:
+        results = optimize_strategy(
+            strategy_name,
+            symbol=symbol,
+            start=start,
+            cash=cash,
+            split=split,
+            interval=interval,
+            engine=engine,
+            jobs=jobs,
+            rank_by=rank_by,
+            keep_equity=overfitting,
+            top=None if overfitting else max(top, 1),  # the overfitting analysis needs every combination
+            spill=spill,
+            journal=journal,
+            resume=resume,
+            on_event=on_event,
+            search=search,
+            budget=budget,
+            seed=seed,
+            param_grid=grid if space is not None else None,
+            constraints=constraints,
+        )
+    except ValueError as e:
+        typer.echo(f"❌ {e}", err=True)
+        raise typer.Exit(1) from None
+    # Risk metrics are not in the standard columns; show the one ranked by.
+    extra_header = f" {rank_by:>24}" if rank_by in RISK_RANK_METRICS else ""
 
     if has_split:
         header = (
             f"{'Rank':<6} {'Params':<35} {'IS Ret%':>9} {'IS Sharpe':>10} "
-            f"{'OOS Ret%':>9} {'OOS Sharpe':>11} {'Trades':>8} {'MaxDD%':>8} {'WinR%':>8}"
+            f"{'OOS Ret%':>9} {'OOS Sharpe':>11} {'Trades':>8} {'MaxDD%':>8} {'WinR%':>8}{extra_header}"
         )
         sep = "-" * len(header)
-        typer.echo(header)
-        typer.echo(sep)
+        echo(header)
+        echo(sep)
         for i, r in enumerate(results[:top], 1):
             params_str = ", ".join(f"{k}={v}" for k, v in r["params"].items())
             line = (
@@ -321,22 +537,27 @@ def optimize(
                 f"{r['return_pct']:>9.2f} {r['sharpe_ratio']:>11.2f} {r['num_trades']:>8d} "
                 f"{r['max_drawdown_pct']:>8.2f} {r['win_rate_pct']:>8.2f}"
             )
-            typer.echo(line)
+            if extra_header:
+                line += f" {r[rank_by]:>24.3f}"
+            echo(line)
     else:
         header = (
             f"{'Rank':<6} {'Params':<40} {'Return%':>10} {'Sharpe':>8} {'Trades':>8} {'MaxDD%':>10} {'WinRate%':>10}"
+            f"{extra_header}"
         )
-        sep = "-" * 92
-        typer.echo(header)
-        typer.echo(sep)
+        sep = "-" * (92 + len(extra_header))
+        echo(header)
+        echo(sep)
         for i, r in enumerate(results[:top], 1):
             params_str = ", ".join(f"{k}={v}" for k, v in r["params"].items())
             line = (
                 f"{i:<6} {params_str:<40} {r['return_pct']:>10.2f} {r['sharpe_ratio']:>8.2f} "
                 f"{r['num_trades']:>8d} {r['max_drawdown_pct']:>10.2f} {r['win_rate_pct']:>10.2f}"
             )
-            typer.echo(line)
-    typer.echo(sep)
+            if extra_header:
+                line += f" {r[rank_by]:>24.3f}"
+            echo(line)
+    echo(sep)
 
     if results:
         best = results[0]
@@ -345,7 +566,7 @@ def optimize(
                 f"\n🏆 Best params: {best['params']} "
                 f"(OOS Sharpe: {best['sharpe_ratio']:.2f}, IS Sharpe: {best['is_sharpe_ratio']:.2f})"
             )
-            typer.echo(best_line)
+            echo(best_line)
             from .backtest import check_overfitting
 
             warning = check_overfitting(best)
@@ -356,13 +577,34 @@ def optimize(
                     f"is {ratio_str} out-of-sample Sharpe ({warning['oos_sharpe']:.2f}). "
                     "Results may not generalize."
                 )
-                typer.echo(warning_msg)
+                echo(warning_msg)
         else:
             best_line = (
                 f"\n🏆 Best params: {best['params']} "
                 f"(Sharpe: {best['sharpe_ratio']:.2f}, Return: {best['return_pct']:.2f}%)"
             )
-            typer.echo(best_line)
+            echo(best_line)
+    if overfitting and len(results) > 1:
+        from .significance import overfitting_report
+
+        try:
+            report = overfitting_report(results, partitions)
+        except ValueError as e:
+            typer.echo(f"❌ {e}", err=True)
+            raise typer.Exit(1) from None
+        echo(f"\n🧮 Overfitting across {report['n_trials']} combinations ({report['n_splits']} CSCV splits)")
+        echo(f"   PBO:                 {report['pbo']:.1%} (P(best in-sample ranks below median out-of-sample))")
+        echo(f"   P(OOS loss):         {report['prob_oos_loss']:.1%}")
+        echo(
+            f"   Deflated Sharpe:     {report['deflated_sharpe']:.4f} (Sharpe {report['best_sharpe']:.2f} "
+            f"vs {report['expected_max_sharpe']:.2f} expected max from luck)"
+        )
+        if report["pbo"] > 0.5 or report["deflated_sharpe"] < 0.95:
+            echo("⚠️  The grid's best combination is likely a product of selection, not skill.")
+    if spill is not None:
+        echo(f"\n💾 Every combination's result written to {spill}")
+    if jobs == 1:  # worker processes keep their own caches
+        _echo_indicator_cache(echo)
 
 
 @app.command(name="walk-forward")
@@ -377,9 +619,29 @@ def walk_forward_cmd(
     train_bars: int | None = typer.Option(None, help="Training window size in bars (rolling/expanding)"),
     step: int | None = typer.Option(None, help="Step size in bars (rolling/expanding)"),
     interval: str = typer.Option("1d", help="Candle interval (1h, 4h, 1d, etc.)"),
+    engine: str = typer.Option("reference", help="Backtest engine: reference (backtesting.py) or fast (vectorized)"),
+    jobs: int = typer.Option(1, min=1, help="Worker processes for fold evaluation (1 = serial)"),
+    journal: Path | None = typer.Option(None, help="Checkpoint every finished fold to this file (off by default)"),
+    resume: bool = typer.Option(
+        False,
+        help="Journal the run and skip the folds already checkpointed by an interrupted one "
+        "(default journal: <cache_dir>/journals/walk-forward-<strategy>-<symbol>-<interval>.jsonl)",
+    ),
+    events: str | None = typer.Option(
+        None,
+        help="Stream one event per evaluated fold to stdout: jsonl (fold, metrics, time, worker); "
+        "all other output then goes to stderr",
+    ),
 ) -> None:
     """Walk-forward analysis with out-of-sample validation."""
     from .backtest import walk_forward
+    from .journal import journal_path
+
+    _check_engine(engine)
+    on_event = _event_sink(events, "folds")
+    echo = _status_echo(events)
+    if resume and journal is None:
+        journal = journal_path("walk-forward", strategy_name, symbol, interval)
 
     if mode == "sequential":
         label = f"{splits} folds, {train_pct:.0%} train"
@@ -387,50 +649,69 @@ def walk_forward_cmd(
         tb = train_bars or 500
         st = step or 100
         label = f"{mode}, {tb} train bars, {st} step"
-    typer.echo(f"🔄 Walk-forward analysis: {strategy_name} on {symbol} ({label}, {interval})...\n")
+    jobs_label = f", {jobs} jobs" if jobs > 1 else ""
+    echo(f"🔄 Walk-forward analysis: {strategy_name} on {symbol} ({label}, {interval}{jobs_label})...\n")
 
-    result = walk_forward(
-        strategy_name,
-        symbol=symbol,
-        start=start,
-        n_splits=splits,
-        train_pct=train_pct,
-        cash=cash,
-        mode=mode,
-        train_bars=train_bars,
-        step=step,
-        interval=interval,
-    )
+    def _progress(done: int, total: int, fold: dict[str, Any] | None) -> None:
+        status = f"fold {fold['fold']} test Sharpe {fold['test_sharpe']:.2f}" if fold else "fold skipped"
+        echo(f"  ⏳ [{done}/{total}] {status}")
+
+    try:
+        result = walk_forward(
+            strategy_name,
+            symbol=symbol,
+            start=start,
+            n_splits=splits,
+            train_pct=train_pct,
+            cash=cash,
+            mode=mode,
+            train_bars=train_bars,
+            step=step,
+            interval=interval,
+            engine=engine,
+            jobs=jobs,
+            progress=_progress,
+            journal=journal,
+            resume=resume,
+            on_event=on_event,
+        )
+    except ValueError as e:
+        typer.echo(f"❌ {e}", err=True)
+        raise typer.Exit(1) from None
+    echo("")
 
     for f in result["folds"]:
         params_str = ", ".join(f"{k}={v}" for k, v in f["best_params"].items()) if f["best_params"] else "default"
-        typer.echo(f"  Fold {f['fold']}: train {f['train_period']} | test {f['test_period']}")
-        typer.echo(f"          params: {params_str}")
+        echo(f"  Fold {f['fold']}: train {f['train_period']} | test {f['test_period']}")
+        echo(f"          params: {params_str}")
         fold_line = (
             f"          train Sharpe: {f['train_sharpe']:.2f} → test Return: {f['test_return_pct']:.2f}%, "
             f"Sharpe: {f['test_sharpe']:.2f}, Trades: {f['test_trades']}, MaxDD: {f['test_max_dd_pct']:.2f}%"
         )
-        typer.echo(fold_line)
-        typer.echo("")
+        echo(fold_line)
+        echo("")
 
-    typer.echo(
+    echo(
         f"\n📊 Average out-of-sample: Return {result['avg_test_return_pct']:.2f}%, "
         f"Sharpe {result['avg_test_sharpe']:.2f}"
     )
 
     stability = result.get("param_stability", {})
     if stability and stability.get("params_per_fold"):
-        typer.echo(f"\n📋 Parameter Stability: {stability['score_pct']:.0f}% stable")
+        echo(f"\n📋 Parameter Stability: {stability['score_pct']:.0f}% stable")
         if stability["changes"]:
-            typer.echo("   ⚠️  Unstable parameters (>50% change between consecutive folds):")
+            echo("   ⚠️  Unstable parameters (>50% change between consecutive folds):")
             for c in stability["changes"]:
                 change_line = (
                     f"      {c['param']}: fold {c['fold_from']}→{c['fold_to']}: "
                     f"{c['prev']} → {c['curr']} ({c['pct_change']:.0f}% change)"
                 )
-                typer.echo(change_line)
+                echo(change_line)
         else:
-            typer.echo("   ✅ All parameters consistent across folds")
+            echo("   ✅ All parameters consistent across folds")
+    if jobs == 1:  # worker processes keep their own caches
+        echo("")
+        _echo_indicator_cache(echo)
 
 
 @app.command()
@@ -457,10 +738,13 @@ def dashboard(
     cash: float = typer.Option(100_000.0, help="Initial capital"),
 ) -> None:
     """Generate comparison dashboard for all strategies."""
+    from .data import SharedDataProvider
     from .reports import generate_dashboard
 
     typer.echo(f"📊 Generating dashboard for all strategies on {symbol}...")
-    generate_dashboard(symbol=symbol, start=start, cash=cash, output_path=output)
+    provider = SharedDataProvider()
+    generate_dashboard(symbol=symbol, start=start, cash=cash, output_path=output, data=provider)
+    typer.echo(f"📥 Data fetches: {provider.fetches}")
     typer.echo(f"✅ Dashboard saved to {output}")
 
 
@@ -474,10 +758,13 @@ def export(
 ) -> None:
     """Export backtest results to CSV or JSON."""
     from .backtest import run_all_backtests
+    from .data import SharedDataProvider
     from .reports import export_results_csv, export_results_json
 
     typer.echo(f"📦 Running all strategies and exporting as {fmt}...")
-    results = run_all_backtests(symbol=symbol, start=start, cash=cash)
+    provider = SharedDataProvider()
+    results = run_all_backtests(symbol=symbol, start=start, cash=cash, data=provider)
+    typer.echo(f"📥 Data fetches: {provider.fetches}")
 
     if fmt == "json":
         path = f"{output}.json"
@@ -499,19 +786,47 @@ def monte_carlo_cmd(
     start: str = typer.Option("2018-01-01", help="Start date"),
     simulations: int = typer.Option(1000, help="Number of Monte Carlo simulations"),
     cash: float = typer.Option(100_000.0, help="Initial capital"),
+    paths: bool = typer.Option(False, "--paths", help="Also report drawdown, time under water and a fan chart"),
+    block_size: int = typer.Option(1, "--block-size", help="Mean run of consecutive trades per draw (1 = i.i.d.)"),
+    bootstrap: str = typer.Option("stationary", help="Block resampling: stationary or block"),
+    tolerance: float | None = typer.Option(
+        None, help="Stop once p5/p50/p95 and P(profit) are within ± this many points (--simulations is the cap)"
+    ),
 ) -> None:
     """Monte Carlo simulation for strategy robustness."""
     from .risk import monte_carlo
 
     typer.echo(f"🎲 Running {simulations} Monte Carlo simulations for {strategy_name} on {symbol}...\n")
-    result = monte_carlo(strategy_name, symbol=symbol, start=start, cash=cash, n_simulations=simulations)
+    try:
+        result = monte_carlo(
+            strategy_name,
+            symbol=symbol,
+            start=start,
+            cash=cash,
+            n_simulations=simulations,
+            block_size=block_size,
+            bootstrap=bootstrap,
+            paths=paths,
+            tolerance=tolerance,
+        )
+    except ValueError as e:
+        typer.echo(f"❌ {e}", err=True)
+        raise typer.Exit(1) from None
+
+    _echo_monte_carlo(result, tolerance, paths)
+
 
+def _echo_monte_carlo(result: dict, tolerance: float | None, paths: bool) -> None:
     if result["n_trades"] == 0:
         typer.echo("⚠️  No trades were generated — cannot run simulation.")
         return
 
     typer.echo(f"  Original Return:    {result['original_return_pct']:>10.2f}%")
     typer.echo(f"  Simulations:        {result['n_simulations']:>10d}")
+    if tolerance is not None:
+        widths = ", ".join(f"{k} ±{v}" for k, v in result["half_widths"].items())
+        status = "converged" if result["converged"] else f"not converged at ±{tolerance} (cap reached)"
+        typer.echo(f"  Convergence:        {status} — 95% CI {widths}")
     typer.echo(f"  Trades resampled:   {result['n_trades']:>10d}")
     typer.echo("")
     typer.echo(f"  5th percentile:     {result['p5_return_pct']:>10.2f}%  (worst case)")
@@ -521,6 +836,21 @@ def monte_carlo_cmd(
     typer.echo(f"  Std Dev:            {result['std_return_pct']:>10.2f}%")
     typer.echo(f"  P(Profit):          {result['prob_profit_pct']:>10.1f}%")
 
+    if not paths:
+        return
+    dd, tuw = result["max_drawdown_percentiles"], result["time_under_water_percentiles"]
+    typer.echo("")
+    typer.echo(f"  Max Drawdown:       p5 {dd['p5']:.2f}%  p50 {dd['p50']:.2f}%  p95 {dd['p95']:.2f}%")
+    typer.echo(f"  Time Under Water:   p5 {tuw['p5']:.0f}  p50 {tuw['p50']:.0f}  p95 {tuw['p95']:.0f} trades")
+    typer.echo("")
+    typer.echo("  Fan chart (equity return % after N trades):")
+    typer.echo(f"  {'Trade':>7} {'p5':>10} {'p25':>10} {'p50':>10} {'p75':>10} {'p95':>10}")
+    fan = result["fan_chart"]
+    n_steps = len(fan["p50"]) - 1
+    for step in sorted({round(n_steps * k / 10) for k in range(1, 11)}):
+        row = " ".join(f"{fan[q][step]:>10.2f}" for q in ("p5", "p25", "p50", "p75", "p95"))
+        typer.echo(f"  {step:>7} {row}")
+
 
 @app.command(name="risk-metrics")
 def risk_metrics_cmd(
@@ -528,13 +858,45 @@ def risk_metrics_cmd(
     symbol: str = typer.Option("BTC-USD", help="Asset symbol"),
     start: str = typer.Option("2018-01-01", help="Start date"),
     cash: float = typer.Option(100_000.0, help="Initial capital"),
+    rolling: bool = typer.Option(False, "--rolling", help="Also report rolling Sharpe, Sortino and drawdown"),
+    windows: str = typer.Option("90,180,365", help="Rolling windows in bars, comma-separated (with --rolling)"),
 ) -> None:
     """Extended risk metrics (Sortino, Calmar, profit factor, etc.)."""
     from .risk import run_risk_analysis
 
+    try:
+        rolling_windows = [int(w) for w in windows.split(",")] if rolling else None
+    except ValueError:
+        typer.echo(f"❌ Invalid --windows: {windows}. Use comma-separated bar counts, e.g. 90,180,365", err=True)
+        raise typer.Exit(1) from None
+
     typer.echo(f"📊 Computing risk metrics for {strategy_name} on {symbol}...\n")
-    m = run_risk_analysis(strategy_name, symbol=symbol, start=start, cash=cash)
+    try:
+        m = run_risk_analysis(strategy_name, symbol=symbol, start=start, cash=cash, rolling_windows=rolling_windows)
+    except ValueError as e:
+        typer.echo(f"❌ {e}", err=True)
+        raise typer.Exit(1) from None
+
+    _echo_risk_metrics(m)
+    if rolling_windows:
+        _echo_rolling(m["rolling"])
+
+
+def _echo_rolling(rolling: dict) -> None:
+    typer.echo("\n  Rolling (latest / median / worst):")
+    typer.echo(
+        f"  {'Window':>7} {'Sharpe':>8} {'Sortino':>8} {'DD%':>8} {'Med Sharpe':>11} {'Min Sharpe':>11} {'Max DD%':>8}"
+    )
+    for w, r in rolling.items():
+        typer.echo(
+            f"  {w:>7} {r['sharpe']:>8.2f} {r['sortino']:>8.2f} {r['drawdown_pct']:>8.2f} "
+            f"{r['median_sharpe']:>11.2f} {r['min_sharpe']:>11.2f} {r['max_drawdown_pct']:>8.2f}"
+        )
+    if not rolling:
+        typer.echo("  (not enough bars for any window)")
+
 
+def _echo_risk_metrics(m: dict) -> None:
     typer.echo(f"  Sharpe Ratio:           {m['sharpe_ratio']:>10.3f}")
     typer.echo(f"  Sortino Ratio:          {m['sortino_ratio']:>10.3f}")
     typer.echo(f"  Calmar Ratio:           {m['calmar_ratio']:>10.3f}")
@@ -548,6 +910,301 @@ def risk_metrics_cmd(
     typer.echo(f"  # Trades:               {m['num_trades']:>10d}")
 
 
+@app.command()
+def analyze(
+    strategy_name: str = typer.Argument(..., help="Strategy name"),
+    symbol: str = typer.Option("BTC-USD", help="Asset symbol"),
+    start: str = typer.Option("2018-01-01", help="Start date"),
+    end: str | None = typer.Option(None, help="End date (default: today)"),
+    cash: float = typer.Option(100_000.0, help="Initial capital"),
+    commission: float = typer.Option(0.001, help="Commission rate"),
+    interval: str = typer.Option("1d", help="Candle interval (1h, 4h, 1d, etc.)"),
+    engine: str = typer.Option("reference", help="Backtest engine: reference (backtesting.py) or fast (vectorized)"),
+    simulations: int = typer.Option(1000, help="Number of Monte Carlo simulations"),
+    tolerance: float | None = typer.Option(
+        None, help="Stop once p5/p50/p95 and P(profit) are within ± this many points (--simulations is the cap)"
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print one JSON object instead of the text report"),
+) -> None:
+    """Backtest once, then report core stats, extended risk metrics and Monte Carlo from the same run."""
+    import json
+
+    from .backtest import STRATEGIES, run_backtest
+    from .risk import monte_carlo, run_risk_analysis
+
+    if strategy_name not in STRATEGIES:
+        typer.echo(f"❌ Unknown strategy: {strategy_name}", err=True)
+        raise typer.Exit(1)
+    _check_engine(engine)
+
+    if not as_json:
+        typer.echo(f"🔬 Analyzing {strategy_name} on {symbol} ({start} → {end or 'today'}, {interval})...")
+    result = run_backtest(
+        strategy_name,
+        symbol=symbol,
+        start=start,
+        end=end,
+        cash=cash,
+        commission=commission,
+        interval=interval,
+        engine=engine,
+        include_stats=True,
+    )
+    stats = result.pop("_stats")
+    try:
+        risk = run_risk_analysis(strategy_name, symbol=symbol, stats=stats)
+        mc = monte_carlo(strategy_name, symbol=symbol, n_simulations=simulations, tolerance=tolerance, stats=stats)
+    except ValueError as e:
+        typer.echo(f"❌ {e}", err=True)
+        raise typer.Exit(1) from None
+
+    if as_json:
+        typer.echo(json.dumps({"backtest": result, "risk_metrics": risk, "monte_carlo": mc}))
+        return
+
+    typer.echo(f"\n{'=' * 60}")
+    typer.echo(f"  Return:          {result['return_pct']:>10.2f}%")
+    typer.echo(f"  Buy & Hold:      {result['buy_hold_return_pct']:>10.2f}%")
+    typer.echo(f"  Win Rate:        {result['win_rate_pct']:>10.2f}%")
+    typer.echo(f"  # Trades:        {result['num_trades']:>10d}")
+    typer.echo(f"  Max Drawdown:    {result['max_drawdown_pct']:>10.2f}%")
+    typer.echo(f"  Final Equity:    ${result['final_equity']:>10.2f}")
+    typer.echo(f"{'=' * 60}")
+    typer.echo("\n📊 Risk metrics\n")
+    _echo_risk_metrics(risk)
+    typer.echo(f"\n🎲 Monte Carlo ({simulations} simulations{' max' if tolerance is not None else ''})\n")
+    _echo_monte_carlo(mc, tolerance, paths=False)
+
+
+@app.command()
+def significance(
+    strategy_name: str = typer.Argument(..., help="Strategy name"),
+    symbol: str = typer.Option("BTC-USD", help="Asset symbol"),
+    start: str = typer.Option("2018-01-01", help="Start date"),
+    end: str | None = typer.Option(None, help="End date (default: today)"),
+    cash: float = typer.Option(100_000.0, help="Initial capital"),
+    commission: float = typer.Option(0.001, help="Commission rate"),
+    interval: str = typer.Option("1d", help="Candle interval (1h, 4h, 1d, etc.)"),
+    engine: str = typer.Option("reference", help="Backtest engine: reference (backtesting.py) or fast (vectorized)"),
+    grid: bool = typer.Option(False, help="Test every parameter combination and check the best for data snooping"),
+    split: float = typer.Option(1.0, help="With --grid: train/test split ratio; tests run on the test bars"),
+    jobs: int = typer.Option(1, min=1, help="With --grid: worker processes for the grid search"),
+    resamples: int = typer.Option(1000, min=1, help="Stationary bootstrap resamples"),
+    block_size: int = typer.Option(10, min=1, help="Mean bootstrap block length in bars"),
+    top: int = typer.Option(10, help="With --grid: show top N combinations"),
+    as_json: bool = typer.Option(False, "--json", help="Print one JSON object instead of the text report"),
+) -> None:
+    """Statistical significance: Sharpe t-test and bootstrap CI, tests vs buy & hold, Reality Check / SPA."""
+    import json
+
+    from .backtest import STRATEGIES, load_data, optimize_strategy, run_backtest
+    from .significance import bar_returns, grid_significance, run_significance
+
+    if strategy_name not in STRATEGIES:
+        typer.echo(f"❌ Unknown strategy: {strategy_name}", err=True)
+        raise typer.Exit(1)
+    _check_engine(engine)
+
+    if not as_json:
+        mode = "parameter grid" if grid else "default params"
+        typer.echo(f"🧪 Testing {strategy_name} on {symbol} ({mode}, {resamples} resamples, block {block_size})...")
+    data = load_data(None, symbol, start, end, interval)
+    try:
+        if grid:
+            results = optimize_strategy(
+                strategy_name,
+                cash=cash,
+                commission=commission,
+                split=split,
+                data=data,
+                engine=engine,
+                jobs=jobs,
+                keep_equity=True,
+            )
+            close = data["Close"].iloc[int(len(data) * split) :] if split < 1.0 else data["Close"]
+            report = grid_significance(
+                results, bar_returns(close.to_numpy(dtype=float)), n_resamples=resamples, block_size=block_size
+            )
+        else:
+            stats = run_backtest(
+                strategy_name, cash=cash, commission=commission, data=data, engine=engine, include_stats=True
+            )["_stats"]
+            report = run_significance(stats, data["Close"], n_resamples=resamples, block_size=block_size)
+    except ValueError as e:
+        typer.echo(f"❌ {e}", err=True)
+        raise typer.Exit(1) from None
+
+    if as_json:
+        typer.echo(json.dumps(report))
+        return
+    if not grid:
+        typer.echo(f"\n{'=' * 60}")
+        typer.echo(
+            f"  Sharpe:            {report['sharpe']:>8.3f}   "
+            f"95% CI [{report['sharpe_ci_low']:.3f}, {report['sharpe_ci_high']:.3f}]"
+        )
+        typer.echo(f"  Sharpe t-test:     t={report['sharpe_t_stat']:>7.3f}   p={report['sharpe_p_value']:.4f}")
+        typer.echo(
+            f"  vs Buy & Hold:     t={report['paired_t_stat']:>7.3f}   p={report['paired_p_value']:.4f}   "
+            f"(excess {report['excess_vs_bh_pct']:+.2f}%/yr)"
+        )
+        typer.echo(
+            f"  Trade returns:     t={report['trade_t_stat']:>7.3f}   p={report['trade_p_value']:.4f}   "
+            f"(mean {report['mean_trade_pct']:+.2f}%)"
+        )
+        typer.echo(
+            f"  Win rate:          {report['wins']}/{report['num_trades']} wins   p={report['win_rate_p_value']:.4f}"
+        )
+        typer.echo(f"{'=' * 60}")
+        return
+
+    ranked = sorted(report["candidates"], key=lambda c: c["sharpe"], reverse=True)
+    header = f"{'Params':<40} {'Sharpe':>8} {'p':>8} {'CI low':>8} {'CI high':>8} {'p vs B&H':>9}"
+    typer.echo(f"\n{header}")
+    typer.echo("-" * len(header))
+    for c in ranked[:top]:
+        params_str = ", ".join(f"{k}={v}" for k, v in c["params"].items())
+        typer.echo(
+            f"{params_str:<40} {c['sharpe']:>8.3f} {c['sharpe_p_value']:>8.4f} {c['sharpe_ci_low']:>8.3f} "
+            f"{c['sharpe_ci_high']:>8.3f} {c['paired_p_value']:>9.4f}"
+        )
+    typer.echo("-" * len(header))
+    check = report["reality_check"]
+    typer.echo(f"\n🏆 Best of {len(ranked)} vs buy & hold: {check['best_params']}")
+    typer.echo(f"   White's Reality Check p = {check['rc_p_value']:.4f}")
+    typer.echo(f"   Hansen's SPA p          = {check['spa_p_value']:.4f}")
+    if check["spa_p_value"] > 0.05:
+        typer.echo("⚠️  The best combination does not beat buy & hold once the whole grid is accounted for.")
+
+
+@app.command()
+def stream(
+    strategy_name: str = typer.Argument(..., help="Strategy name"),
+    file: Path | None = typer.Option(None, help="Read bars from this CSV file instead of stdin"),
+    follow: bool = typer.Option(False, help="Keep reading bars appended to --file (like tail -f)"),
+    param: list[str] = typer.Option([], help="Strategy parameter override as name=value (repeatable)"),
+) -> None:
+    """Live signals: read bars one by one and print entry/exit events as JSON lines.
+
+    Bars are CSV lines (time,open,high,low,close[,volume]) with an optional
+    header. Status and the latency summary go to stderr.
+    """
+    import json
+    import sys
+
+    from .stream import SignalStream, parse_bars, tail_lines
+
+    if follow and file is None:
+        typer.echo("❌ --follow needs --file", err=True)
+        raise typer.Exit(1)
+    params = {}
+    for item in param:
+        name, sep, value = item.partition("=")
+        if not sep:
+            typer.echo(f"❌ Invalid --param {item!r}: expected name=value", err=True)
+            raise typer.Exit(1)
+        params[name.strip()] = yaml.safe_load(value)
+    try:
+        signals = SignalStream(strategy_name, **params)
+    except (ValueError, AttributeError) as e:
+        typer.echo(f"❌ {e}", err=True)
+        raise typer.Exit(1) from e
+
+    source = file or "stdin"
+    typer.echo(f"📡 Streaming {strategy_name} {signals.params} from {source}...", err=True)
+    if file is None:
+        lines = sys.stdin
+    elif follow:
+        lines = tail_lines(file)
+    else:
+        lines = file.open()
+
+    events = 0
+    try:
+        for bar in parse_bars(lines):
+            event = signals.update(bar)
+            if event is not None:
+                events += 1
+                typer.echo(json.dumps(event))
+                sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    except ValueError as e:
+        typer.echo(f"❌ {e}", err=True)
+        raise typer.Exit(1) from e
+    finally:
+        if file is not None and not follow:
+            lines.close()
+
+    stats = signals.latency_stats()
+    typer.echo(
+        f"⏱️  {stats['bars']} bars, {events} events — latency per bar: mean {stats['mean_us']} µs, "
+        f"p50 {stats['p50_us']} µs, p99 {stats['p99_us']} µs, max {stats['max_us']} µs",
+        err=True,
+    )
+
+
+results_app = typer.Typer(help="Query the persistent result store")
+app.add_typer(results_app, name="results")
+
+
+@results_app.command(name="query")
+def results_query(
+    metric: str = typer.Option("sharpe_ratio", help="Metric to rank by"),
+    per: str = typer.Option("strategy,symbol", help="Comma-separated groups to take the best of (empty = all rows)"),
+    kind: str | None = typer.Option(None, help="Only backtest or optimize rows"),
+    strategy: str | None = typer.Option(None, help="Only this strategy"),
+    symbol: str | None = typer.Option(None, help="Only this symbol"),
+    interval: str | None = typer.Option(None, help="Only this bar interval"),
+    ascending: bool = typer.Option(False, help="Lower is better (e.g. max_drawdown_pct)"),
+    limit: int | None = typer.Option(None, help="Show at most this many rows"),
+    as_json: bool = typer.Option(False, "--json", help="Print the rows as JSON"),
+) -> None:
+    """Best stored result per group, e.g. best Sharpe per strategy per symbol."""
+    import json
+
+    from .store import ResultStore, store_path
+
+    best_per = [column.strip() for column in per.split(",") if column.strip()]
+    with ResultStore(store_path()) as store:
+        try:
+            rows = store.query(
+                metric,
+                best_per,
+                ascending=ascending,
+                limit=limit,
+                kind=kind,
+                strategy=strategy,
+                symbol=symbol,
+                interval=interval,
+            )
+        except ValueError as e:
+            typer.echo(f"❌ {e}", err=True)
+            raise typer.Exit(1) from None
+        total = store.count()
+
+    if as_json:
+        typer.echo(json.dumps(rows, indent=2))
+        return
+    typer.echo(f"🗄️  {len(rows)} rows from {total} stored results ({store_path()})")
+    for row in rows:
+        params = ", ".join(f"{k}={v}" for k, v in row["params"].items()) or "defaults"
+        typer.echo(
+            f"  {row['strategy']:<12} {row['symbol']:<10} {row['interval']:<4} {row['kind']:<9} "
+            f"{metric}={row[metric]}  return={row['return_pct']}%  trades={row['num_trades']}  [{params}]"
+        )
+
+
+@results_app.command(name="clear")
+def results_clear() -> None:
+    """Delete every stored result."""
+    from .store import ResultStore, store_path
+
+    with ResultStore(store_path()) as store:
+        removed = store.clear()
+    typer.echo(f"🗑️  Removed {removed} stored results")
+
+
 def main() -> None:
     app()
 
@@ -0,0 +1,423 @@
+"""Market data access: pluggable providers and a persistent on-disk OHLCV cache.
+
+Providers:
+    yfinance: Downloads via fetch_data(), backed by the on-disk cache.
+    dir: Local CSV / Parquet files, one per symbol.
+    npy: Memory-mapped ``.npy`` column store for large intraday histories.
+
+Downloaded bars are stored column-wise — one ``.npy`` file per OHLCV column
+plus a ``datetime64[ns]`` UTC index — under ``<cache_dir>/<interval>/<symbol>/``.
+Later requests are served from disk and only the bars after the last cached
+timestamp are downloaded and appended. The cache directory uses the same
+layout the ``npy`` provider reads, so it can be opened memory-mapped as well.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import os
+import re
+import shutil
+import warnings
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+CACHE_DIR_ENV = "META_STRATEGY_CACHE_DIR"
+CACHE_FORMAT_VERSION = 1
+
+
+# === Cache settings ===
+
+
+@dataclass
+class CacheSettings:
+    """Process-wide cache behaviour, set once per CLI invocation."""
+
+    enabled: bool = True
+    refresh: bool = False
+    directory: Path | None = None
+
+
+CACHE_SETTINGS = CacheSettings()
+
+
+def configure_cache(enabled: bool = True, refresh: bool = False, directory: Path | str | None = None) -> None:
+    """Set the process-wide cache behaviour used by fetch_data().
+
+    Args:
+        enabled: Read from and write to the on-disk cache.
+        refresh: Ignore cached bars and re-download the full requested range.
+        directory: Cache root (default: $META_STRATEGY_CACHE_DIR or ~/.cache/meta-strategy).
+    """
+    CACHE_SETTINGS.enabled = enabled
+    CACHE_SETTINGS.refresh = refresh
+    CACHE_SETTINGS.directory = Path(directory) if directory is not None else None
+
+
+def cache_dir() -> Path:
+    """Resolve the cache root directory."""
+    if CACHE_SETTINGS.directory is not None:
+        return CACHE_SETTINGS.directory
+    env = os.environ.get(CACHE_DIR_ENV)
+    return Path(env) if env else Path.home() / ".cache" / "meta-strategy"
+
+
+def _safe_symbol(symbol: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", symbol)
+
+
+def cache_path(symbol: str, interval: str) -> Path:
+    """Directory holding the cached columns for one (symbol, interval) pair."""
+    return cache_dir() / interval / _safe_symbol(symbol)
+
+
+# === Column store ===
+
+
+def read_cache(symbol: str, interval: str) -> tuple[pd.DataFrame, dict[str, Any]] | None:
+    """Load cached bars and metadata, or None if nothing usable is cached."""
+    path = cache_path(symbol, interval)
+    meta_file = path / "meta.json"
+    if not meta_file.exists():
+        return None
+    try:
+        meta = json.loads(meta_file.read_text())
+        if meta.get("version") != CACHE_FORMAT_VERSION:
+            return None
+        index = pd.DatetimeIndex(np.load(path / "index.npy"))
+        if meta.get("tz") is not None:
+            index = index.tz_localize("UTC").tz_convert(meta["tz"])
+        columns = {col: np.load(path / f"{col}.npy") for col in OHLCV_COLUMNS}
+    except (OSError, ValueError, KeyError):
+        return None
+    return pd.DataFrame(columns, index=index), meta
+
+
+def write_cache(symbol: str, interval: str, df: pd.DataFrame, meta: dict[str, Any]) -> None:
+    """Atomically replace the cached columns for (symbol, interval)."""
+    path = cache_path(symbol, interval)
+    tmp = path.with_name(path.name + ".tmp")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+
+    index = pd.DatetimeIndex(df.index)
+    tz = str(index.tz) if index.tz is not None else None
+    utc_index = index.tz_convert("UTC").tz_localize(None) if tz is not None else index
+    np.save(tmp / "index.npy", utc_index.to_numpy(dtype="datetime64[ns]"))
+    for col in OHLCV_COLUMNS:
+        np.save(tmp / f"{col}.npy", df[col].to_numpy(dtype=float))
+    meta = {**meta, "version": CACHE_FORMAT_VERSION, "symbol": symbol, "interval": interval, "tz": tz, "rows": len(df)}
+    (tmp / "meta.json").write_text(json.dumps(meta, indent=2))
+
+    if path.exists():
+        shutil.rmtree(path)
+    os.replace(tmp, path)
+
+
+# === Cached fetch ===
+
+
+def _as_timestamp(value: str, tz: Any) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    if tz is not None and ts.tzinfo is None:
+        ts = ts.tz_localize(tz)
+    return ts
+
+
+def _slice(df: pd.DataFrame, start: str, end: str | None) -> pd.DataFrame:
+    """Select bars in [start, end) — the same bounds yfinance applies."""
+    tz = pd.DatetimeIndex(df.index).tz
+    mask = df.index >= _as_timestamp(start, tz)
+    if end is not None:
+        mask &= df.index < _as_timestamp(end, tz)
+    return df.loc[mask]
+
+
+def _append(cached: pd.DataFrame, fresh: pd.DataFrame) -> pd.DataFrame:
+    """Merge freshly downloaded bars into the cache; fresh bars win on overlap."""
+    if fresh.empty:
+        return cached
+    fresh = fresh[OHLCV_COLUMNS]
+    tz = pd.DatetimeIndex(cached.index).tz
+    if tz is not None and pd.DatetimeIndex(fresh.index).tz is not None:
+        fresh = fresh.tz_convert(tz)
+    combined = pd.concat([cached.loc[(cached.index < fresh.index[0]) | (cached.index > fresh.index[-1])], fresh])
+    return combined.sort_index()  # type: ignore[no-any-return]
+
+
+_INTERVAL = re.compile(r"(\d+)(m|h|d|wk|mo)")
+_INTERVAL_UNITS = {
+    "m": pd.Timedelta(minutes=1),
+    "h": pd.Timedelta(hours=1),
+    "d": pd.Timedelta(days=1),
+    "wk": pd.Timedelta(weeks=1),
+}
+_BAR_EPOCH = pd.Timestamp("1970-01-05")  # a Monday midnight, so weekly bars start on Mondays
+
+
+def bar_start(timestamp: pd.Timestamp, interval: str) -> pd.Timestamp | None:
+    """Open time of the yfinance ``interval`` bar (``1h``, ``1d``, ``1wk``, ``1mo``, ...) holding ``timestamp``.
+
+    Bars are aligned to the clock: minutes and hours to the hour grid, days to
+    midnight, weeks to Mondays and months to the 1st. None when the interval
+    is unknown.
+    """
+    match = _INTERVAL.fullmatch(interval)
+    if match is None:
+        return None
+    count, unit = int(match[1]), match[2]
+    if unit == "mo":
+        months = (timestamp.year * 12 + timestamp.month - 1) // count * count
+        return pd.Timestamp(year=months // 12, month=months % 12 + 1, day=1)
+    step = count * _INTERVAL_UNITS[unit]
+    return _BAR_EPOCH + (timestamp - _BAR_EPOCH) // step * step
+
+
+def cached_history(
+    download: Callable[[str, str | None], pd.DataFrame],
+    symbol: str,
+    start: str,
+    end: str | None,
+    interval: str,
+    refresh: bool = False,
+) -> pd.DataFrame:
+    """Serve [start, end) from the on-disk cache, downloading only missing bars.
+
+    ``download(start, end)`` must return a yfinance-style OHLCV frame. Missing
+    history before the cached range is prepended; bars after the last cached
+    timestamp are appended, unless the last top-up and the requested end fall
+    in the same bar (``bar_start``): no bar can have closed since, so repeated
+    open-ended runs within a bar need no network. If a top-up
+    download fails but bars are cached, the cached bars are returned with a
+    warning so runs still work offline.
+    """
+    now = datetime.now(UTC).replace(tzinfo=None)
+    requested_until = min(pd.Timestamp(end), pd.Timestamp(now)) if end is not None else pd.Timestamp(now)
+    cached = None if refresh else read_cache(symbol, interval)
+
+    if cached is None or cached[0].empty:
+        df = download(start, end)
+        if df.empty:
+            return df
+        df = df[OHLCV_COLUMNS]
+        write_cache(symbol, interval, df, {"start": start, "covered_until": requested_until.isoformat()})
+        return _slice(df, start, end)
+
+    df, meta = cached
+    covered_start = pd.Timestamp(meta["start"])
+    covered_until = pd.Timestamp(meta["covered_until"])
+    changed = False
+
+    try:
+        if pd.Timestamp(start) < covered_start:
+            head = download(start, (df.index[0] + pd.Timedelta(days=1)).strftime("%Y-%m-%d"))
+            df = _append(df, head)
+            meta["start"] = start
+            changed = True
+        # A bar opened since the last top-up means at least one bar has closed
+        current_bar = bar_start(requested_until, interval)
+        if requested_until > covered_until and (current_bar is None or current_bar > covered_until):
+            tail = download(df.index[-1].strftime("%Y-%m-%d"), end)
+            df = _append(df, tail)
+            meta["covered_until"] = requested_until.isoformat()
+            changed = True
+    except Exception as e:
+        warnings.warn(
+            f"Could not top up cached {symbol} {interval} data ({e}); using cached bars only",
+            stacklevel=2,
+        )
+
+    if changed:
+        write_cache(symbol, interval, df, meta)
+    return _slice(df, start, end)
+
+
+# === Data providers ===
+
+
+class DataProvider(abc.ABC):
+    """Source of OHLCV bars for backtests.
+
+    ``load()`` returns a DataFrame with Open, High, Low, Close, Volume columns
+    and a DatetimeIndex restricted to [start, end).
+    """
+
+    name = ""
+
+    @abc.abstractmethod
+    def load(self, symbol: str, start: str, end: str | None = None, interval: str = "1d") -> pd.DataFrame:
+        """Load bars for one symbol and interval."""
+
+
+class YFinanceProvider(DataProvider):
+    """Download bars with fetch_data() (yfinance + on-disk cache)."""
+
+    name = "yfinance"
+
+    def load(self, symbol: str, start: str, end: str | None = None, interval: str = "1d") -> pd.DataFrame:
+        from . import backtest
+
+        return backtest.fetch_data(symbol, start, end, interval=interval)
+
+
+class DirectoryProvider(DataProvider):
+    """Read bars from local CSV or Parquet files.
+
+    Looks for ``<root>/<interval>/<symbol>.{parquet,csv}`` and then
+    ``<root>/<symbol>_<interval>.{parquet,csv}``. Files need a date/time column
+    (or a datetime first column) and OHLCV columns in any letter case.
+    Parquet files need the ``parquet`` extra (pyarrow).
+    """
+
+    name = "dir"
+
+    def __init__(self, root: Path | str) -> None:
+        self.root = Path(root)
+
+    def _candidates(self, symbol: str, interval: str) -> list[Path]:
+        safe = _safe_symbol(symbol)
+        return [
+            self.root / interval / f"{safe}.parquet",
+            self.root / interval / f"{safe}.csv",
+            self.root / f"{safe}_{interval}.parquet",
+            self.root / f"{safe}_{interval}.csv",
+        ]
+
+    def load(self, symbol: str, start: str, end: str | None = None, interval: str = "1d") -> pd.DataFrame:
+        candidates = self._candidates(symbol, interval)
+        path = next((p for p in candidates if p.exists()), None)
+        if path is None:
+            tried = ", ".join(str(p) for p in candidates)
+            raise FileNotFoundError(f"No data file for {symbol} ({interval}). Tried: {tried}")
+
+        raw = _read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+        df = _normalize_ohlcv(raw)
+        return _slice(df, start, end)
+
+
+def _read_parquet(path: Path) -> pd.DataFrame:
+    try:
+        return pd.read_parquet(path)
+    except ImportError:
+        raise ImportError(
+            f"Reading {path} needs a Parquet engine: install the parquet extra (pip install 'meta-strategy[parquet]')"
+        ) from None
+
+
+def _normalize_ohlcv(raw: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a loaded table to OHLCV columns on a sorted DatetimeIndex."""
+    df = raw.rename(columns={c: str(c).strip().title() for c in raw.columns})
+    if not isinstance(df.index, pd.DatetimeIndex):
+        time_col = next((c for c in ("Date", "Datetime", "Timestamp", "Time") if c in df.columns), df.columns[0])
+        df = df.set_index(pd.DatetimeIndex(pd.to_datetime(df[time_col]))).drop(columns=[time_col])
+    missing = [c for c in OHLCV_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Data file is missing columns: {missing}")
+    df = df[OHLCV_COLUMNS].astype(float).sort_index()
+    df.index.name = None
+    return df
+
+
+class NpyMmapProvider(DataProvider):
+    """Memory-mapped ``.npy`` column store: ``<root>/<interval>/<symbol>/{index,Open,...}.npy``.
+
+    Columns are opened with ``mmap_mode="r"`` and the requested range is found
+    by binary search on the index, so only the touched pages are read. The
+    returned DataFrame's columns are read-only views into the mapped files.
+    The OHLCV cache directory uses this layout and can be used as ``root``.
+    """
+
+    name = "npy"
+
+    def __init__(self, root: Path | str) -> None:
+        self.root = Path(root)
+
+    def load(self, symbol: str, start: str, end: str | None = None, interval: str = "1d") -> pd.DataFrame:
+        path = self.root / interval / _safe_symbol(symbol)
+        if not (path / "index.npy").exists():
+            raise FileNotFoundError(f"No column store for {symbol} ({interval}) at {path}")
+
+        meta_file = path / "meta.json"
+        tz = json.loads(meta_file.read_text()).get("tz") if meta_file.exists() else None
+        index = np.load(path / "index.npy", mmap_mode="r")
+        lo = int(np.searchsorted(index, _utc_datetime64(start, tz), side="left"))
+        hi = len(index) if end is None else int(np.searchsorted(index, _utc_datetime64(end, tz), side="left"))
+
+        dt_index = pd.DatetimeIndex(np.asarray(index[lo:hi]))
+        if tz is not None:
+            dt_index = dt_index.tz_localize("UTC").tz_convert(tz)
+        columns = {col: np.load(path / f"{col}.npy", mmap_mode="r")[lo:hi] for col in OHLCV_COLUMNS}
+        return pd.DataFrame(columns, index=dt_index, copy=False)
+
+
+def _utc_datetime64(value: str, tz: str | None) -> np.datetime64:
+    """Convert a date string (in the store's timezone) to a naive UTC datetime64[ns]."""
+    ts = _as_timestamp(value, tz)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return np.datetime64(ts.as_unit("ns"))
+
+
+class SharedDataProvider(DataProvider):
+    """In-process memo over another provider, shared by every step of one command.
+
+    Each distinct (symbol, start, end, interval) request is loaded once;
+    ``fetches`` counts real backend loads and ``requests`` counts lookups.
+    """
+
+    name = "shared"
+
+    def __init__(self, backend: DataProvider | None = None) -> None:
+        self.backend = backend or default_provider()
+        self._frames: dict[tuple[str, str, str | None, str], pd.DataFrame] = {}
+        self.fetches = 0
+        self.requests = 0
+
+    def load(self, symbol: str, start: str, end: str | None = None, interval: str = "1d") -> pd.DataFrame:
+        """Return the bars for a request, loading them on first use only."""
+        self.requests += 1
+        key = (symbol, start, end, interval)
+        if key not in self._frames:
+            self._frames[key] = self.backend.load(symbol, start, end, interval)
+            self.fetches += 1
+        return self._frames[key]
+
+
+# === Provider selection ===
+
+DATA_SOURCES = ("yfinance", "dir", "npy")
+
+_default_provider: DataProvider = YFinanceProvider()
+
+
+def make_provider(source: str, path: Path | str | None = None) -> DataProvider:
+    """Build a provider by name: 'yfinance', 'dir' (CSV/Parquet) or 'npy' (memory-mapped)."""
+    if source not in DATA_SOURCES:
+        raise ValueError(f"Unknown data source: {source}. Valid: {list(DATA_SOURCES)}")
+    if source == "yfinance":
+        return YFinanceProvider()
+    if path is None:
+        raise ValueError(f"Data source '{source}' requires a data path")
+    return DirectoryProvider(path) if source == "dir" else NpyMmapProvider(path)
+
+
+def configure_data_source(source: str = "yfinance", path: Path | str | None = None) -> None:
+    """Set the process-wide provider used when no data is injected."""
+    global _default_provider
+    _default_provider = make_provider(source, path)
+
+
+def default_provider() -> DataProvider:
+    """The process-wide provider selected with configure_data_source()."""
+    return _default_provider
@@ -0,0 +1,242 @@
+"""Vectorized signal-array backtester for the built-in long-only strategies.
+
+Replays the same all-in, long-only, market-order semantics as the
+backtesting.py ``FractionalBacktest`` used by ``run_backtest`` — orders fill
+at the next bar's open, size is the whole-unit fraction of cash after
+commission, closed trades are the only ones counted in the stats — but from
+precomputed entry/exit boolean arrays instead of a per-bar ``next()`` loop.
+
+Each strategy class provides ``signals(data, **params)``; this module turns
+those arrays into trades, an equity curve and the subset of backtesting.py
+stats the CLI reports. The Python loop runs once per *trade*, never per bar.
+
+Prices are scaled by the same fractional unit as ``FractionalBacktest`` before
+indicators are computed, so signals, fills and sizes match the reference
+engine bar for bar (see tests/test_fast.py).
+"""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from backtesting import Strategy
+
+FRACTIONAL_UNIT = 1 / 100e6  # backtesting.lib.FractionalBacktest default
+_ORDER_FRACTION = 1 - sys.float_info.epsilon  # Strategy.buy() default size
+
+
+@dataclass
+class FastData:
+    """OHLCV bars prepared once and reused across many fast runs (grid search)."""
+
+    frame: pd.DataFrame  # scaled OHLCV handed to Strategy.signals()
+    open: np.ndarray
+    close: np.ndarray
+    index: pd.Index
+    period_ends: np.ndarray | None  # last bar of each resample period, None without a DatetimeIndex
+    annual_trading_days: float
+
+
+def prepare(data: pd.DataFrame) -> FastData:
+    """Scale prices and precompute the calendar bins used for the Sharpe ratio."""
+    if data.empty:
+        raise ValueError("OHLC data is empty")
+    frame = data.copy(deep=False)
+    for col in ("Open", "High", "Low", "Close"):
+        frame[col] = frame[col] * FRACTIONAL_UNIT
+    frame["Volume"] = frame["Volume"] / FRACTIONAL_UNIT
+
+    index = data.index
+    period_ends = None
+    annual_trading_days = np.nan
+    if isinstance(index, pd.DatetimeIndex):
+        freq_days = pd.Series(index[-100:]).diff().dropna().median().days
+        have_weekends = index.dayofweek.to_series().between(5, 6).mean() > 2 / 7 * 0.6
+        annual_trading_days = {7: 52, 31: 12, 365: 1}.get(freq_days, 365 if have_weekends else 252)
+        freq = {7: "W", 31: "ME", 365: "YE"}.get(freq_days, "D")
+        positions = pd.Series(np.arange(len(index), dtype=float), index=index).resample(freq).last().dropna()
+        period_ends = positions.to_numpy().astype(np.intp)
+
+    return FastData(
+        frame=frame,
+        open=frame["Open"].to_numpy(dtype=float),
+        close=frame["Close"].to_numpy(dtype=float),
+        index=index,
+        period_ends=period_ends,
+        annual_trading_days=float(annual_trading_days),
+    )
+
+
+def _warmup_nbars(indicators: list[np.ndarray]) -> int:
+    """Bars before every indicator is valid, as backtesting.py counts them."""
+    return max((int(np.isnan(np.asarray(ind, dtype=float)).argmin()) for ind in indicators), default=0)
+
+
+def simulate(
+    open_: np.ndarray,
+    close: np.ndarray,
+    entries: np.ndarray,
+    exits: np.ndarray,
+    start: int,
+    cash: float,
+    commission: float,
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Turn entry/exit signals into an equity curve and closed trades.
+
+    A signal on bar ``i`` (``i >= start``) fills at ``open_[i + 1]``. Entries are
+    only taken while flat, exits only while long. Returns ``(equity, trades)``
+    where ``trades`` holds parallel arrays (Size, EntryBar, ExitBar,
+    EntryPrice, ExitPrice, PnL, Commission, ReturnPct).
+    """
+    n = len(close)
+    entry_bars = np.flatnonzero(entries)
+    exit_bars = np.flatnonzero(exits)
+    equity = np.empty(n)
+    cols: dict[str, list[float]] = {
+        k: [] for k in ("Size", "EntryBar", "ExitBar", "EntryPrice", "ExitPrice", "PnL", "Commission", "ReturnPct")
+    }
+
+    flat_from = 0
+    i = start
+    while True:
+        k = np.searchsorted(entry_bars, i)
+        if k == len(entry_bars) or entry_bars[k] + 1 >= n:
+            break
+        e = int(entry_bars[k]) + 1
+        price = float(open_[e])
+        apc = price + (0 + _ORDER_FRACTION * price * commission) / _ORDER_FRACTION
+        size = int((max(0, cash + 0.0) * 1.0 * _ORDER_FRACTION) // apc)
+        if not size:  # broker cancels the order; the strategy re-checks at bar e
+            i = e
+            continue
+        equity[flat_from:e] = cash
+        cash -= 0 + size * price * commission
+
+        j = np.searchsorted(exit_bars, e)
+        x = int(exit_bars[j]) + 1 if j < len(exit_bars) else n
+        x = min(x, n)  # an exit on the last bar never fills
+        equity[e:x] = cash + (close[e:x] * size - size * price)
+        if x == n:
+            flat_from = n
+            break
+
+        exit_price = float(open_[x])
+        exit_commission = 0 + size * exit_price * commission
+        cash += size * (exit_price - price) - exit_commission
+        commissions = exit_commission + (0 + size * price * commission)
+        cols["Size"].append(size)
+        cols["EntryBar"].append(e)
+        cols["ExitBar"].append(x)
+        cols["EntryPrice"].append(price)
+        cols["ExitPrice"].append(exit_price)
+        cols["PnL"].append(size * (exit_price - price) - commissions)
+        cols["Commission"].append(commissions)
+        cols["ReturnPct"].append((exit_price / price - 1) - commissions / (size * price))
+        flat_from = x
+        i = x
+
+    equity[flat_from:] = cash
+    trades = {k: np.asarray(v, dtype=np.int64 if k in ("EntryBar", "ExitBar") else float) for k, v in cols.items()}
+    return equity, trades
+
+
+def sharpe_ratio(equity: np.ndarray, data: FastData) -> float:
+    """backtesting.py's compounded Sharpe ratio from per-period equity returns."""
+    if data.period_ends is None:
+        return np.nan
+    sampled = equity[data.period_ends]
+    returns = sampled[1:] / sampled[:-1] - 1
+    returns = returns[~np.isnan(returns)]
+    atd = data.annual_trading_days
+
+    gross = returns + 1
+    gmean = 0.0 if np.any(gross <= 0) else np.exp(np.log(gross).sum() / (len(gross) or np.nan)) - 1
+    count = len(returns)
+    var = ((returns.sum() / count - returns) ** 2).sum() / (count - 1) if count > 1 else np.nan
+    annual_return = (1 + gmean) ** atd - 1
+    volatility = np.sqrt((var + (1 + gmean) ** 2) ** atd - (1 + gmean) ** (2 * atd)) * 100
+    return float(annual_return * 100 / (volatility or np.nan))
+
+
+def run_fast(
+    strategy_cls: type[Strategy],
+    data: pd.DataFrame | FastData,
+    cash: float = 100_000.0,
+    commission: float = 0.001,
+    **params: Any,
+) -> FastStats:
+    """Backtest ``strategy_cls`` on ``data`` and return backtesting.py-style stats.
+
+    The returned dict carries the keys ``run_backtest`` and the optimizer read
+    (``Return [%]``, ``Sharpe Ratio``, ``# Trades``, ...) plus ``_trades`` and
+    ``_equity_curve`` DataFrames shaped like the reference engine's.
+
+    Args:
+        data: OHLCV DataFrame, or a FastData from prepare() to skip re-scaling.
+        **params: Strategy parameter overrides, as for Backtest.run().
+    """
+    if not hasattr(strategy_cls, "signals"):
+        raise ValueError(f"{strategy_cls.__name__} has no signals() and cannot run on the fast engine")
+    for name in params:
+        if not hasattr(strategy_cls, name):
+            raise AttributeError(f"Strategy '{strategy_cls.__name__}' is missing parameter '{name}'")
+    if not isinstance(data, FastData):
+        data = prepare(data)
+
+    with np.errstate(invalid="ignore"):
+        entries, exits, indicators = strategy_cls.signals(data.frame, **params)  # type: ignore[attr-defined]
+    warmup = _warmup_nbars(indicators)
+    equity, trades = simulate(data.open, data.close, entries, exits, 1 + warmup, cash, commission)
+
+    peak = np.maximum.accumulate(equity)
+    drawdown = 1 - equity / peak
+    pnl = trades["PnL"]
+    close = data.close
+    index = data.index
+
+    stats = FastStats(
+        {
+            "Start": index[0],
+            "End": index[-1],
+            "Equity Final [$]": equity[-1],
+            "Equity Peak [$]": equity.max(),
+            "Return [%]": (equity[-1] - equity[0]) / equity[0] * 100,
+            "Buy & Hold Return [%]": (close[-1] - close[warmup]) / close[warmup] * 100,
+            "Max. Drawdown [%]": -np.nan_to_num(drawdown.max()) * 100,
+            "Sharpe Ratio": sharpe_ratio(equity, data),
+            "# Trades": len(pnl),
+            "Win Rate [%]": (pnl > 0).mean() * 100 if len(pnl) else np.nan,
+        }
+    )
+    stats.arrays = (index, equity, drawdown, trades)
+    return stats
+
+
+class FastStats(dict[str, Any]):
+    """Stats dict whose ``_equity_curve``/``_trades`` frames are built on first access.
+
+    Grid searches only read scalar metrics, so the DataFrames are skipped unless asked for.
+    """
+
+    arrays: tuple[pd.Index, np.ndarray, np.ndarray, dict[str, np.ndarray]]
+
+    def __missing__(self, key: str) -> pd.DataFrame:
+        index, equity, drawdown, trades = self.arrays
+        if key == "_equity_curve":
+            frame = pd.DataFrame({"Equity": equity, "DrawdownPct": drawdown}, index=index)
+        elif key == "_trades":
+            frame = pd.DataFrame(trades)
+            frame["Size"] *= FRACTIONAL_UNIT
+            frame[["EntryPrice", "ExitPrice"]] /= FRACTIONAL_UNIT
+            frame["EntryTime"] = index[trades["EntryBar"]]
+            frame["ExitTime"] = index[trades["ExitBar"]]
+        else:
+            raise KeyError(key)
+        self[key] = frame
+        return frame
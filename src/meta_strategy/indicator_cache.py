@@ -0,0 +1,161 @@
+"""Memoizing layer for indicator functions.
+
+Indicator results are keyed on (function, parameters, fingerprint of every
+input array) and kept in an LRU bounded by a byte budget, so identical
+columns — ``rsi(close, 14)`` in every grid-search combination, the EMAs
+shared by ``macd_line`` and ``macd_signal``, the indicators
+``detect_warmup`` recomputes after a backtest — are computed once.
+
+Cached values are stored read-only and every hit returns a fresh copy, so
+callers (including backtesting.py, which rescales indicators in place) can
+never corrupt an entry.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+DEFAULT_MAX_BYTES = 256 * 1024**2
+
+F = TypeVar("F", bound="Callable[..., Any]")
+
+
+def fingerprint(values: Any) -> tuple[str, tuple[int, ...], str]:
+    """(dtype, shape, blake2b digest) of an array-like's contents."""
+    arr = np.ascontiguousarray(values.to_numpy() if isinstance(values, pd.Series) else values)
+    digest = hashlib.blake2b(arr.view(np.uint8).ravel().data, digest_size=16).hexdigest()
+    return str(arr.dtype), arr.shape, digest
+
+
+class IndicatorCache:
+    """LRU of indicator outputs bounded by the total bytes of the stored arrays."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: int) -> None:
+        if nbytes > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[1]
+        self._entries[key] = (value, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        self._entries.clear()
+        self.nbytes = self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_pct": round(self.hits / lookups * 100, 1) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+INDICATOR_CACHE = IndicatorCache()
+
+
+def configure_indicator_cache(max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+    """Set the byte budget (0 disables caching) and clear the process-wide cache."""
+    INDICATOR_CACHE.max_bytes = max_bytes
+    INDICATOR_CACHE.clear()
+
+
+def _key_part(value: Any) -> Hashable:
+    if isinstance(value, pd.Series):
+        return fingerprint(value), value.name  # the name propagates to the result
+    if isinstance(value, np.ndarray):
+        return fingerprint(value), None
+    return value  # type: ignore[no-any-return]
+
+
+def _frozen(values: Any) -> np.ndarray:
+    arr = np.array(values, copy=True)
+    arr.setflags(write=False)
+    return arr
+
+
+def _cache_key(func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]) -> Hashable:
+    return func.__qualname__, tuple(map(_key_part, args)), tuple(sorted(kwargs.items()))
+
+
+def _store(key: Hashable, result: Any) -> None:
+    stored: tuple[type, tuple[np.ndarray, ...], Hashable]
+    if isinstance(result, pd.Series):
+        stored = (pd.Series, (_frozen(result.to_numpy()),), result.name)
+    else:
+        stored = (type(result), tuple(map(_frozen, result)), None)
+    INDICATOR_CACHE.put(key, stored, sum(a.nbytes for a in stored[1]))
+
+
+def seed_indicator(func: Callable[..., Any], args: tuple[Any, ...], result: Any) -> None:
+    """Store ``result`` as the value of ``func(*args)`` without calling it.
+
+    Used to fill the cache from a batched kernel; ``result`` must be exactly
+    what the call would return. Seeding counts as neither a hit nor a miss.
+    """
+    if INDICATOR_CACHE.max_bytes > 0:
+        _store(_cache_key(func, args, {}), result)
+
+
+def cached_indicator(func: F) -> F:
+    """Memoize an indicator in INDICATOR_CACHE.
+
+    ``func`` returns either a pd.Series (rebuilt on a hit with the index of the
+    first argument when that is a Series, as the indicator functions do) or a
+    NamedTuple of arrays such as the SuperTrend kernel's result.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if INDICATOR_CACHE.max_bytes <= 0:
+            return func(*args, **kwargs)
+        key = _cache_key(func, args, kwargs)
+        stored = INDICATOR_CACHE.get(key)
+        if stored is None:
+            result = func(*args, **kwargs)
+            _store(key, result)
+            return result
+        kind, arrays, name = stored
+        copies = [a.copy() for a in arrays]
+        if kind is pd.Series:
+            index = args[0].index if args and isinstance(args[0], pd.Series) else None
+            return pd.Series(copies[0], index=index, name=name)
+        return kind(*copies)
+
+    return wrapper  # type: ignore[return-value]
@@ -0,0 +1,84 @@
+"""Checkpoint journal: finished units of a long optimize or walk-forward run, appended as they complete.
+
+A journal is a JSON Lines file. Its first line names the run it belongs to
+(a ``store.run_fingerprint`` of the strategy, bars, costs and settings); every
+further line is one finished unit — an optimizer combination keyed by its
+position in the grid, or a walk-forward fold keyed by its number::
+
+    {"run": "9f2c..."}
+    {"key": 0, "value": {"entry": {...}}}
+    {"key": 1, "value": {"error": "ValueError: ..."}}
+
+Lines are flushed and fsync'ed as each batch finishes, so a crash or Ctrl-C
+loses at most the work in flight. Reopening with ``resume=True`` loads the
+finished units (dropping a last line cut off mid-write) and refuses a journal
+written for a different run.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+JOURNAL_DIR = "journals"
+
+
+def journal_path(command: str, strategy_name: str, symbol: str, interval: str) -> Path:
+    """Default journal file of a CLI run: ``<cache_dir>/journals/<command>-<strategy>-<symbol>-<interval>.jsonl``."""
+    from .data import _safe_symbol, cache_dir
+
+    return cache_dir() / JOURNAL_DIR / f"{command}-{strategy_name}-{_safe_symbol(symbol)}-{interval}.jsonl"
+
+
+class Journal:
+    """Append-only JSONL checkpoint of one run; ``done`` maps each finished key to its value."""
+
+    def __init__(self, path: Path | str, run_id: str, resume: bool = False) -> None:
+        self.path = Path(path)
+        self.run_id = run_id
+        self.done: dict[Any, Any] = {}
+        if resume and self.path.exists() and self.path.stat().st_size > 0:
+            self._load()
+            self._file = open(self.path, "a")  # noqa: SIM115
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "w")  # noqa: SIM115
+            self._write([{"run": run_id}])
+
+    def _load(self) -> None:
+        raw = self.path.read_bytes()
+        complete = raw[: raw.rfind(b"\n") + 1]  # a crash can cut the last line short
+        lines = complete.decode().splitlines()
+        if not lines or json.loads(lines[0]).get("run") != self.run_id:
+            raise ValueError(f"{self.path} is the journal of a different run; start over without resume")
+        for line in lines[1:]:
+            record = json.loads(line)
+            self.done[record["key"]] = record["value"]
+        if len(complete) < len(raw):
+            with open(self.path, "r+b") as f:
+                f.truncate(len(complete))
+
+    def _write(self, records: Iterable[dict[str, Any]]) -> None:
+        self._file.write("".join(json.dumps(record) + "\n" for record in records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def record_many(self, items: Iterable[tuple[Any, Any]]) -> None:
+        """Append finished ``(key, value)`` units; values must be JSON-serializable."""
+        items = list(items)
+        self._write({"key": key, "value": value} for key, value in items)
+        self.done.update(items)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> Journal:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
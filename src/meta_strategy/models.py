@@ -1,8 +1,72 @@
 """Strategy definition models for meta-strategy."""
 
+import math
 from pathlib import Path
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
+
+ParamValue = str | int | float | bool
+
+
+class ParamRange(BaseModel):
+    """Values of one optimizer parameter: an explicit list, or a range with a step or a point count.
+
+    ``{values: [8, 12, 16]}``, ``{min: 5, max: 50, step: 5}`` or
+    ``{min: 0.5, max: 8, num: 5, log: true}`` (geometric spacing). A range
+    whose bounds and step are integers yields integers; a log range with
+    integer bounds is rounded to distinct integers.
+    """
+
+    values: list[ParamValue] | None = None
+    min: float | None = None
+    max: float | None = None
+    step: float | None = Field(default=None, gt=0)
+    num: int | None = Field(default=None, ge=1)
+    log: bool = False
+
+    @model_validator(mode="after")
+    def _check_shape(self) -> "ParamRange":
+        if self.values is not None:
+            if self.min is not None or self.max is not None or self.step is not None or self.num is not None:
+                raise ValueError("give either values or min/max, not both")
+            if not self.values:
+                raise ValueError("values must not be empty")
+            return self
+        if self.min is None or self.max is None:
+            raise ValueError("a range needs min and max")
+        if self.min > self.max:
+            raise ValueError(f"min ({self.min}) is above max ({self.max})")
+        if (self.step is None) == (self.num is None):
+            raise ValueError("a range needs exactly one of step or num")
+        if self.log and (self.num is None or self.min <= 0):
+            raise ValueError("a log range needs num and min > 0")
+        return self
+
+    def _integral(self) -> bool:
+        bounds = (self.min, self.max) if self.log else (self.min, self.max, self.step)
+        return all(b is None or float(b).is_integer() for b in bounds) and (self.log or self.step is not None)
+
+    def expand(self) -> list[ParamValue]:
+        """The parameter's values, ascending for ranges."""
+        if self.values is not None:
+            return list(self.values)
+        assert self.min is not None and self.max is not None
+        lo, hi = self.min, self.max
+        if self.step is not None:
+            n = math.floor((hi - lo) / self.step + 1e-9) + 1
+            points = [lo + i * self.step for i in range(n)]
+        else:
+            assert self.num is not None
+            if self.num == 1:
+                points = [lo]
+            elif self.log:
+                ratio = (hi / lo) ** (1 / (self.num - 1))
+                points = [lo * ratio**i for i in range(self.num)]
+            else:
+                points = [lo + i * (hi - lo) / (self.num - 1) for i in range(self.num)]
+        if self._integral():
+            return list(dict.fromkeys(round(p) for p in points))
+        return [round(p, 10) for p in points]
 
 
 class StrategyDefinition(BaseModel):
@@ -11,6 +75,11 @@ class StrategyDefinition(BaseModel):
     Each definition captures everything needed to generate a Pine Script
     strategy from an indicator: source code reference, entry/exit logic,
     and any special instructions for the AI conversion.
+
+    ``strategy_params`` doubles as the optimizer's parameter space: a scalar
+    fixes a parameter, a list or ParamRange spans it, and ``constraints``
+    (expressions such as ``fast < slow``) rule out combinations before any
+    backtest runs (see meta_strategy.space).
     """
 
     name: str = Field(description="Strategy name (will be prefixed with 'AI - ')")
@@ -20,9 +89,20 @@ class StrategyDefinition(BaseModel):
     special_instructions: list[str] = Field(
         default_factory=list, description="Additional instructions for the AI conversion"
     )
-    strategy_params: dict[str, str | int | float | bool] = Field(
-        default_factory=dict, description="Override default strategy parameters"
+    strategy_params: dict[str, ParamValue | list[ParamValue] | ParamRange] = Field(
+        default_factory=dict, description="Override default strategy parameters, or the values to optimize over"
     )
+    constraints: list[str] = Field(
+        default_factory=list, description="Conditions every optimized combination must meet, e.g. 'fast < slow'"
+    )
+
+    @model_validator(mode="after")
+    def _check_constraints(self) -> "StrategyDefinition":
+        from .space import check_constraint
+
+        for expression in self.constraints:
+            check_constraint(expression, self.strategy_params)
+        return self
 
     def resolve_indicator_path(self, base_dir: Path | None = None) -> Path:
         """Resolve the indicator source path relative to base_dir."""
@@ -0,0 +1,181 @@
+"""Process-pool helpers for grid search and walk-forward.
+
+The OHLCV frame is copied once into a shared-memory block; pool workers
+attach to it in their initializer instead of receiving a pickled copy with
+every task. Tasks are plain picklable tuples handed to a module-level
+function ``fn(data, task)``; run_tasks() returns results in task order and
+iter_tasks() streams them as they finish.
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+# (block name, rows, column names, index tz)
+FrameSpec = tuple[str, int, list[str], str | None]
+
+
+class SharedFrame:
+    """An OHLCV DataFrame copied into shared memory: float64 columns followed by int64 UTC nanoseconds."""
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        index = pd.DatetimeIndex(data.index)
+        n, columns = len(data), [str(c) for c in data.columns]
+        self._shm = SharedMemory(create=True, size=max(1, n * (len(columns) + 1) * 8))
+        values, stamps = _views(self._shm, n, len(columns))
+        values[:] = data.to_numpy(dtype=float)
+        utc = index.tz_convert("UTC").tz_localize(None) if index.tz is not None else index
+        stamps[:] = utc.to_numpy(dtype="datetime64[ns]").view(np.int64)
+        self.spec: FrameSpec = (self._shm.name, n, columns, str(index.tz) if index.tz is not None else None)
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> SharedFrame:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def _views(shm: SharedMemory, n: int, ncols: int) -> tuple[np.ndarray, np.ndarray]:
+    values = np.ndarray((n, ncols), dtype=np.float64, buffer=shm.buf)
+    stamps = np.ndarray(n, dtype=np.int64, buffer=shm.buf, offset=n * ncols * 8)
+    return values, stamps
+
+
+def attach_frame(spec: FrameSpec) -> tuple[SharedMemory, pd.DataFrame]:
+    """Rebuild the DataFrame over an existing block without copying the values.
+
+    The caller must keep the returned SharedMemory alive as long as the frame is used.
+    """
+    name, n, columns, tz = spec
+    shm = SharedMemory(name=name)
+    values, stamps = _views(shm, n, len(columns))
+    index = pd.DatetimeIndex(stamps.view("datetime64[ns]"))
+    if tz is not None:
+        index = index.tz_localize("UTC").tz_convert(tz)
+    return shm, pd.DataFrame(values, index=index, columns=columns, copy=False)
+
+
+class Throughput:
+    """Done/total counter of a long run with its rate and ETA, for progress events.
+
+    Units finished before the run started (resumed or served from the store)
+    count as done but not towards the rate.
+    """
+
+    def __init__(self, total: int, done: int = 0) -> None:
+        self.total = total
+        self.done = done
+        self._skipped = done
+        self._started = time.perf_counter()
+
+    def skip(self, n: int) -> dict[str, Any]:
+        """Count ``n`` units finished elsewhere (journal, store) without crediting them to the rate."""
+        self._skipped += n
+        return self.step(n)
+
+    def step(self, n: int = 1) -> dict[str, Any]:
+        """Count ``n`` more finished units; returns done, total, elapsed_s, rate_per_s and eta_s."""
+        self.done += n
+        elapsed = time.perf_counter() - self._started
+        rate = (self.done - self._skipped) / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - self.done
+        return {
+            "done": self.done,
+            "total": self.total,
+            "elapsed_s": round(elapsed, 3),
+            "rate_per_s": round(rate, 2),
+            "eta_s": round(remaining / rate, 1) if rate > 0 else (0.0 if remaining <= 0 else None),
+        }
+
+
+_worker_shm: SharedMemory | None = None
+_worker_data: pd.DataFrame | None = None
+
+
+def _init_worker(spec: FrameSpec) -> None:
+    global _worker_shm, _worker_data
+    _worker_shm, _worker_data = attach_frame(spec)
+
+
+def _call(fn: Callable[[pd.DataFrame, Any], Any], task: Any) -> Any:
+    return fn(_worker_data, task)  # type: ignore[arg-type]
+
+
+def iter_tasks(
+    data: pd.DataFrame,
+    fn: Callable[[pd.DataFrame, Any], Any],
+    tasks: Sequence[Any],
+    jobs: int = 1,
+) -> Iterator[tuple[int, Any]]:
+    """Yield ``(i, fn(data, tasks[i]))`` as each task finishes (completion order), keeping no results.
+
+    A task that raises yields its exception object in place of a result.
+    Closing the iterator early cancels the tasks that have not started.
+
+    Args:
+        fn: Module-level function, so it can be pickled for worker processes.
+        jobs: Worker processes; 1 runs everything in this process, in task order.
+    """
+    if jobs < 1:
+        raise ValueError(f"jobs must be >= 1, got {jobs}")
+
+    if jobs == 1 or len(tasks) <= 1:
+        for i, task in enumerate(tasks):
+            try:
+                result = fn(data, task)
+            except Exception as e:
+                result = e
+            yield i, result
+        return
+
+    with (
+        SharedFrame(data) as shared,
+        ProcessPoolExecutor(
+            max_workers=min(jobs, len(tasks)), initializer=_init_worker, initargs=(shared.spec,)
+        ) as pool,
+    ):
+        futures = {pool.submit(_call, fn, task): i for i, task in enumerate(tasks)}
+        try:
+            for future in as_completed(futures):
+                error = future.exception()
+                yield futures.pop(future), error if error is not None else future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def run_tasks(
+    data: pd.DataFrame,
+    fn: Callable[[pd.DataFrame, Any], Any],
+    tasks: Sequence[Any],
+    jobs: int = 1,
+    on_result: Callable[[int, Any], None] | None = None,
+) -> list[Any]:
+    """Run ``fn(data, task)`` for every task and return the results in task order.
+
+    A task that raises yields its exception object in place of a result.
+    ``on_result(i, result)`` is called as each task finishes (completion order).
+
+    Args:
+        fn: Module-level function, so it can be pickled for worker processes.
+        jobs: Worker processes; 1 runs everything in this process.
+    """
+    results: list[Any] = [None] * len(tasks)
+    for i, result in iter_tasks(data, fn, tasks, jobs):
+        results[i] = result
+        if on_result:
+            on_result(i, result)
+    return results
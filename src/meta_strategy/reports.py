@@ -10,11 +10,17 @@ import csv
 import json
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pandas as pd
 from backtesting import Backtest
 
-from .backtest import STRATEGIES, fetch_data
+from .backtest import STRATEGIES, load_data
+from .data import DataProvider, SharedDataProvider
+from .risk import DEFAULT_ROLLING_WINDOWS, rolling_risk_metrics, summarize_rolling
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
 
 
 def _run_backtest_with_equity(
@@ -24,10 +30,11 @@ def _run_backtest_with_equity(
     end: str | None = None,
     cash: float = 100_000.0,
     commission: float = 0.001,
+    data: pd.DataFrame | DataProvider | None = None,
 ) -> tuple[dict, pd.Series]:
     """Run backtest and return both stats dict and equity curve."""
     strategy_cls = STRATEGIES[strategy_name]
-    data = fetch_data(symbol, start, end)
+    data = load_data(data, symbol, start, end)
     bt = Backtest(data, strategy_cls, cash=cash, commission=commission, exclusive_orders=True)
     stats = bt.run()
 
@@ -155,6 +162,24 @@ def _svg_equity_chart(equity_curves: dict[str, pd.Series], width: int = 800, hei
     return svg
 
 
+def _rolling_table(summary: dict[int, dict]) -> str:
+    """HTML table of rolling Sharpe, Sortino and drawdown per window (empty if no window fits)."""
+    if not summary:
+        return ""
+    rows = "".join(
+        f"<tr><td>{w} bars</td><td>{r['sharpe']:.2f}</td><td>{r['sortino']:.2f}</td>"
+        f'<td class="negative">{r["drawdown_pct"]:.2f}%</td><td>{r["median_sharpe"]:.2f}</td>'
+        f'<td>{r["min_sharpe"]:.2f}</td><td class="negative">{r["max_drawdown_pct"]:.2f}%</td></tr>'
+        for w, r in summary.items()
+    )
+    return f"""<h2>Rolling Risk</h2>
+<table>
+  <tr><th>Window</th><th>Sharpe</th><th>Sortino</th><th>Drawdown</th>
+  <th>Median Sharpe</th><th>Worst Sharpe</th><th>Worst Drawdown</th></tr>
+  {rows}
+</table>"""
+
+
 def generate_html_report(
     strategy_name: str,
     symbol: str = "BTC-USD",
@@ -162,9 +187,11 @@ def generate_html_report(
     end: str | None = None,
     cash: float = 100_000.0,
     output_path: str | None = None,
+    data: pd.DataFrame | DataProvider | None = None,
+    rolling_windows: Sequence[int] = DEFAULT_ROLLING_WINDOWS,
 ) -> str:
-    """Generate HTML report for a single strategy with equity curve."""
-    result, equity = _run_backtest_with_equity(strategy_name, symbol, start, end, cash)
+    """Generate HTML report for a single strategy with equity curve and rolling risk table."""
+    result, equity = _run_backtest_with_equity(strategy_name, symbol, start, end, cash, data=data)
 
     # Build content
     ret_class = "positive" if result["return_pct"] > 0 else "negative"
@@ -184,6 +211,7 @@ def generate_html_report(
 
 <h2>Equity Curve</h2>
 {_svg_equity_chart({strategy_name: equity})}
+{_rolling_table(summarize_rolling(rolling_risk_metrics(equity, rolling_windows), rolling_windows))}
 """
 
     html = _HTML_TEMPLATE.format(
@@ -208,12 +236,18 @@ def generate_dashboard(
     end: str | None = None,
     cash: float = 100_000.0,
     output_path: str | None = None,
+    data: pd.DataFrame | DataProvider | None = None,
 ) -> str:
-    """Generate comparison dashboard for all strategies."""
+    """Generate comparison dashboard for all strategies.
+
+    Bars are fetched once and shared by every strategy run.
+    """
+    if data is None:
+        data = SharedDataProvider()
     results_and_equity = {}
     for name in STRATEGIES:
         try:
-            result, equity = _run_backtest_with_equity(name, symbol, start, end, cash)
+            result, equity = _run_backtest_with_equity(name, symbol, start, end, cash, data=data)
             results_and_equity[name] = (result, equity)
         except Exception:
             pass
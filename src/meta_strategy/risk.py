@@ -6,11 +6,17 @@ risk-adjusted performance metrics beyond Sharpe ratio.
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, Any
+
 import numpy as np
 import pandas as pd
-from backtesting import Backtest
 
-from .backtest import STRATEGIES, fetch_data
+from .backtest import STRATEGIES, load_data, run_strategy
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+    from .data import DataProvider
 
 # === Extended Risk Metrics (#24) ===
 
@@ -78,6 +84,72 @@ def compute_risk_metrics(equity_series: pd.Series, risk_free_rate: float = 0.0)
     }
 
 
+# Annualization factor (252 trading days)
+_ANN = 252
+
+
+def longest_runs(mask: np.ndarray) -> np.ndarray:
+    """Length of the longest run of True in each row of a 2D boolean array."""
+    if mask.shape[1] == 0:
+        return np.zeros(len(mask), dtype=np.int64)
+    run = np.cumsum(mask, axis=1, dtype=np.int64)
+    run -= np.maximum.accumulate(np.where(mask, 0, run), axis=1)
+    longest: np.ndarray = run.max(axis=1)
+    return longest
+
+
+def compute_risk_metrics_batch(equity: np.ndarray, risk_free_rate: float = 0.0) -> dict[str, np.ndarray]:
+    """Extended risk metrics for every row of a (curves × bars) equity array, unrounded.
+
+    Row ``i`` gives the same metrics as ``compute_risk_metrics`` on that
+    curve (which rounds them); the keys are the same. Masked sums replace
+    boolean indexing and run lengths come from cumulative sums, so the cost
+    is a few passes over the array however many curves it holds.
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=float))
+    n_curves, n_bars = equity.shape
+    if n_bars - 1 < 2:
+        return {key: np.zeros(n_curves) for key in _empty_metrics()}
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = equity[:, 1:] / equity[:, :-1] - 1.0
+        losses, gains = returns < 0, returns > 0
+
+        # Sortino Ratio — penalizes only downside volatility (sample std of the negative returns)
+        n_down = losses.sum(axis=1)
+        down_mean = np.where(losses, returns, 0.0).sum(axis=1) / n_down
+        down_var = np.where(losses, (returns - down_mean[:, None]) ** 2, 0.0).sum(axis=1) / (n_down - 1)
+        downside_std = np.where(n_down > 0, np.sqrt(down_var) * np.sqrt(_ANN), 0.0)
+        mean_return = returns.mean(axis=1) * _ANN
+        sortino = np.where(downside_std > 0, (mean_return - risk_free_rate) / downside_std, 0.0)
+
+        # Calmar Ratio — return / max drawdown
+        cummax = np.maximum.accumulate(equity, axis=1)
+        max_dd = np.abs(((equity - cummax) / cummax).min(axis=1))
+        total_return = equity[:, -1] / equity[:, 0] - 1
+        years = returns.shape[1] / _ANN
+        annual_return = (1 + total_return) ** (1 / years) - 1
+        calmar = np.where(max_dd > 0, annual_return / max_dd, 0.0)
+
+        gross_profit = np.where(gains, returns, 0.0).sum(axis=1)
+        gross_loss = np.abs(np.where(losses, returns, 0.0).sum(axis=1))
+        profit_factor = np.where(gross_loss > 0, gross_profit / gross_loss, np.inf)
+        recovery_factor = np.where(max_dd > 0, total_return / max_dd, 0.0)
+
+    return {
+        "sortino_ratio": sortino,
+        "calmar_ratio": calmar,
+        "max_consecutive_losses": longest_runs(losses),
+        "max_consecutive_wins": longest_runs(gains),
+        "profit_factor": profit_factor,
+        "recovery_factor": recovery_factor,
+        "annual_return_pct": annual_return * 100,
+        "downside_deviation": downside_std,
+        "max_drawdown_pct": max_dd * 100,
+        "total_return_pct": total_return * 100,
+    }
+
+
 def _max_consecutive(binary_series: pd.Series) -> int:
     """Count max consecutive 1s in a binary series."""
     if len(binary_series) == 0:
@@ -101,8 +173,407 @@ def _empty_metrics() -> dict:
     }
 
 
+# === Rolling Risk Metrics ===
+
+DEFAULT_ROLLING_WINDOWS = (90, 180, 365)
+
+
+def rolling_max(values: np.ndarray, length: int) -> np.ndarray:
+    """Maximum of each full window of ``length`` values (van Herk/Gil-Werman), NaN before the first.
+
+    The series is cut into blocks of ``length``; every window spans the tail
+    of one block and the head of the next, so its maximum is the larger of a
+    running-from-the-right maximum and a running-from-the-left maximum. Two
+    accumulate passes, O(n) whatever the window.
+    """
+    n = len(values)
+    out = np.full(n, np.nan)
+    if length > n:
+        return out
+    n_blocks = -(-n // length)
+    padded = np.full(n_blocks * length, -np.inf)
+    padded[:n] = values
+    blocks = padded.reshape(n_blocks, length)
+    from_left = np.maximum.accumulate(blocks, axis=1).ravel()
+    from_right = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    out[length - 1 :] = np.maximum(from_right[: n - length + 1], from_left[length - 1 : n])
+    return out
+
+
+def rolling_risk_metrics(equity: pd.Series, windows: Sequence[int] = DEFAULT_ROLLING_WINDOWS) -> pd.DataFrame:
+    """Rolling Sharpe, Sortino and drawdown over the last ``w`` bar returns, for every window at once.
+
+    Columns ``sharpe_{w}``, ``sortino_{w}`` and ``drawdown_pct_{w}`` (the
+    fall from the highest equity of the window, in %) are NaN until a window
+    is full. Sortino at bar ``t`` equals ``compute_risk_metrics`` on
+    ``equity[t - w : t + 1]``; Sharpe uses the same 252-bar annualization.
+    Both are 0 for a window without variation (no downside for Sortino).
+    Means and deviations come from (segmented) prefix sums and peaks from
+    ``rolling_max``, so the cost is O(n) per window.
+    """
+    from .batch import rolling_mean_matrix, rolling_std_matrix
+
+    lengths = [int(w) for w in windows]
+    if any(w < 2 for w in lengths):
+        raise ValueError(f"rolling windows must be >= 2 bars, got {list(windows)}")
+    values = equity.to_numpy(dtype=float)
+    n = len(values)
+    out = pd.DataFrame(index=equity.index)
+    returns = values[1:] / values[:-1] - 1.0 if n > 1 else np.empty(0)
+    means = rolling_mean_matrix(returns, lengths)
+    stds = rolling_std_matrix(returns, lengths)
+
+    losses = returns < 0
+    down = np.where(losses, returns, 0.0)
+    prefix = [np.concatenate([[0.0], np.cumsum(a)]) for a in (losses.astype(float), down, down * down)]
+    for j, w in enumerate(lengths):
+        sharpe = np.full(n, np.nan)
+        sortino = np.full(n, np.nan)
+        if w <= len(returns):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                sample_std = stds[w - 1 :, j] * np.sqrt(w / (w - 1))
+                sharpe[w:] = np.where(sample_std > 0, means[w - 1 :, j] / sample_std * np.sqrt(_ANN), 0.0)
+                count, total, total_sq = (c[w:] - c[:-w] for c in prefix)
+                down_std = np.sqrt(np.maximum(total_sq - total * total / count, 0.0) / (count - 1))
+                down_std = np.where(count > 0, down_std, 0.0)
+                sortino[w:] = np.where(down_std > 0, means[w - 1 :, j] / down_std * np.sqrt(_ANN), 0.0)
+        out[f"sharpe_{w}"] = sharpe
+        out[f"sortino_{w}"] = sortino
+        out[f"drawdown_pct_{w}"] = (1.0 - values / rolling_max(values, w + 1)) * 100
+    return out
+
+
+def summarize_rolling(rolling: pd.DataFrame, windows: Sequence[int] = DEFAULT_ROLLING_WINDOWS) -> dict[int, dict]:
+    """Latest, median and worst rolling values per window, for reports."""
+    summary = {}
+    for w in windows:
+        sharpe, sortino, drawdown = (rolling[f"{k}_{w}"].dropna() for k in ("sharpe", "sortino", "drawdown_pct"))
+        if sharpe.empty:
+            continue
+        summary[int(w)] = {
+            "sharpe": round(float(sharpe.iloc[-1]), 3),
+            "sortino": round(float(sortino.iloc[-1]), 3),
+            "drawdown_pct": round(float(drawdown.iloc[-1]), 2),
+            "median_sharpe": round(float(sharpe.median()), 3),
+            "min_sharpe": round(float(sharpe.min()), 3),
+            "max_drawdown_pct": round(float(drawdown.max()), 2),
+        }
+    return summary
+
+
 # === Monte Carlo Simulation (#23) ===
 
+# Ceiling on the (simulations × trades) draw held in memory at once
+DEFAULT_MC_MEMORY_BYTES = 64 * 1024 * 1024
+BOOTSTRAP_METHODS = ("stationary", "block")
+# Histogram bins per trade step for the streaming fan-chart percentiles
+FAN_BINS = 2048
+FAN_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _chunk_rows(n_trades: int, memory_budget: int, cell_bytes: int = 16) -> int:
+    """Simulations per chunk, given the bytes each (simulation, trade) cell needs."""
+    return max(1, memory_budget // (cell_bytes * max(n_trades, 1)))
+
+
+def _resample_indices(
+    rng: np.random.Generator, rows: int, n_trades: int, block_size: int, bootstrap: str
+) -> np.ndarray:
+    """A (rows × n_trades) matrix of trade indices for one chunk of simulations.
+
+    ``block_size`` 1 draws trades independently. Otherwise trades are taken
+    in circular runs: fixed runs of ``block_size`` (moving block bootstrap) or
+    runs of geometric length with mean ``block_size`` (stationary bootstrap),
+    which keeps the serial dependence between consecutive trades.
+    """
+    if block_size <= 1:
+        return rng.integers(0, n_trades, size=(rows, n_trades))
+    if bootstrap == "block":
+        n_blocks = -(-n_trades // block_size)
+        starts = rng.integers(0, n_trades, size=(rows, n_blocks))
+        offsets = np.tile(np.arange(block_size), n_blocks)[:n_trades]
+        return (np.repeat(starts, block_size, axis=1)[:, :n_trades] + offsets) % n_trades
+    starts = rng.integers(0, n_trades, size=(rows, n_trades))
+    steps = np.arange(n_trades)
+    new_block = rng.random((rows, n_trades)) < 1.0 / block_size
+    new_block[:, 0] = True
+    block_start = np.maximum.accumulate(np.where(new_block, steps, 0), axis=1)
+    first = np.take_along_axis(starts, block_start, axis=1)
+    return (first + steps - block_start) % n_trades
+
+
+def _check_bootstrap(block_size: int, bootstrap: str) -> None:
+    if block_size < 1:
+        raise ValueError(f"block_size must be >= 1, got {block_size}")
+    if bootstrap not in BOOTSTRAP_METHODS:
+        raise ValueError(f"Unknown bootstrap: {bootstrap}. Use one of {', '.join(BOOTSTRAP_METHODS)}")
+
+
+def _index_chunks(
+    seed: np.random.SeedSequence, n_simulations: int, n_trades: int, rows: int, block_size: int, bootstrap: str
+) -> Iterator[tuple[int, np.ndarray]]:
+    """(offset, index matrix) per chunk; replaying the same seed replays the same draws."""
+    rng = np.random.default_rng(seed)
+    for lo in range(0, n_simulations, rows):
+        yield lo, _resample_indices(rng, min(rows, n_simulations - lo), n_trades, block_size, bootstrap)
+
+
+def _compound(returns: np.ndarray, log_growth: np.ndarray | None, idx: np.ndarray) -> np.ndarray:
+    """Compounded return (fraction) of each row of resampled trades."""
+    if log_growth is not None:
+        compounded: np.ndarray = np.expm1(log_growth[idx].sum(axis=1))
+        return compounded
+    # a loss beyond -100% has no logarithm; compound directly
+    product: np.ndarray = np.prod(1.0 + returns[idx], axis=1) - 1.0
+    return product
+
+
+def simulate_compounded_returns(
+    trade_returns: np.ndarray,
+    n_simulations: int,
+    seed: int | None = 42,
+    memory_budget: int = DEFAULT_MC_MEMORY_BYTES,
+    block_size: int = 1,
+    bootstrap: str = "stationary",
+) -> np.ndarray:
+    """Compounded return (%) of ``n_simulations`` resamplings of ``trade_returns`` (fractions).
+
+    Simulations are drawn in chunks of a (sims × trades) index matrix sized to
+    ``memory_budget``. With ``block_size`` 1 each chunk consumes the generator
+    exactly as one ``rng.choice(trade_returns, size=n_trades)`` call per
+    simulation did, so a seed yields the same resampled trades whatever the
+    budget; compounding is a log-sum (``expm1(sum(log1p(r)))``), equal to the
+    running product up to float rounding. ``block_size`` > 1 resamples runs
+    of consecutive trades (see ``_resample_indices``).
+    """
+    _check_bootstrap(block_size, bootstrap)
+    returns = np.asarray(trade_returns, dtype=float)
+    n_trades = len(returns)
+    out = np.empty(n_simulations)
+    log_growth = np.log1p(returns) if (returns > -1.0).all() else None
+    rows = _chunk_rows(n_trades, memory_budget)
+
+    chunks = _index_chunks(np.random.SeedSequence(seed), n_simulations, n_trades, rows, block_size, bootstrap)
+    for lo, idx in chunks:
+        out[lo : lo + len(idx)] = _compound(returns, log_growth, idx)
+    out *= 100.0
+    return out
+
+
+class _StepHistogram:
+    """Streaming per-step percentiles of log equity over a fixed range per step.
+
+    Each step's [lo, hi] range is split into ``bins`` equal bins, with one
+    extra bin for ruined paths (log equity -inf). Each order statistic is
+    placed within one bin width, so percentiles are too.
+    """
+
+    def __init__(self, lo: np.ndarray, hi: np.ndarray, bins: int = FAN_BINS) -> None:
+        self.lo = lo
+        self.width = np.where(hi > lo, (hi - lo) / bins, 1.0)
+        self.bins = bins
+        self.counts = np.zeros((len(lo), bins + 1), dtype=np.int64)
+        self.total = 0
+
+    def add(self, log_equity: np.ndarray) -> None:
+        """Accumulate a (sims × steps) chunk of log equity."""
+        with np.errstate(invalid="ignore"):
+            pos = np.floor((log_equity - self.lo) / self.width)
+        cell = np.where(np.isneginf(log_equity), 0, np.clip(np.nan_to_num(pos), 0, self.bins - 1) + 1).astype(np.int64)
+        cell += np.arange(len(self.lo)) * (self.bins + 1)
+        self.counts += np.bincount(cell.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        self.total += len(log_equity)
+
+    def _order_statistic(self, k: int) -> np.ndarray:
+        """Estimated k-th smallest log equity per step, placing a bin's values evenly across it."""
+        cum = np.cumsum(self.counts, axis=1)
+        cell = np.argmax(cum > k, axis=1)
+        steps = np.arange(len(self.lo))
+        before = cum[steps, cell] - self.counts[steps, cell]
+        frac = (k - before + 0.5) / self.counts[steps, cell]
+        out: np.ndarray = np.where(cell == 0, -np.inf, self.lo + (cell - 1 + frac) * self.width)
+        return out
+
+    def percentile(self, q: float) -> np.ndarray:
+        """Log equity at percentile ``q`` for every step, interpolated as ``np.percentile`` does."""
+        rank = q / 100.0 * (self.total - 1)
+        below, above = self._order_statistic(int(rank)), self._order_statistic(min(int(rank) + 1, self.total - 1))
+        weight = rank - int(rank)
+        with np.errstate(invalid="ignore"):
+            out: np.ndarray = np.where((weight == 0.0) | np.isneginf(below), below, below + weight * (above - below))
+        return out
+
+
+def simulate_equity_paths(
+    trade_returns: np.ndarray,
+    n_simulations: int,
+    seed: int | None = 42,
+    memory_budget: int = DEFAULT_MC_MEMORY_BYTES,
+    block_size: int = 1,
+    bootstrap: str = "stationary",
+    fan_bins: int = FAN_BINS,
+) -> dict:
+    """Path statistics of ``n_simulations`` resampled trade sequences.
+
+    Each chunk's equity paths are a cumulative sum of log growth; only
+    per-simulation scalars and per-step histograms outlive the chunk, so the
+    full (sims × trades) path matrix is never held. A first pass collects the
+    final returns, drawdowns and each step's range; a second pass replays the
+    same draws into the fan-chart histograms. A trade losing 100% or more
+    ruins the path (equity stays at 0).
+
+    Returns:
+        Dict with arrays ``final_return_pct``, ``max_drawdown_pct`` and
+        ``time_under_water`` (longest run of trades below the running peak)
+        per simulation, and ``fan`` mapping ``"p5"``… to the equity return (%)
+        at that percentile after each trade (step 0 is the start, 0%).
+    """
+    _check_bootstrap(block_size, bootstrap)
+    returns = np.asarray(trade_returns, dtype=float)
+    n_trades = len(returns)
+    with np.errstate(divide="ignore"):
+        log_growth = np.log(np.maximum(1.0 + returns, 0.0))
+    exact = np.log1p(returns) if (returns > -1.0).all() else None
+    rows = _chunk_rows(n_trades, memory_budget, cell_bytes=48)
+    seed_seq = np.random.SeedSequence(seed)
+
+    final = np.empty(n_simulations)
+    max_dd = np.empty(n_simulations)
+    under_water = np.empty(n_simulations, dtype=np.int64)
+    lo = np.full(n_trades, np.inf)
+    hi = np.full(n_trades, -np.inf)
+    for start, idx in _index_chunks(seed_seq, n_simulations, n_trades, rows, block_size, bootstrap):
+        stop = start + len(idx)
+        log_equity = np.cumsum(log_growth[idx], axis=1)
+        peak = np.maximum.accumulate(np.maximum(log_equity, 0.0), axis=1)
+        max_dd[start:stop] = -np.expm1(np.min(log_equity - peak, axis=1))
+        under_water[start:stop] = longest_runs(log_equity < peak)
+        final[start:stop] = _compound(returns, exact, idx)
+        finite = np.where(np.isneginf(log_equity), np.nan, log_equity)
+        lo = np.fmin(lo, np.fmin.reduce(finite, axis=0))
+        hi = np.fmax(hi, np.fmax.reduce(finite, axis=0))
+
+    lo, hi = np.where(np.isfinite(lo), lo, 0.0), np.where(np.isfinite(hi), hi, 0.0)
+    histogram = _StepHistogram(lo, hi, fan_bins)
+    for _, idx in _index_chunks(seed_seq, n_simulations, n_trades, rows, block_size, bootstrap):
+        histogram.add(np.cumsum(log_growth[idx], axis=1))
+
+    fan = {f"p{q}": np.concatenate([[0.0], np.expm1(histogram.percentile(q)) * 100.0]) for q in FAN_PERCENTILES}
+    return {
+        "final_return_pct": final * 100.0,
+        "max_drawdown_pct": max_dd * 100.0,
+        "time_under_water": under_water,
+        "fan": fan,
+    }
+
+
+def _percentiles(values: np.ndarray, digits: int = 2) -> dict:
+    return {f"p{q}": round(float(np.percentile(values, q)), digits) for q in FAN_PERCENTILES}
+
+
+# === Adaptive Monte Carlo (convergence-based stopping) ===
+
+DEFAULT_MC_BATCH = 1000
+CI_RESAMPLES = 200
+# Statistics whose confidence intervals decide convergence
+CONVERGENCE_STATS = ("p5", "p50", "p95", "prob_profit")
+
+
+def bootstrap_half_widths(
+    sim_returns: np.ndarray,
+    rng: np.random.Generator,
+    n_resamples: int = CI_RESAMPLES,
+    memory_budget: int = DEFAULT_MC_MEMORY_BYTES,
+) -> dict[str, float]:
+    """Half-width of the 95% bootstrap confidence interval of each convergence statistic.
+
+    All statistics are in percentage points: the p5/p50/p95 compounded return
+    (%) and the probability of profit (%).
+    """
+    n = len(sim_returns)
+    stats = np.empty((n_resamples, len(CONVERGENCE_STATS)))
+    rows = _chunk_rows(n, memory_budget)
+    for lo in range(0, n_resamples, rows):
+        resampled = sim_returns[rng.integers(0, n, size=(min(rows, n_resamples - lo), n))]
+        stats[lo : lo + len(resampled), :3] = np.percentile(resampled, [5, 50, 95], axis=1).T
+        stats[lo : lo + len(resampled), 3] = (resampled > 0).mean(axis=1) * 100.0
+    low, high = np.percentile(stats, [2.5, 97.5], axis=0)
+    return {name: float(w) / 2 for name, w in zip(CONVERGENCE_STATS, high - low, strict=True)}
+
+
+def simulate_until_converged(
+    trade_returns: np.ndarray,
+    tolerance: float,
+    max_simulations: int = 100_000,
+    batch_size: int = DEFAULT_MC_BATCH,
+    seed: int | None = 42,
+    memory_budget: int = DEFAULT_MC_MEMORY_BYTES,
+    block_size: int = 1,
+    bootstrap: str = "stationary",
+) -> tuple[np.ndarray, dict]:
+    """Resample in batches until the p5/p50/p95 and P(profit) estimates are precise to ``tolerance``.
+
+    After the first ``batch_size`` simulations, and each time the count has
+    grown by a further quarter (at least one batch), the 95% bootstrap
+    confidence interval of every convergence statistic is recomputed; the run
+    stops once all half-widths are at most ``tolerance`` percentage points or
+    ``max_simulations`` is reached. Draws come from the same stream as
+    ``simulate_compounded_returns``, so with i.i.d. resampling the
+    simulations are the first N of a fixed-size run with the same seed.
+
+    Returns:
+        The simulated returns (%) and a dict with ``converged``, ``checks``
+        and the final ``half_widths``.
+    """
+    if tolerance <= 0:
+        raise ValueError(f"tolerance must be > 0, got {tolerance}")
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    _check_bootstrap(block_size, bootstrap)
+    returns = np.asarray(trade_returns, dtype=float)
+    n_trades = len(returns)
+    log_growth = np.log1p(returns) if (returns > -1.0).all() else None
+    seed_seq = np.random.SeedSequence(seed)
+    ci_rng = np.random.default_rng(seed_seq.spawn(1)[0])
+    rows = min(_chunk_rows(n_trades, memory_budget), batch_size)
+
+    out = np.empty(max_simulations)
+    filled, checks, next_check = 0, 0, min(batch_size, max_simulations)
+    half_widths: dict[str, float] = {}
+    for lo, idx in _index_chunks(seed_seq, max_simulations, n_trades, rows, block_size, bootstrap):
+        filled = lo + len(idx)
+        out[lo:filled] = _compound(returns, log_growth, idx) * 100.0
+        if filled < next_check and filled < max_simulations:
+            continue
+        checks += 1
+        half_widths = bootstrap_half_widths(out[:filled], ci_rng, memory_budget=memory_budget)
+        if max(half_widths.values()) <= tolerance:
+            break
+        next_check = filled + max(batch_size, filled // 4)
+
+    converged = bool(half_widths) and max(half_widths.values()) <= tolerance
+    info = {"converged": converged, "checks": checks, "half_widths": {k: round(v, 3) for k, v in half_widths.items()}}
+    return out[:filled], info
+
+
+def _strategy_stats(
+    strategy_name: str,
+    stats: Any,
+    data: pd.DataFrame | DataProvider | None,
+    symbol: str,
+    start: str,
+    end: str | None,
+    interval: str,
+    cash: float,
+    commission: float,
+    engine: str,
+) -> Any:
+    """The given backtest stats, or a fresh run of the strategy on the project's fractional engine."""
+    if stats is not None:
+        return stats
+    data = load_data(data, symbol, start, end, interval)
+    return run_strategy(data, STRATEGIES[strategy_name], cash, commission, engine)
+
 
 def monte_carlo(
     strategy_name: str,
@@ -113,19 +584,40 @@ def monte_carlo(
     commission: float = 0.001,
     n_simulations: int = 1000,
     seed: int | None = 42,
+    data: pd.DataFrame | DataProvider | None = None,
+    memory_budget: int = DEFAULT_MC_MEMORY_BYTES,
+    block_size: int = 1,
+    bootstrap: str = "stationary",
+    paths: bool = False,
+    tolerance: float | None = None,
+    batch_size: int = DEFAULT_MC_BATCH,
+    stats: Any = None,
+    interval: str = "1d",
+    engine: str = "reference",
 ) -> dict:
     """Monte Carlo simulation via trade return resampling.
 
     Runs the strategy once, extracts individual trade returns,
     then resamples them N times to build a distribution of outcomes.
+    Pass the ``stats`` of an earlier run (``run_strategy`` or
+    ``run_backtest(..., include_stats=True)``) to skip the backtest.
+    ``data`` may be a preloaded DataFrame or a DataProvider; ``memory_budget``
+    caps the bytes of each simulation chunk (see ``simulate_compounded_returns``).
+    ``block_size`` > 1 resamples runs of consecutive trades (``bootstrap`` is
+    ``"stationary"`` or ``"block"``); ``paths`` adds max-drawdown and
+    time-under-water percentiles and a per-trade fan chart. With a
+    ``tolerance`` (percentage points), ``n_simulations`` becomes a cap and the
+    run stops as soon as p5/p50/p95 and P(profit) have converged (see
+    ``simulate_until_converged``); ``n_simulations`` in the result is the
+    number actually used.
     """
     if strategy_name not in STRATEGIES:
         raise ValueError(f"Unknown strategy: {strategy_name}")
+    _check_bootstrap(block_size, bootstrap)
+    if tolerance is not None and tolerance <= 0:
+        raise ValueError(f"tolerance must be > 0, got {tolerance}")
 
-    data = fetch_data(symbol, start, end)
-    strategy_cls = STRATEGIES[strategy_name]
-    bt = Backtest(data, strategy_cls, cash=cash, commission=commission, exclusive_orders=True)
-    stats = bt.run()
+    stats = _strategy_stats(strategy_name, stats, data, symbol, start, end, interval, cash, commission, engine)
 
     # Extract trade returns
     trades_df = stats["_trades"]
@@ -142,33 +634,34 @@ def monte_carlo(
             "prob_profit_pct": 0.0,
         }
 
-    trade_returns = trades_df["ReturnPct"].values / 100.0  # Convert from percentage
+    trade_returns = trades_df["ReturnPct"].to_numpy(dtype=float)  # a fraction per trade, despite the name
     n_trades = len(trade_returns)
 
-    rng = np.random.default_rng(seed)
-    sim_list: list[float] = []
-
-    for _ in range(n_simulations):
-        # Resample trades with replacement
-        sampled = rng.choice(trade_returns, size=n_trades, replace=True)
-        # Compound returns
-        total = np.prod(1 + sampled) - 1
-        sim_list.append(total * 100)  # Back to percentage
-
-    sim_returns = np.array(sim_list)
-    percentiles = {
-        "p5": round(float(np.percentile(sim_returns, 5)), 2),
-        "p25": round(float(np.percentile(sim_returns, 25)), 2),
-        "p50": round(float(np.percentile(sim_returns, 50)), 2),
-        "p75": round(float(np.percentile(sim_returns, 75)), 2),
-        "p95": round(float(np.percentile(sim_returns, 95)), 2),
+    sampling: dict[str, Any] = {
+        "seed": seed,
+        "memory_budget": memory_budget,
+        "block_size": block_size,
+        "bootstrap": bootstrap,
     }
-
-    return {
+    convergence = None
+    if tolerance is not None:
+        sim_returns, convergence = simulate_until_converged(
+            trade_returns, tolerance, max_simulations=n_simulations, batch_size=batch_size, **sampling
+        )
+        n_simulations = len(sim_returns)
+    path_stats = simulate_equity_paths(trade_returns, n_simulations, **sampling) if paths else None
+    if path_stats is not None:
+        sim_returns = path_stats["final_return_pct"]
+    elif convergence is None:
+        sim_returns = simulate_compounded_returns(trade_returns, n_simulations, **sampling)
+    percentiles = _percentiles(sim_returns)
+
+    result = {
         "strategy": strategy_name,
         "symbol": symbol,
         "n_trades": n_trades,
         "n_simulations": n_simulations,
+        "block_size": block_size,
         "original_return_pct": round(float(stats["Return [%]"]), 2),
         "percentiles": percentiles,
         "median_return_pct": percentiles["p50"],
@@ -178,6 +671,14 @@ def monte_carlo(
         "mean_return_pct": round(float(sim_returns.mean()), 2),
         "std_return_pct": round(float(sim_returns.std()), 2),
     }
+    if convergence is not None:
+        result["tolerance"] = tolerance
+        result.update(convergence)
+    if path_stats is not None:
+        result["max_drawdown_percentiles"] = _percentiles(path_stats["max_drawdown_pct"])
+        result["time_under_water_percentiles"] = _percentiles(path_stats["time_under_water"], digits=1)
+        result["fan_chart"] = {k: [round(float(v), 2) for v in band] for k, band in path_stats["fan"].items()}
+    return result
 
 
 def run_risk_analysis(
@@ -187,15 +688,22 @@ def run_risk_analysis(
     end: str | None = None,
     cash: float = 100_000.0,
     commission: float = 0.001,
+    data: pd.DataFrame | DataProvider | None = None,
+    stats: Any = None,
+    interval: str = "1d",
+    engine: str = "reference",
+    rolling_windows: Sequence[int] | None = None,
 ) -> dict:
-    """Run a strategy and return extended risk metrics."""
+    """Run a strategy and return extended risk metrics.
+
+    ``data`` may be a preloaded DataFrame or a DataProvider; pass the
+    ``stats`` of an earlier run to skip the backtest. ``rolling_windows``
+    adds a ``"rolling"`` summary per window (see ``summarize_rolling``).
+    """
     if strategy_name not in STRATEGIES:
         raise ValueError(f"Unknown strategy: {strategy_name}")
 
-    data = fetch_data(symbol, start, end)
-    strategy_cls = STRATEGIES[strategy_name]
-    bt = Backtest(data, strategy_cls, cash=cash, commission=commission, exclusive_orders=True)
-    stats = bt.run()
+    stats = _strategy_stats(strategy_name, stats, data, symbol, start, end, interval, cash, commission, engine)
 
     equity = stats["_equity_curve"]["Equity"]
     metrics = compute_risk_metrics(equity)
@@ -203,5 +711,7 @@ def run_risk_analysis(
     metrics["symbol"] = symbol
     metrics["num_trades"] = int(stats["# Trades"])
     metrics["sharpe_ratio"] = round(float(stats["Sharpe Ratio"]), 3) if not pd.isna(stats["Sharpe Ratio"]) else 0.0
+    if rolling_windows:
+        metrics["rolling"] = summarize_rolling(rolling_risk_metrics(equity, rolling_windows), rolling_windows)
 
     return metrics
@@ -0,0 +1,152 @@
+"""Search strategies over an optimizer grid: which combinations to evaluate, within a budget.
+
+Combinations are addressed by their sequence number in the grid's
+``itertools.product`` order, so every strategy shares the optimizer's
+evaluation path (result store, journal, top-K, events) and result schema:
+
+    grid     Every combination.
+    random   ``budget`` distinct combinations drawn uniformly (seeded).
+    halving  Successive halving: ``budget`` random candidates are scored on
+             growing prefixes of the training bars; after each rung only
+             the best ``1/eta`` go on, and the survivors are evaluated on the
+             full train/test split.
+    bayes    Bayesian optimization: a Gaussian process over the normalized
+             parameter positions, fitted to the scores so far, picks the
+             next batch by expected improvement until ``budget`` runs.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+SEARCHES = ("grid", "random", "halving", "bayes")
+
+# Successive halving: keep 1/eta per rung; the shortest prefix has at least this many bars.
+HALVING_ETA = 3
+HALVING_MIN_BARS = 100
+
+# Bayesian optimization: random starting points, candidate pool per round and GP settings.
+BAYES_INITIAL = 5
+BAYES_CANDIDATES = 2000
+_LENGTH_SCALE = 0.25
+_NOISE = 1e-4
+
+
+# === Grid addressing ===
+
+
+def grid_size(grid: dict[str, list[Any]]) -> int:
+    return math.prod(len(v) for v in grid.values())
+
+
+def grid_positions(grid: dict[str, list[Any]], seq: int) -> list[int]:
+    """Index into each parameter's value list of combination ``seq`` (the last parameter varies fastest)."""
+    positions = []
+    for values in reversed(list(grid.values())):
+        seq, position = divmod(seq, len(values))
+        positions.append(position)
+    return positions[::-1]
+
+
+def grid_combo(grid: dict[str, list[Any]], seq: int) -> dict[str, Any]:
+    """Parameters of combination ``seq``, without enumerating the ones before it."""
+    return {
+        name: values[position] for (name, values), position in zip(grid.items(), grid_positions(grid, seq), strict=True)
+    }
+
+
+# === Strategies ===
+
+
+def random_sample(n_combos: int, k: int, seed: int = 42) -> list[int]:
+    """``min(k, n_combos)`` distinct sequence numbers, sorted; never materializes the grid."""
+    return sorted(random.Random(seed).sample(range(n_combos), min(k, n_combos)))
+
+
+def halving_rungs(
+    n_candidates: int, train_bars: int, eta: int = HALVING_ETA, min_bars: int = HALVING_MIN_BARS
+) -> list[tuple[int, int]]:
+    """``(bars, candidates)`` per rung, shortest prefix first; the last rung uses every training bar.
+
+    Rungs are added while at least one candidate survives and the shortest
+    prefix keeps ``min_bars`` bars.
+    """
+    n_rungs = 1
+    while n_candidates // eta**n_rungs >= 1 and train_bars // eta**n_rungs >= min_bars:
+        n_rungs += 1
+    return [(train_bars // eta ** (n_rungs - 1 - k), max(1, -(-n_candidates // eta**k))) for k in range(n_rungs)]
+
+
+def survivors(scores: dict[int, float], keep: int) -> list[int]:
+    """The ``keep`` best sequence numbers (ties in grid order), sorted."""
+    return sorted(sorted(scores, key=lambda seq: (-scores[seq], seq))[:keep])
+
+
+def _coordinates(grid: dict[str, list[Any]], seqs: Sequence[int]) -> np.ndarray:
+    """Parameter positions scaled to [0, 1] per dimension, one row per combination."""
+    scale = np.array([max(len(v) - 1, 1) for v in grid.values()], dtype=float)
+    positions = np.array([grid_positions(grid, seq) for seq in seqs], dtype=float).reshape(len(seqs), len(grid))
+    coordinates: np.ndarray = positions / scale
+    return coordinates
+
+
+def _rbf(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    d2 = ((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2)
+    kernel: np.ndarray = np.exp(-0.5 * d2 / _LENGTH_SCALE**2)
+    return kernel
+
+
+def expected_improvement(observed: np.ndarray, scores: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """EI of each candidate row under a GP (RBF kernel) fitted to standardized ``scores`` at ``observed``."""
+    from scipy.linalg import cho_factor, cho_solve
+    from scipy.stats import norm
+
+    spread = scores.std()
+    y = (scores - scores.mean()) / (spread if spread > 0 else 1.0)
+    factor = cho_factor(_rbf(observed, observed) + _NOISE * np.eye(len(observed)))
+    cross = _rbf(candidates, observed)
+    mean = cross @ cho_solve(factor, y)
+    var = np.clip(1.0 - np.einsum("ij,ji->i", cross, cho_solve(factor, cross.T)), 1e-12, None)
+    sd = np.sqrt(var)
+    z = (mean - y.max()) / sd
+    ei: np.ndarray = (mean - y.max()) * norm.cdf(z) + sd * norm.pdf(z)
+    return ei
+
+
+def bayes_suggest(
+    grid: dict[str, list[Any]],
+    scores: dict[int, float],
+    batch: int,
+    seed: int = 42,
+    feasible: Sequence[int] | None = None,
+) -> list[int]:
+    """The next ``batch`` unevaluated combinations by expected improvement, sorted.
+
+    ``scores`` maps evaluated sequence numbers to higher-is-better scores
+    (failed or NaN runs count as the worst score seen). Candidates are every
+    other combination (of ``feasible`` when given), or a seeded random pool of
+    BAYES_CANDIDATES on large grids.
+    """
+    space: Sequence[int] = range(grid_size(grid)) if feasible is None else feasible
+    rng = random.Random(seed + len(scores))
+    if len(space) - len(scores) <= BAYES_CANDIDATES:
+        pool = [seq for seq in space if seq not in scores]
+    else:
+        pool = sorted({seq for seq in rng.sample(space, BAYES_CANDIDATES) if seq not in scores})
+    if len(pool) <= batch:
+        return sorted(pool)
+
+    seqs = sorted(scores)
+    values = np.array([scores[seq] for seq in seqs], dtype=float)
+    finite = np.isfinite(values)
+    values[~finite] = values[finite].min() if finite.any() else 0.0
+    ei = expected_improvement(_coordinates(grid, seqs), values, _coordinates(grid, pool))
+    best = np.argsort(-ei, kind="stable")[:batch]
+    return sorted(pool[i] for i in best)
@@ -0,0 +1,362 @@
+"""Statistical significance of backtest results.
+
+Single-run tests — Sharpe ratio t-test, paired t-test against buy & hold,
+trade return t-test and binomial win-rate test — in batch form over a
+(candidates × bars) return matrix, a stationary-bootstrap confidence
+interval for the Sharpe ratio, and White's Reality Check / Hansen's SPA
+test for data snooping across a whole parameter grid; and the probability
+of backtest overfitting (combinatorially symmetric cross-validation) and
+Deflated Sharpe Ratio of a grid's best combination.
+
+Every bootstrap statistic shares one resample: a (resamples × bars) matrix
+counting how often each bar appears in each stationary-bootstrap draw, so
+the resampled means of all candidates are a single matrix product instead
+of one resample per candidate. Cross-validation likewise reduces each
+combination to per-partition sums once and scores every split of the
+partitions with one matrix product.
+"""
+
+from __future__ import annotations
+
+from itertools import combinations
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from scipy import stats as sps
+
+from .risk import _ANN, _resample_indices
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_RESAMPLES = 1000
+# Mean block length (bars) of the stationary bootstrap
+DEFAULT_BLOCK_SIZE = 10
+# Time partitions for CSCV; C(16, 8) = 12,870 train/test splits
+DEFAULT_PARTITIONS = 16
+_EULER_GAMMA = 0.5772156649015329
+
+
+def bar_returns(equity: np.ndarray) -> np.ndarray:
+    """Simple returns along the last axis of one or many equity curves."""
+    equity = np.asarray(equity, dtype=float)
+    returns: np.ndarray = equity[..., 1:] / equity[..., :-1] - 1.0
+    return returns
+
+
+def _one_sided_t(x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """t statistic of mean > 0 for each row, with its one-sided p-value."""
+    n = x.shape[1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = x.mean(axis=1) / (x.std(axis=1, ddof=1) / np.sqrt(n))
+    return t, sps.t.sf(t, n - 1)
+
+
+# === Classical tests ===
+
+
+def sharpe_ttest(returns: np.ndarray) -> dict[str, np.ndarray]:
+    """Annualized Sharpe ratio and t-test of mean bar return > 0, per row of (candidates × bars)."""
+    returns = np.atleast_2d(returns)
+    t, p = _one_sided_t(returns)
+    return {"sharpe": t / np.sqrt(returns.shape[1]) * np.sqrt(_ANN), "t_stat": t, "p_value": p}
+
+
+def paired_ttest(returns: np.ndarray, benchmark: np.ndarray) -> dict[str, np.ndarray]:
+    """Paired t-test of bar returns > the benchmark's (e.g. buy & hold) on the same bars, per row."""
+    excess = np.atleast_2d(returns) - np.asarray(benchmark, dtype=float)
+    t, p = _one_sided_t(excess)
+    return {"mean_excess_pct": excess.mean(axis=1) * _ANN * 100, "t_stat": t, "p_value": p}
+
+
+def trade_ttest(trade_returns: np.ndarray) -> dict[str, float]:
+    """t-test of mean trade return > 0 (trade counts differ per run, so one run at a time)."""
+    trade_returns = np.asarray(trade_returns, dtype=float)
+    if len(trade_returns) < 2:
+        return {
+            "mean_trade_pct": float(trade_returns.mean() * 100) if len(trade_returns) else 0.0,
+            "t_stat": 0.0,
+            "p_value": 1.0,
+        }
+    t, p = _one_sided_t(trade_returns[None, :])
+    return {"mean_trade_pct": float(trade_returns.mean() * 100), "t_stat": float(t[0]), "p_value": float(p[0])}
+
+
+def win_rate_test(wins: np.ndarray | int, n_trades: np.ndarray | int) -> np.ndarray:
+    """Binomial p-value of at least ``wins`` winners in ``n_trades`` if each trade were a coin flip."""
+    p: np.ndarray = sps.binom.sf(np.asarray(wins) - 1, n_trades, 0.5)
+    return p
+
+
+# === Shared stationary bootstrap ===
+
+
+def bootstrap_counts(
+    n_bars: int, n_resamples: int = DEFAULT_RESAMPLES, block_size: int = DEFAULT_BLOCK_SIZE, seed: int | None = 42
+) -> np.ndarray:
+    """(resamples × bars) count of each bar in each stationary-bootstrap resample of the bar sequence."""
+    rng = np.random.default_rng(seed)
+    idx = _resample_indices(rng, n_resamples, n_bars, block_size, "stationary")
+    idx += np.arange(n_resamples)[:, None] * n_bars
+    counts: np.ndarray = np.bincount(idx.ravel(), minlength=n_resamples * n_bars).reshape(n_resamples, n_bars)
+    return counts.astype(float)
+
+
+def _resampled_means(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """(resamples × candidates) mean of every candidate's bar values in every resample."""
+    means: np.ndarray = counts @ values.T / values.shape[1]
+    return means
+
+
+def sharpe_confidence_interval(returns: np.ndarray, counts: np.ndarray, level: float = 0.95) -> dict[str, np.ndarray]:
+    """Percentile bootstrap interval of each row's annualized Sharpe ratio, from shared resample counts."""
+    returns = np.atleast_2d(returns)
+    n = returns.shape[1]
+    mean = _resampled_means(returns, counts)
+    mean_sq = _resampled_means(returns * returns, counts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = mean / np.sqrt(np.maximum(mean_sq - mean * mean, 0.0) * n / (n - 1)) * np.sqrt(_ANN)
+    tail = (1 - level) / 2 * 100
+    low, high = np.nanpercentile(sharpe, [tail, 100 - tail], axis=0)
+    return {"low": low, "high": high}
+
+
+def reality_check(returns: np.ndarray, counts: np.ndarray, benchmark: np.ndarray | None = None) -> dict[str, Any]:
+    """White's Reality Check and Hansen's SPA p-values for the best of many candidates.
+
+    Null hypothesis: no candidate beats the benchmark (cash when None) in mean
+    bar return. Reality Check compares the best candidate's scaled mean
+    excess return with the bootstrap distribution of the maximum recentred
+    mean; SPA studentizes each candidate and recentres only those not
+    clearly worse than the benchmark, which keeps useless candidates from
+    diluting the test. Both reuse ``counts``.
+    """
+    excess = np.atleast_2d(returns) if benchmark is None else np.atleast_2d(returns) - benchmark
+    n = excess.shape[1]
+    mean = excess.mean(axis=1)
+    boot = np.sqrt(n) * (_resampled_means(excess, counts) - mean)
+
+    statistic = np.sqrt(n) * mean.max()
+    rc_p = float((boot.max(axis=1) >= statistic).mean())
+
+    omega = boot.std(axis=0)
+    omega = np.where(omega > 0, omega, np.inf)
+    t_spa = max(float((np.sqrt(n) * mean / omega).max()), 0.0)
+    keep = np.sqrt(n) * mean / omega >= -np.sqrt(2 * np.log(np.log(max(n, 3))))
+    recentred = (boot + np.sqrt(n) * (mean - np.where(keep, mean, 0.0))) / omega
+    spa_p = float((np.maximum(recentred.max(axis=1), 0.0) >= t_spa).mean())
+    return {"best": int(mean.argmax()), "statistic": float(statistic), "rc_p_value": rc_p, "spa_p_value": spa_p}
+
+
+# === Overfitting across the grid ===
+
+
+def _sharpe_from_sums(n: np.ndarray, total: np.ndarray, total_sq: np.ndarray) -> np.ndarray:
+    """Per-bar Sharpe ratio from bar count, sum and sum of squares; 0 without variation."""
+    var = np.maximum(total_sq - total * total / n, 0.0) / (n - 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = total / n / np.sqrt(var)
+    out: np.ndarray = np.where(var > 0, sharpe, 0.0)
+    return out
+
+
+def cscv(returns: np.ndarray, n_partitions: int = DEFAULT_PARTITIONS) -> dict[str, Any]:
+    """Probability of backtest overfitting by combinatorially symmetric cross-validation.
+
+    The bars of the (combinations × bars) ``returns`` matrix are cut into
+    ``n_partitions`` contiguous blocks. Every choice of half the blocks is an
+    in-sample set, the other half out-of-sample; the combination with the
+    best in-sample Sharpe is located in the out-of-sample ranking, and PBO is
+    the share of splits where it lands in the bottom half (logit ≤ 0).
+
+    Each combination is reduced to per-block bar count, sum and sum of
+    squares once; the in-sample moments of all splits are then one
+    (splits × blocks) @ (blocks × combinations) product, and out-of-sample
+    moments are the totals minus in-sample.
+    """
+    returns = np.atleast_2d(returns)
+    k, n_bars = returns.shape
+    if n_partitions < 2 or n_partitions % 2:
+        raise ValueError(f"n_partitions must be an even number >= 2, got {n_partitions}")
+    if k < 2:
+        raise ValueError("CSCV needs at least 2 combinations")
+    if n_bars < 2 * n_partitions:
+        raise ValueError(f"{n_bars} bars are too few for {n_partitions} partitions")
+
+    bounds = np.linspace(0, n_bars, n_partitions + 1).astype(int)
+    counts = np.diff(bounds).astype(float)
+    sums = np.add.reduceat(returns, bounds[:-1], axis=1).T  # (blocks × combinations)
+    sums_sq = np.add.reduceat(returns * returns, bounds[:-1], axis=1).T
+
+    splits = np.array(list(combinations(range(n_partitions), n_partitions // 2)))
+    member = np.zeros((len(splits), n_partitions))
+    member[np.arange(len(splits))[:, None], splits] = 1.0
+
+    is_n = member @ counts
+    is_sharpe = _sharpe_from_sums(is_n[:, None], member @ sums, member @ sums_sq)
+    oos_n = n_bars - is_n
+    oos_sharpe = _sharpe_from_sums(
+        oos_n[:, None], sums.sum(axis=0) - member @ sums, sums_sq.sum(axis=0) - member @ sums_sq
+    )
+
+    best = is_sharpe.argmax(axis=1)
+    chosen_oos = oos_sharpe[np.arange(len(splits)), best]
+    rank = (oos_sharpe < chosen_oos[:, None]).sum(axis=1) + 1
+    omega = rank / (k + 1)
+    logits = np.log(omega / (1 - omega))
+    return {
+        "pbo": float((logits <= 0).mean()),
+        "logits": logits,
+        "n_splits": len(splits),
+        "prob_oos_loss": float((chosen_oos < 0).mean()),
+        "is_sharpe": is_sharpe[np.arange(len(splits)), best] * np.sqrt(_ANN),
+        "oos_sharpe": chosen_oos * np.sqrt(_ANN),
+    }
+
+
+def deflated_sharpe(returns: np.ndarray) -> dict[str, Any]:
+    """Deflated Sharpe Ratio of the best row of a (combinations × bars) return matrix.
+
+    The best observed Sharpe is compared with the maximum expected from
+    that many trials of zero true skill, given the spread of Sharpe ratios
+    across the grid, and adjusted for the winner's skewness and kurtosis
+    (Bailey & López de Prado, 2014). Returns the probability that its true
+    Sharpe exceeds that benchmark.
+    """
+    returns = np.atleast_2d(returns)
+    k, n = returns.shape
+    sharpe = _sharpe_from_sums(np.full(k, float(n)), returns.sum(axis=1), (returns * returns).sum(axis=1))
+    best = int(sharpe.argmax())
+    sr = sharpe[best]
+    expected_max = 0.0
+    if k > 1:
+        expected_max = float(
+            np.sqrt(sharpe.var(ddof=1))
+            * ((1 - _EULER_GAMMA) * sps.norm.ppf(1 - 1 / k) + _EULER_GAMMA * sps.norm.ppf(1 - 1 / (k * np.e)))
+        )
+    x = returns[best]
+    skew = float(sps.skew(x)) if x.std() > 0 else 0.0
+    kurt = float(sps.kurtosis(x, fisher=False)) if x.std() > 0 else 3.0
+    denom = np.sqrt(max(1 - skew * sr + (kurt - 1) / 4 * sr * sr, 1e-12))
+    return {
+        "best": best,
+        "sharpe": float(sr * np.sqrt(_ANN)),
+        "expected_max_sharpe": float(expected_max * np.sqrt(_ANN)),
+        "deflated_sharpe": float(sps.norm.cdf((sr - expected_max) * np.sqrt(n - 1) / denom)),
+        "n_trials": k,
+    }
+
+
+def grid_returns(results: list[dict]) -> np.ndarray:
+    """(combinations × bars) bar returns over all bars of ``optimize_strategy(keep_equity=True)`` results.
+
+    With a train/test split the train and test returns are joined, so
+    cross-validation sees the whole period.
+    """
+    if not results or "_equity" not in results[0]:
+        raise ValueError("the grid tests need optimize_strategy(..., keep_equity=True) results")
+    rows = [
+        np.concatenate([bar_returns(r["_is_equity"]), bar_returns(r["_equity"])])
+        if "_is_equity" in r
+        else bar_returns(r["_equity"])
+        for r in results
+    ]
+    return np.vstack(rows)
+
+
+def overfitting_report(results: list[dict], n_partitions: int = DEFAULT_PARTITIONS) -> dict:
+    """PBO (CSCV) and Deflated Sharpe of the grid behind ``optimize_strategy(keep_equity=True)`` results."""
+    returns = grid_returns(results)
+    pbo = cscv(returns, n_partitions)
+    dsr = deflated_sharpe(returns)
+    return {
+        "pbo": round(pbo["pbo"], 4),
+        "prob_oos_loss": round(pbo["prob_oos_loss"], 4),
+        "median_logit": round(float(np.median(pbo["logits"])), 3),
+        "n_splits": pbo["n_splits"],
+        "n_partitions": n_partitions,
+        "best_params": results[dsr["best"]]["params"],
+        "best_sharpe": round(dsr["sharpe"], 3),
+        "expected_max_sharpe": round(dsr["expected_max_sharpe"], 3),
+        "deflated_sharpe": round(dsr["deflated_sharpe"], 4),
+        "n_trials": dsr["n_trials"],
+    }
+
+
+# === Reports ===
+
+
+def run_significance(
+    stats: Any,
+    close: pd.Series,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    seed: int | None = 42,
+) -> dict:
+    """All single-run tests for one backtest's stats; ``close`` gives the buy & hold benchmark."""
+    equity = stats["_equity_curve"]["Equity"].to_numpy(dtype=float)
+    returns = bar_returns(equity)[None, :]
+    benchmark = bar_returns(close.to_numpy(dtype=float))
+    trades = stats["_trades"]["ReturnPct"].to_numpy(dtype=float)  # a fraction per trade, despite the name
+    wins = int((trades > 0).sum())
+
+    sharpe = sharpe_ttest(returns)
+    paired = paired_ttest(returns, benchmark)
+    ci = sharpe_confidence_interval(returns, bootstrap_counts(returns.shape[1], n_resamples, block_size, seed))
+    trade = trade_ttest(trades)
+    return {
+        "sharpe": round(float(sharpe["sharpe"][0]), 3),
+        "sharpe_t_stat": round(float(sharpe["t_stat"][0]), 3),
+        "sharpe_p_value": round(float(sharpe["p_value"][0]), 4),
+        "sharpe_ci_low": round(float(ci["low"][0]), 3),
+        "sharpe_ci_high": round(float(ci["high"][0]), 3),
+        "excess_vs_bh_pct": round(float(paired["mean_excess_pct"][0]), 2),
+        "paired_t_stat": round(float(paired["t_stat"][0]), 3),
+        "paired_p_value": round(float(paired["p_value"][0]), 4),
+        "mean_trade_pct": round(trade["mean_trade_pct"], 2),
+        "trade_t_stat": round(trade["t_stat"], 3),
+        "trade_p_value": round(trade["p_value"], 4),
+        "num_trades": len(trades),
+        "wins": wins,
+        "win_rate_p_value": round(float(win_rate_test(wins, len(trades))), 4) if len(trades) else 1.0,
+    }
+
+
+def grid_significance(
+    results: list[dict],
+    benchmark: np.ndarray | None = None,
+    n_resamples: int = DEFAULT_RESAMPLES,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    seed: int | None = 42,
+) -> dict:
+    """Per-combination tests and a grid-wide data-snooping check for ``optimize_strategy(keep_equity=True)``.
+
+    ``benchmark`` holds bar returns on the same bars (e.g. buy & hold); the
+    Reality Check and SPA compare against it, or against cash when None.
+    One set of bootstrap counts serves the Sharpe intervals of every
+    combination and both snooping tests.
+    """
+    if not results or "_equity" not in results[0]:
+        raise ValueError("grid_significance needs optimize_strategy(..., keep_equity=True) results")
+    returns = bar_returns(np.vstack([r["_equity"] for r in results]))
+    counts = bootstrap_counts(returns.shape[1], n_resamples, block_size, seed)
+
+    sharpe = sharpe_ttest(returns)
+    ci = sharpe_confidence_interval(returns, counts)
+    paired = paired_ttest(returns, benchmark) if benchmark is not None else None
+    candidates = []
+    for k, result in enumerate(results):
+        row = {
+            "params": result["params"],
+            "sharpe": round(float(sharpe["sharpe"][k]), 3),
+            "sharpe_p_value": round(float(sharpe["p_value"][k]), 4),
+            "sharpe_ci_low": round(float(ci["low"][k]), 3),
+            "sharpe_ci_high": round(float(ci["high"][k]), 3),
+        }
+        if paired is not None:
+            row["paired_p_value"] = round(float(paired["p_value"][k]), 4)
+        candidates.append(row)
+
+    check = reality_check(returns, counts, benchmark)
+    check["best_params"] = results[check["best"]]["params"]
+    return {"candidates": candidates, "reality_check": check, "n_resamples": n_resamples, "block_size": block_size}
@@ -0,0 +1,197 @@
+"""Parameter spaces for the optimizer, declared in the YAML strategy definitions.
+
+A definition's ``strategy_params`` lists each parameter's values and its
+``constraints`` rule out combinations::
+
+    strategy_params:
+      fast: {min: 4, max: 20, step: 2}
+      slow: {min: 10, max: 60, step: 5}
+      signal_length: [6, 9, 12]
+      mult: {min: 0.5, max: 8, num: 5, log: true}
+    constraints:
+      - fast < slow
+      - slow - fast >= 4
+
+A constraint is an arithmetic comparison over parameter names, combined with
+``and``, ``or`` and ``not``; nothing else (calls, attributes, subscripts) is
+accepted. Powers take a numeric literal exponent of at most MAX_EXPONENT and a
+base without further powers, so no constraint can build an unbounded integer.
+Constraints are evaluated over the whole grid at once with NumPy broadcasting,
+so infeasible combinations are pruned before any backtest runs and never reach
+the result store, journal or search budget.
+"""
+
+from __future__ import annotations
+
+import ast
+import functools
+import operator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .search import grid_size
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping, Sequence
+
+    from .models import StrategyDefinition
+
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_COMPARE = {
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+}
+MAX_EXPONENT = 8
+_UNARY: dict[type[ast.unaryop], Callable[[Any], Any]] = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: np.logical_not,
+}
+
+
+# === Constraints ===
+
+
+def _parse(expression: str) -> ast.expr:
+    try:
+        return ast.parse(expression, mode="eval").body
+    except SyntaxError as e:
+        raise ValueError(f"Invalid constraint {expression!r}: {e.msg}") from None
+
+
+def check_constraint(expression: str, params: Mapping[str, Any]) -> None:
+    """Raise ValueError unless ``expression`` only uses the supported syntax and names in ``params``."""
+    for node in ast.walk(_parse(expression)):
+        if isinstance(node, ast.Name):
+            if node.id not in params:
+                raise ValueError(f"Constraint {expression!r} uses unknown parameter {node.id!r}")
+        elif isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, int | float | str):
+                raise ValueError(f"Constraint {expression!r}: unsupported constant {node.value!r}")
+        elif isinstance(node, ast.BinOp | ast.UnaryOp | ast.Compare | ast.BoolOp):
+            op = getattr(node, "op", None)
+            ops = node.ops if isinstance(node, ast.Compare) else [] if op is None else [op]
+            if any(type(o) not in (*_BINARY, *_COMPARE, *_UNARY, ast.And, ast.Or) for o in ops):
+                raise ValueError(f"Constraint {expression!r}: unsupported operator {type(ops[0]).__name__}")
+            if isinstance(node, ast.BinOp) and isinstance(op, ast.Pow):
+                _check_power(expression, node)
+        elif not isinstance(node, ast.Load | ast.operator | ast.unaryop | ast.cmpop | ast.boolop):
+            raise ValueError(f"Constraint {expression!r}: unsupported syntax {type(node).__name__}")
+
+
+def _check_power(expression: str, node: ast.BinOp) -> None:
+    exponent = node.right
+    if (
+        not isinstance(exponent, ast.Constant)
+        or isinstance(exponent.value, bool)
+        or not isinstance(exponent.value, int | float)
+        or abs(exponent.value) > MAX_EXPONENT
+    ):
+        raise ValueError(f"Constraint {expression!r}: an exponent must be a number of at most {MAX_EXPONENT}")
+    if any(isinstance(inner, ast.BinOp) and isinstance(inner.op, ast.Pow) for inner in ast.walk(node.left)):
+        raise ValueError(f"Constraint {expression!r}: powers cannot be nested")
+
+
+def _evaluate(node: ast.expr, names: Mapping[str, np.ndarray]) -> Any:
+    if isinstance(node, ast.Name):
+        return names[node.id]
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.BinOp):
+        return _BINARY[type(node.op)](_evaluate(node.left, names), _evaluate(node.right, names))
+    if isinstance(node, ast.UnaryOp):
+        return _UNARY[type(node.op)](_evaluate(node.operand, names))
+    if isinstance(node, ast.BoolOp):
+        combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+        return functools.reduce(combine, [_evaluate(v, names) for v in node.values])
+    if isinstance(node, ast.Compare):
+        # a < b < c means a < b and b < c
+        left = _evaluate(node.left, names)
+        result: Any = True
+        for op, comparator in zip(node.ops, node.comparators, strict=True):
+            right = _evaluate(comparator, names)
+            result = np.logical_and(result, _COMPARE[type(op)](left, right))
+            left = right
+        return result
+    raise ValueError(f"unsupported syntax {type(node).__name__}")
+
+
+def feasible_mask(grid: dict[str, list[Any]], constraints: Sequence[str]) -> np.ndarray:
+    """Boolean per combination, in the grid's ``itertools.product`` order: True where every constraint holds."""
+    shape = tuple(len(values) for values in grid.values())
+    # Each parameter varies along its own axis, so an expression broadcasts over the whole grid.
+    names = {
+        name: np.asarray(values).reshape([-1 if axis == k else 1 for axis in range(len(shape))])
+        for k, (name, values) in enumerate(grid.items())
+    }
+    mask = np.ones(shape, dtype=bool)
+    for expression in constraints:
+        check_constraint(expression, grid)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mask &= np.asarray(_evaluate(_parse(expression), names), dtype=bool)
+    flat: np.ndarray = mask.ravel()
+    return flat
+
+
+def feasible_seqs(grid: dict[str, list[Any]], constraints: Sequence[str] | None) -> list[int] | None:
+    """Sequence numbers of the combinations meeting ``constraints`` (None when there are none)."""
+    if not constraints:
+        return None
+    return [int(seq) for seq in np.flatnonzero(feasible_mask(grid, constraints))]
+
+
+def prune_report(grid: dict[str, list[Any]], constraints: Sequence[str] | None) -> dict[str, int]:
+    """Combinations in the grid, feasible ones and the backtests pruning saves."""
+    n_combos = grid_size(grid)
+    feasible = feasible_seqs(grid, constraints)
+    n_feasible = n_combos if feasible is None else len(feasible)
+    return {"combinations": n_combos, "feasible": n_feasible, "pruned": n_combos - n_feasible}
+
+
+# === Definitions ===
+
+
+def parameter_space(definition: StrategyDefinition) -> tuple[dict[str, list[Any]], list[str]]:
+    """The optimizer grid and constraints of a definition; a scalar parameter becomes a single value."""
+    from .models import ParamRange
+
+    grid: dict[str, list[Any]] = {}
+    for name, spec in definition.strategy_params.items():
+        if isinstance(spec, ParamRange):
+            grid[name] = spec.expand()
+        elif isinstance(spec, list):
+            grid[name] = list(spec)
+        else:
+            grid[name] = [spec]
+    return grid, list(definition.constraints)
+
+
+def load_space(path: Path | str) -> tuple[dict[str, list[Any]], list[str]]:
+    """Read a YAML strategy definition and return its parameter_space()."""
+    import yaml
+    from pydantic import ValidationError
+
+    from .models import StrategyDefinition
+
+    try:
+        definition = StrategyDefinition(**yaml.safe_load(Path(path).read_text()))
+    except ValidationError as e:
+        raise ValueError(f"Invalid definition {path}: {e}") from None
+    grid, constraints = parameter_space(definition)
+    if not grid:
+        raise ValueError(f"{path} declares no strategy_params to optimize")
+    return grid, constraints
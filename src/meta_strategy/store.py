@@ -0,0 +1,343 @@
+"""Persistent result store: backtest and grid-search results keyed by a run fingerprint.
+
+Every stored row is one evaluated run — a ``run_backtest`` call or one
+combination of an ``optimize_strategy`` grid — keyed by a SHA-256
+fingerprint of everything that determines its result: the strategy class
+(qualified name, default parameters and source), the parameters, a hash of
+the OHLCV bars, cash, commission, interval, symbol, engine, the package
+version, the source of the indicator, kernel and engine modules
+(``ENGINE_MODULES``) with the backtesting.py version, and the run-specific
+settings (train/test split, extra metrics). Changing any of them yields a
+new fingerprint, so a stale row is simply never looked up again. Code outside
+those modules that a strategy calls is not hashed; ``results clear`` drops
+the rows after such a change.
+
+Rows live in a SQLite database (``<cache_dir>/results.sqlite``). The full
+result is stored as JSON next to indexed columns for the common metrics, so
+``query()`` can answer questions such as "best Sharpe per strategy per
+symbol" without recomputing anything.
+
+The store is off by default for library calls; the CLI turns it on unless
+``--no-store`` is given (``configure_result_store``).
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
+
+from .data import cache_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from backtesting import Strategy
+
+STORE_FILE = "results.sqlite"
+SCHEMA_VERSION = 1
+
+# Modules whose code shapes a result besides the strategy class: indicators, batched kernels, engines.
+ENGINE_MODULES = ("meta_strategy.backtest", "meta_strategy.batch", "meta_strategy.fast")
+
+# Indexed metric columns; every other result key stays in the JSON blob.
+METRIC_COLUMNS = ("return_pct", "sharpe_ratio", "max_drawdown_pct", "win_rate_pct", "num_trades")
+GROUP_COLUMNS = ("kind", "strategy", "symbol", "interval")
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS results (
+    fingerprint TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    params TEXT NOT NULL,
+    cash REAL NOT NULL,
+    commission REAL NOT NULL,
+    data_hash TEXT NOT NULL,
+    version TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    return_pct REAL,
+    sharpe_ratio REAL,
+    max_drawdown_pct REAL,
+    win_rate_pct REAL,
+    num_trades INTEGER,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_strategy_symbol ON results (strategy, symbol, interval);
+CREATE INDEX IF NOT EXISTS idx_results_kind ON results (kind);
+CREATE INDEX IF NOT EXISTS idx_results_sharpe ON results (sharpe_ratio);
+CREATE INDEX IF NOT EXISTS idx_results_return ON results (return_pct);
+PRAGMA user_version = {SCHEMA_VERSION};
+"""
+
+
+# === Settings ===
+
+
+@dataclass
+class StoreSettings:
+    """Process-wide result store behaviour, set once per CLI invocation."""
+
+    enabled: bool = False
+    path: Path | None = None
+
+
+STORE_SETTINGS = StoreSettings()
+
+
+def configure_result_store(enabled: bool = True, path: Path | str | None = None) -> None:
+    """Turn the result store on or off for optimize_strategy() and run_backtest().
+
+    Args:
+        enabled: Serve repeated runs from the store and record new ones.
+        path: SQLite file (default: ``<cache_dir>/results.sqlite``).
+    """
+    STORE_SETTINGS.enabled = enabled
+    STORE_SETTINGS.path = Path(path) if path is not None else None
+
+
+def store_path() -> Path:
+    """Resolve the SQLite file of the result store."""
+    return STORE_SETTINGS.path if STORE_SETTINGS.path is not None else cache_dir() / STORE_FILE
+
+
+def active_store() -> ResultStore | None:
+    """The configured store, or None when it is disabled."""
+    return ResultStore(store_path()) if STORE_SETTINGS.enabled else None
+
+
+# === Fingerprints ===
+
+
+def package_version(distribution: str = "meta-strategy") -> str:
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version(distribution)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def source_hash(modules: Iterable[str]) -> str:
+    """SHA-256 of the source files of ``modules``, read without importing them."""
+    from importlib.util import find_spec
+
+    digest = hashlib.sha256()
+    for name in modules:
+        spec = find_spec(name)
+        digest.update(name.encode())
+        if spec is not None and spec.origin is not None and Path(spec.origin).is_file():
+            digest.update(Path(spec.origin).read_bytes())
+    return digest.hexdigest()
+
+
+@functools.cache
+def engine_identity() -> str:
+    """Hash of the ENGINE_MODULES sources and the backtesting.py version, once per process."""
+    return hashlib.sha256(f"{source_hash(ENGINE_MODULES)}:{package_version('backtesting')}".encode()).hexdigest()
+
+
+def data_hash(data: pd.DataFrame) -> str:
+    """blake2b digest of the bars: column names plus pandas' per-row hash of index and values."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([str(c) for c in data.columns]).encode())
+    digest.update(np.ascontiguousarray(pd.util.hash_pandas_object(data, index=True).to_numpy()).data)
+    return digest.hexdigest()
+
+
+def strategy_identity(strategy_cls: type[Strategy]) -> dict[str, Any]:
+    """Qualified name, default parameters and a hash of the source of a strategy class."""
+    defaults = {
+        name: value
+        for name, value in vars(strategy_cls).items()
+        if not name.startswith("_") and isinstance(value, int | float | str | bool)
+    }
+    try:
+        source = hashlib.sha256(inspect.getsource(strategy_cls).encode()).hexdigest()
+    except (OSError, TypeError):
+        source = None
+    return {"class": f"{strategy_cls.__module__}.{strategy_cls.__qualname__}", "defaults": defaults, "source": source}
+
+
+def fingerprint_base(
+    kind: str,
+    strategy_cls: type[Strategy],
+    bars_hash: str,
+    cash: float,
+    commission: float,
+    interval: str,
+    symbol: str,
+    engine: str,
+    **settings: Any,
+) -> dict[str, Any]:
+    """Everything but the parameters that determines a run's result; ``settings`` are run-specific (split, ...).
+
+    Built once per run and completed per combination by run_fingerprint().
+    """
+    return {
+        "kind": kind,
+        "strategy": strategy_identity(strategy_cls),
+        "data": bars_hash,
+        "cash": float(cash),
+        "commission": float(commission),
+        "interval": interval,
+        "symbol": symbol,
+        "engine": engine,
+        "version": package_version(),
+        "engine_source": engine_identity(),
+        "settings": settings,
+    }
+
+
+def run_fingerprint(base: dict[str, Any], params: dict[str, Any]) -> str:
+    """SHA-256 of a fingerprint_base() plus the parameters of one run."""
+    payload = {**base, "params": params}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def store_meta(base: dict[str, Any], params: dict[str, Any], strategy_name: str) -> dict[str, Any]:
+    """The indexed columns of a row, for ResultStore.put_many()."""
+    return {
+        "kind": base["kind"],
+        "strategy": strategy_name,
+        "symbol": base["symbol"],
+        "interval": base["interval"],
+        "params": params,
+        "cash": base["cash"],
+        "commission": base["commission"],
+        "data_hash": base["data"],
+    }
+
+
+# === Store ===
+
+
+class ResultStore:
+    """SQLite table of run results with indexed strategy, symbol and metric columns."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> ResultStore:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def get_many(self, fingerprints: Sequence[str]) -> dict[str, dict[str, Any]]:
+        """Stored results by fingerprint, for those present."""
+        found: dict[str, dict[str, Any]] = {}
+        # Stay under SQLite's host-parameter limit
+        for lo in range(0, len(fingerprints), 500):
+            batch = list(fingerprints[lo : lo + 500])
+            marks = ",".join("?" * len(batch))
+            rows = self._conn.execute(f"SELECT fingerprint, result FROM results WHERE fingerprint IN ({marks})", batch)
+            found.update((fp, json.loads(result)) for fp, result in rows)
+        return found
+
+    def get(self, fingerprint: str) -> dict[str, Any] | None:
+        return self.get_many([fingerprint]).get(fingerprint)
+
+    def put_many(self, rows: Iterable[tuple[str, dict[str, Any], dict[str, Any]]]) -> None:
+        """Insert or replace ``(fingerprint, meta, result)`` rows in one transaction.
+
+        ``meta`` holds kind, strategy, symbol, interval, params, cash,
+        commission and data_hash; keys starting with ``_`` (arrays, stats)
+        are dropped from ``result``.
+        """
+        now = datetime.now(UTC).isoformat(timespec="seconds")
+        version = package_version()
+        records = []
+        for fingerprint, meta, result in rows:
+            result = {k: v for k, v in result.items() if not k.startswith("_")}
+            records.append(
+                (
+                    fingerprint,
+                    meta["kind"],
+                    meta["strategy"],
+                    meta["symbol"],
+                    meta["interval"],
+                    json.dumps(meta["params"], sort_keys=True, default=str),
+                    float(meta["cash"]),
+                    float(meta["commission"]),
+                    meta["data_hash"],
+                    version,
+                    now,
+                    *(result.get(column) for column in METRIC_COLUMNS),
+                    json.dumps(result, default=str),
+                )
+            )
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO results VALUES ({','.join('?' * 17)})",
+                records,
+            )
+
+    def count(self) -> int:
+        return int(self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0])
+
+    def clear(self) -> int:
+        """Delete every row; returns how many there were."""
+        n = self.count()
+        with self._conn:
+            self._conn.execute("DELETE FROM results")
+        return n
+
+    def query(
+        self,
+        metric: str = "sharpe_ratio",
+        best_per: Sequence[str] = ("strategy", "symbol"),
+        ascending: bool = False,
+        limit: int | None = None,
+        **filters: str | None,
+    ) -> list[dict[str, Any]]:
+        """Best stored row by ``metric`` for each ``best_per`` group (every row when empty), best first.
+
+        ``filters`` restrict ``kind``, ``strategy``, ``symbol`` or ``interval``
+        to one value (None = any). Rows whose metric is NULL are skipped.
+        """
+        if metric not in METRIC_COLUMNS:
+            raise ValueError(f"Unknown metric: {metric}. Available: {', '.join(METRIC_COLUMNS)}")
+        for column in (*best_per, *filters):
+            if column not in GROUP_COLUMNS:
+                raise ValueError(f"Unknown column: {column}. Available: {', '.join(GROUP_COLUMNS)}")
+        order = "ASC" if ascending else "DESC"
+        where = [f"{metric} IS NOT NULL"]
+        args: list[Any] = []
+        for column, value in filters.items():
+            if value is not None:
+                where.append(f"{column} = ?")
+                args.append(value)
+        partition = f"PARTITION BY {', '.join(best_per)}" if best_per else ""
+        sql = f"""
+            SELECT kind, strategy, symbol, interval, params, created_at, {", ".join(METRIC_COLUMNS)} FROM (
+                SELECT *, ROW_NUMBER() OVER ({partition} ORDER BY {metric} {order}, created_at) AS rank
+                FROM results WHERE {" AND ".join(where)}
+            ) WHERE {"rank = 1" if best_per else "1"}
+            ORDER BY {metric} {order}
+        """
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        cursor = self._conn.execute(sql, args)
+        columns = [d[0] for d in cursor.description]
+        rows = [dict(zip(columns, row, strict=True)) for row in cursor]
+        for row in rows:
+            row["params"] = json.loads(row["params"])
+        return rows
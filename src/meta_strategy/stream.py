@@ -0,0 +1,458 @@
+"""Incremental indicators and live bar-by-bar strategy signals.
+
+Every indicator here keeps O(1) state per bar and performs the same
+floating-point operations, in the same order, as its batch counterpart in
+``meta_strategy.batch`` / ``meta_strategy.backtest``, so replaying a history
+through a stream reproduces the batch values bit for bit:
+
+- ``RollingWindow`` keeps the running prefix sums of the (at most two)
+  overlapping segments the batch rolling kernels read, plus the last
+  ``length + 1`` prefix values of each;
+- ``EWM`` runs the same ``alpha * x + (1 - alpha) * y`` recurrence as the
+  linear filter;
+- ``SuperTrendState`` is one step of the fused SuperTrend loop.
+
+``SignalStream`` wraps a strategy's indicators with the fast engine's rules
+(warmup, entries only while flat, exits only while long) and reports each
+entry or exit as an event. Like the engines, it works on prices scaled by
+``FRACTIONAL_UNIT``. Bars must be finite: the batch kernels fall back to
+pandas for NaN input, which a stream cannot reproduce.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .batch import _lengths, block_size, ema_alpha
+from .fast import FRACTIONAL_UNIT
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+NAN = math.nan
+
+
+# === Incremental indicators ===
+
+
+class _Segment:
+    """Prefix sums of (x - anchor) and (x - anchor)² from the segment's first bar."""
+
+    def __init__(self, start: int, anchor: float, keep: int) -> None:
+        self.start = start
+        self.anchor = anchor
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.history: deque[tuple[float, float]] = deque([(0.0, 0.0)], maxlen=keep)
+
+    def add(self, value: float) -> None:
+        centred = value - self.anchor
+        self.sum += centred
+        self.sum_sq += centred * centred
+        self.history.append((self.sum, self.sum_sq))
+
+
+class RollingWindow:
+    """Mean and population standard deviation of the last ``length`` values.
+
+    Matches ``rolling_mean_matrix`` / ``rolling_std_matrix``: NaN until the
+    first window is full.
+    """
+
+    def __init__(self, length: int) -> None:
+        (self.length,) = _lengths([length])
+        self.block = block_size(self.length)
+        self.count = 0
+        self._segments: deque[_Segment] = deque()
+        self._last = NAN
+        self._run = 0
+
+    def update(self, value: float) -> tuple[float, float]:
+        """Add one value; returns (mean, std) of the window ending at it."""
+        t = self.count
+        self.count += 1
+        self._run = self._run + 1 if value == self._last else 1
+        self._last = value
+        if t % self.block == 0:
+            self._segments.append(_Segment(t, value, self.length + 1))
+        for segment in self._segments:
+            segment.add(value)
+
+        window = t - self.length + 1
+        if window < 0:
+            return NAN, NAN
+        while self._segments[0].start < window - window % self.block:  # the window's segment starts there
+            self._segments.popleft()
+        if self._run >= self.length:
+            return value, 0.0
+        segment = self._segments[0]
+        # history holds prefix sums up to the window's end and, length steps back, up to its start
+        (sum_now, sq_now), (sum_then, sq_then) = segment.history[-1], segment.history[0]
+        sums, sum_sq = sum_now - sum_then, sq_now - sq_then
+        std = math.sqrt(max(sum_sq - sums * sums / self.length, 0.0) / self.length)
+        return segment.anchor + sums / self.length, std
+
+
+class EWM:
+    """Exponentially weighted mean (adjust=False) seeded with the first value, like ``ewm_matrix``."""
+
+    def __init__(self, alpha: float) -> None:
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha!r}")
+        self.alpha = alpha
+        self.value = NAN
+        self._started = False
+
+    def update(self, value: float) -> float:
+        if self._started:
+            self.value = self.alpha * value + (1.0 - self.alpha) * self.value
+        else:
+            self.value, self._started = value, True
+        return self.value
+
+
+class EMA(EWM):
+    """Exponential moving average state (``ema(close, length)``)."""
+
+    def __init__(self, length: int) -> None:
+        (length,) = _lengths([length])
+        super().__init__(ema_alpha(length))
+
+
+class RSI:
+    """Wilder RSI state (``rsi(close, length)``): NaN for the first ``length`` bars."""
+
+    def __init__(self, length: int) -> None:
+        (self.length,) = _lengths([length])
+        self._gain = EWM(1 / self.length)
+        self._loss = EWM(1 / self.length)
+        self._prev = NAN
+        self._changes = 0
+
+    def update(self, close: float) -> float:
+        prev, self._prev = self._prev, close
+        if math.isnan(prev):
+            return NAN
+        delta = close - prev
+        gain = self._gain.update(max(delta, 0.0))
+        loss = self._loss.update(max(-delta, 0.0))
+        self._changes += 1
+        if self._changes < self.length:
+            return NAN
+        if loss == 0:  # NumPy semantics: gain/0 is inf (RSI 100), 0/0 is NaN
+            return 100.0 if gain > 0 else NAN
+        return 100 - (100 / (1 + gain / loss))
+
+
+class MACD:
+    """MACD line and signal line (``macd_line`` / ``macd_signal``)."""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9) -> None:
+        self._fast, self._slow, self._signal = EMA(fast), EMA(slow), EMA(signal)
+
+    def update(self, close: float) -> tuple[float, float]:
+        line = self._fast.update(close) - self._slow.update(close)
+        return line, self._signal.update(line)
+
+
+class SuperTrendState:
+    """One step of the fused SuperTrend kernel per bar; ``update`` returns (line, direction)."""
+
+    def __init__(self, period: int = 10, factor: float = 3.0) -> None:
+        self._atr = RollingWindow(period)
+        self.factor = factor
+        self._bars = 0
+        self._prev_close = NAN
+        self._final_upper = NAN
+        self._final_lower = NAN
+        self.direction = 1
+
+    def update(self, high: float, low: float, close: float) -> tuple[float, int]:
+        prev_close, self._prev_close = self._prev_close, close
+        bar_range = high - low
+        tr = bar_range if math.isnan(prev_close) else max(bar_range, abs(high - prev_close), abs(low - prev_close))
+        atr, _ = self._atr.update(tr)
+        hl2 = (high + low) / 2
+        upper, lower = hl2 + self.factor * atr, hl2 - self.factor * atr
+
+        first = self._bars == 0
+        self._bars += 1
+        prev_upper, prev_lower = self._final_upper, self._final_lower
+        if first or math.isnan(lower) or math.isnan(upper):
+            self._final_upper, self._final_lower, self.direction = upper, lower, 1
+            return 0.0, 1
+        if math.isnan(prev_lower):  # first valid bar
+            self._final_upper, self._final_lower, self.direction = upper, lower, 1
+            return lower, 1
+
+        final_lower = lower if lower > prev_lower or prev_close < prev_lower else prev_lower
+        final_upper = upper if upper < prev_upper or prev_close > prev_upper else prev_upper
+        if self.direction == 1 and close < final_lower:
+            self.direction = -1
+        elif self.direction == -1 and close > final_upper:
+            self.direction = 1
+        self._final_upper, self._final_lower = final_upper, final_lower
+        return (final_lower if self.direction == 1 else final_upper), self.direction
+
+
+class _Cross:
+    """``_cross_above(a, b)`` evaluated one bar at a time."""
+
+    def __init__(self) -> None:
+        self._prev = (NAN, NAN)
+
+    def update(self, a: float, b: float) -> bool:
+        (prev_a, prev_b), self._prev = self._prev, (a, b)
+        return prev_a < prev_b and a > b
+
+
+# === Strategy streamers ===
+#
+# Each mirrors the strategy's ``signals()`` for one bar: it returns
+# (entry, exit, indicator values), the indicators being the ones signals()
+# reports for warmup.
+
+Signal = tuple[bool, bool, tuple[float, ...]]
+
+
+class _BollingerBands:
+    def __init__(self, length: int, mult: float) -> None:
+        self._window, self.mult = RollingWindow(length), mult
+
+    def step(self, high: float, low: float, close: float) -> Signal:
+        mean, std = self._window.update(close)
+        upper, lower = mean + self.mult * std, mean - self.mult * std
+        return close > upper, close < lower, (upper, lower)
+
+
+class _SuperTrend:
+    def __init__(self, period: int, factor: float) -> None:
+        self._state = SuperTrendState(period, factor)
+        self._prev = 0
+
+    def step(self, high: float, low: float, close: float) -> Signal:
+        _, direction = self._state.update(high, low, close)
+        prev, self._prev = self._prev, direction
+        return direction == 1 and prev == -1, direction == -1 and prev == 1, (float(direction),)
+
+
+class _BullMarketSupportBand:
+    def __init__(self, sma_length: int, ema_length: int) -> None:
+        self._sma, self._ema = RollingWindow(sma_length), EMA(ema_length)
+        self._up, self._down = _Cross(), _Cross()
+
+    def step(self, high: float, low: float, close: float) -> Signal:
+        sma_val, _ = self._sma.update(close)
+        ema_val = self._ema.update(close)
+        return self._up.update(ema_val, sma_val), self._down.update(sma_val, ema_val), (sma_val, ema_val)
+
+
+class _RSI:
+    def __init__(self, rsi_length: int, overbought: float, oversold: float, sma_length: int) -> None:
+        self._rsi, self._sma = RSI(rsi_length), RollingWindow(sma_length)
+        self.overbought, self.oversold = overbought, oversold
+
+    def step(self, high: float, low: float, close: float) -> Signal:
+        rsi_val = self._rsi.update(close)
+        sma_val, _ = self._sma.update(close)
+        return rsi_val < self.oversold and close > sma_val, rsi_val > self.overbought, (rsi_val, sma_val)
+
+
+class _MACD:
+    def __init__(self, fast: int, slow: int, signal_length: int) -> None:
+        self._macd = MACD(fast, slow, signal_length)
+        self._up, self._down = _Cross(), _Cross()
+
+    def step(self, high: float, low: float, close: float) -> Signal:
+        macd, signal = self._macd.update(close)
+        return self._up.update(macd, signal), self._down.update(signal, macd), (macd, signal)
+
+
+class _Confluence:
+    def __init__(
+        self, bb_length: int, bb_mult: float, rsi_length: int, macd_fast: int, macd_slow: int, macd_signal_len: int
+    ) -> None:
+        self._bands = _BollingerBands(bb_length, bb_mult)
+        self._rsi = RSI(rsi_length)
+        self._macd = MACD(macd_fast, macd_slow, macd_signal_len)
+
+    def step(self, high: float, low: float, close: float) -> Signal:
+        _, _, (upper, lower) = self._bands.step(high, low, close)
+        rsi_val = self._rsi.update(close)
+        macd, signal = self._macd.update(close)
+        entry = close > upper and rsi_val < 70 and macd > signal
+        exit_ = close < lower or rsi_val > 80
+        return entry, exit_, (upper, lower, rsi_val, macd, signal)
+
+
+STREAMERS: dict[str, tuple[type, tuple[str, ...]]] = {
+    "bollinger-bands": (_BollingerBands, ("length", "mult")),
+    "supertrend": (_SuperTrend, ("period", "factor")),
+    "bull-market-support-band": (_BullMarketSupportBand, ("sma_length", "ema_length")),
+    "rsi": (_RSI, ("rsi_length", "overbought", "oversold", "sma_length")),
+    "macd": (_MACD, ("fast", "slow", "signal_length")),
+    "confluence": (_Confluence, ("bb_length", "bb_mult", "rsi_length", "macd_fast", "macd_slow", "macd_signal_len")),
+}
+
+
+# === Signal stream ===
+
+
+@dataclass
+class Bar:
+    time: str
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float = 0.0
+
+
+class SignalStream:
+    """Feed bars one at a time and get entry/exit events, as the fast engine would trade them.
+
+    A signal on bar ``i`` counts once every indicator has been valid for a
+    bar (the engines' warmup); entries are taken only while flat and exits
+    only while long. ``update`` returns the event dict for the bar, or None.
+    """
+
+    def __init__(self, strategy_name: str, **params: Any) -> None:
+        from .backtest import STRATEGIES
+
+        if strategy_name not in STREAMERS:
+            raise ValueError(f"Unknown strategy: {strategy_name}. Available: {', '.join(STREAMERS)}")
+        strategy_cls = STRATEGIES[strategy_name]
+        streamer_cls, names = STREAMERS[strategy_name]
+        for name in params:
+            if name not in names:
+                raise AttributeError(f"Strategy '{strategy_cls.__name__}' is missing parameter '{name}'")
+        self.strategy_name = strategy_name
+        self.params = {name: params.get(name, getattr(strategy_cls, name)) for name in names}
+        self._streamer = streamer_cls(**self.params)
+        self.bars = 0
+        self.long = False
+        self.latencies_ns: list[int] = []
+        self._valid_from: list[int | None] | None = None
+        self._start: int | None = None
+
+    def step(self, bar: Bar) -> Signal:
+        """Advance the indicators by one bar; returns the raw (entry, exit, indicators) for it."""
+        values = (bar.high, bar.low, bar.close)
+        if not all(math.isfinite(v) for v in values):
+            raise ValueError(f"bar {self.bars} ({bar.time}) has non-finite prices")
+        high, low, close = (v * FRACTIONAL_UNIT for v in values)
+        signal: Signal = self._streamer.step(high, low, close)
+
+        t = self.bars
+        self.bars += 1
+        indicators = signal[2]
+        if self._valid_from is None:
+            self._valid_from = [None] * len(indicators)
+        if self._start is None:
+            for k, value in enumerate(indicators):
+                if self._valid_from[k] is None and not math.isnan(value):
+                    self._valid_from[k] = t
+            if all(v is not None for v in self._valid_from):
+                self._start = 1 + max(v for v in self._valid_from if v is not None)
+        return signal
+
+    def update(self, bar: Bar) -> dict[str, Any] | None:
+        started = time.perf_counter_ns()
+        t = self.bars
+        entry, exit_, _ = self.step(bar)
+
+        event = None
+        if self._start is not None and t >= self._start:
+            if not self.long and entry:
+                self.long, event = True, "entry"
+            elif self.long and exit_:
+                self.long, event = False, "exit"
+        latency = time.perf_counter_ns() - started
+        self.latencies_ns.append(latency)
+        if event is None:
+            return None
+        return {
+            "event": event,
+            "strategy": self.strategy_name,
+            "bar": t,
+            "time": bar.time,
+            "close": bar.close,
+            "latency_us": round(latency / 1000, 1),
+        }
+
+    def latency_stats(self) -> dict[str, float]:
+        """Per-bar processing latency in microseconds (mean, p50, p99, max)."""
+        if not self.latencies_ns:
+            return {"bars": 0, "mean_us": 0.0, "p50_us": 0.0, "p99_us": 0.0, "max_us": 0.0}
+        ordered = sorted(self.latencies_ns)
+
+        def _pct(q: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] / 1000, 1)
+
+        return {
+            "bars": len(ordered),
+            "mean_us": round(sum(ordered) / len(ordered) / 1000, 1),
+            "p50_us": _pct(0.50),
+            "p99_us": _pct(0.99),
+            "max_us": round(ordered[-1] / 1000, 1),
+        }
+
+
+# === Bar input ===
+
+_TIME_COLUMNS = ("date", "datetime", "timestamp", "time")
+
+
+def parse_bars(lines: Iterable[str]) -> Iterator[Bar]:
+    """Parse CSV bar lines: an optional header naming the columns, else time,open,high,low,close[,volume]."""
+    columns: dict[str, int] | None = None
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        fields = [f.strip() for f in line.split(",")]
+        if columns is None:
+            names = [f.lower() for f in fields]
+            if "close" in names:
+                time_col = next((names.index(c) for c in _TIME_COLUMNS if c in names), 0)
+                columns = {name: names.index(name) for name in ("open", "high", "low", "close") if name in names}
+                missing = [c for c in ("open", "high", "low", "close") if c not in columns]
+                if missing:
+                    raise ValueError(f"Bar header is missing columns: {missing}")
+                columns["time"] = time_col
+                if "volume" in names:
+                    columns["volume"] = names.index("volume")
+                continue
+            columns = {"time": 0, "open": 1, "high": 2, "low": 3, "close": 4, "volume": 5}
+        volume_col = columns.get("volume", len(fields))
+        try:
+            yield Bar(
+                time=fields[columns["time"]],
+                open=float(fields[columns["open"]]),
+                high=float(fields[columns["high"]]),
+                low=float(fields[columns["low"]]),
+                close=float(fields[columns["close"]]),
+                volume=float(fields[volume_col]) if volume_col < len(fields) else 0.0,
+            )
+        except (IndexError, ValueError) as e:
+            raise ValueError(f"Malformed bar line: {line!r}") from e
+
+
+def tail_lines(path: Path, poll: float = 0.5) -> Iterator[str]:
+    """Yield the lines of ``path``, then keep yielding lines appended to it (``tail -f``)."""
+    with path.open() as f:
+        pending = ""
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                time.sleep(poll)
+                continue
+            pending += chunk
+            if pending.endswith("\n"):
+                yield pending
+                pending = ""
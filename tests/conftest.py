@@ -0,0 +1,14 @@
+"""Shared fixtures: keep on-disk caches and the result store out of the user's home directory."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cache(tmp_path, monkeypatch):
+    from meta_strategy.data import CACHE_DIR_ENV
+    from meta_strategy.store import configure_result_store
+
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+    yield
+    # CLI invocations turn the store on for the rest of the process
+    configure_result_store(enabled=False)
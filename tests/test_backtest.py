@@ -87,6 +87,57 @@ def test_supertrend_direction_calculation():
     assert -1 in unique, f"Expected bearish direction, got {unique}"
 
 
+def _supertrend_per_bar(high, low, close, period, factor):
+    """The original per-bar SuperTrend loop, kept as the bit-identity oracle for the fused kernel."""
+    high, low, close = pd.Series(high), pd.Series(low), pd.Series(close)
+    tr = pd.concat([high - low, (high - close.shift(1)).abs(), (low - close.shift(1)).abs()], axis=1).max(axis=1)
+    atr = tr.rolling(period).mean()
+    upper_band = ((high + low) / 2 + factor * atr).to_numpy()
+    lower_band = ((high + low) / 2 - factor * atr).to_numpy()
+    close = close.to_numpy()
+    n = len(close)
+    st, direction = np.zeros(n), np.ones(n, dtype=int)
+    final_upper, final_lower = upper_band.copy(), lower_band.copy()
+    for i in range(1, n):
+        if np.isnan(lower_band[i]) or np.isnan(upper_band[i]):
+            continue
+        if np.isnan(final_lower[i - 1]):
+            final_lower[i], final_upper[i] = lower_band[i], upper_band[i]
+            st[i] = final_lower[i]
+            continue
+        up_ok = lower_band[i] > final_lower[i - 1] or close[i - 1] < final_lower[i - 1]
+        final_lower[i] = lower_band[i] if up_ok else final_lower[i - 1]
+        down_ok = upper_band[i] < final_upper[i - 1] or close[i - 1] > final_upper[i - 1]
+        final_upper[i] = upper_band[i] if down_ok else final_upper[i - 1]
+        if direction[i - 1] == 1 and close[i] < final_lower[i]:
+            direction[i] = -1
+        elif direction[i - 1] == -1 and close[i] > final_upper[i]:
+            direction[i] = 1
+        else:
+            direction[i] = direction[i - 1]
+        st[i] = final_lower[i] if direction[i] == 1 else final_upper[i]
+    return st, direction, final_upper, final_lower
+
+
+@pytest.mark.parametrize(("n", "period", "factor"), [(600, 10, 3.0), (300, 1, 1.5), (200, 7, 2.0), (5, 10, 3.0)])
+def test_supertrend_kernel_matches_per_bar_loop(n, period, factor):
+    """The fused kernel returns line, direction and final bands bit-identical to the per-bar loop."""
+    from meta_strategy.backtest import supertrend, supertrend_line
+
+    rng = np.random.default_rng(n + period)
+    close = 100 + np.cumsum(rng.normal(0, 2, n))
+    high, low = close + rng.random(n) * 3, close - rng.random(n) * 3
+
+    result = supertrend(high, low, close, period, factor)
+    expected = _supertrend_per_bar(high, low, close, period, factor)
+
+    for got, want in zip(result, expected, strict=True):
+        np.testing.assert_array_equal(got, want)
+    assert result.direction.dtype == expected[1].dtype
+    np.testing.assert_array_equal(supertrend_line(high, low, pd.Series(close), period, factor), result.line)
+    np.testing.assert_array_equal(supertrend_direction(high, low, pd.Series(close), period, factor), result.direction)
+
+
 def test_supertrend_strategy_trades():
     """SuperTrend strategy produces trades on noisy trending data."""
     np.random.seed(123)
@@ -445,6 +496,99 @@ def test_optimize_split_1_preserves_legacy():
         bt_mod.fetch_data = original
 
 
+@pytest.mark.parametrize("split", [1.0, 0.7])
+def test_optimize_ranks_by_batch_risk_metric(split):
+    """rank_by a risk metric attaches it to every result (IS too) and sorts by it, best first."""
+    from meta_strategy.backtest import optimize_strategy, run_strategy
+    from meta_strategy.risk import compute_risk_metrics
+
+    rng = np.random.default_rng(2)
+    data = _make_ohlcv(list(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 400)))))
+    grid = {"length": [10, 20, 30], "mult": [1.5, 2.0]}
+
+    results = optimize_strategy("bollinger-bands", data=data, param_grid=grid, split=split, rank_by="sortino_ratio")
+
+    sortinos = [r["sortino_ratio"] for r in results]
+    assert sortinos == sorted(sortinos, reverse=True)
+    assert all(("is_calmar_ratio" in r) == (split < 1.0) for r in results)
+    test_data = data.iloc[int(len(data) * split) :] if split < 1.0 else data
+    best = results[0]
+    equity = run_strategy(test_data, STRATEGIES["bollinger-bands"], **best["params"])["_equity_curve"]["Equity"]
+    expected = compute_risk_metrics(equity)
+    assert round(best["sortino_ratio"], 3) == expected["sortino_ratio"]
+    assert best["max_consecutive_losses"] == expected["max_consecutive_losses"]
+
+    losing = optimize_strategy(
+        "bollinger-bands", data=data, param_grid=grid, split=split, rank_by="max_consecutive_losses"
+    )
+    streaks = [r["max_consecutive_losses"] for r in losing]
+    assert streaks == sorted(streaks)
+    with pytest.raises(ValueError, match="Unknown rank metric"):
+        optimize_strategy("bollinger-bands", data=data, param_grid=grid, rank_by="luck")
+
+
+@pytest.mark.parametrize("strategy_name", list(STRATEGIES))
+def test_slim_runner_matches_full_stats(strategy_name):
+    """One Backtest per dataset, no compute_stats: the optimizer's metrics and equity equal a full run."""
+    import itertools
+
+    from meta_strategy.backtest import PARAM_GRIDS, _extract_metrics, _metrics_runner, run_strategy
+
+    rng = np.random.default_rng(4)
+    data = _make_ohlcv(list(100 * np.exp(np.cumsum(rng.normal(0, 0.03, 700)))))
+    strategy_cls = STRATEGIES[strategy_name]
+    grid = PARAM_GRIDS[strategy_name]
+    runner = _metrics_runner(data, strategy_cls, 100_000.0, 0.001, "reference")
+
+    for combo in itertools.islice(itertools.product(*grid.values()), 3):
+        params = dict(zip(grid, combo, strict=True))
+        full = run_strategy(data, strategy_cls, **params)
+        stats, equity = runner(**params)
+        assert _extract_metrics(stats) == _extract_metrics(full)
+        np.testing.assert_array_equal(equity, full["_equity_curve"]["Equity"].to_numpy())
+
+
+def test_top_k_equals_sort_and_truncate():
+    """The bounded heap keeps exactly the first k rows of a full stable sort, NaN last, ties in grid order."""
+    from meta_strategy.backtest import TopK
+
+    rng = np.random.default_rng(7)
+    values = rng.integers(0, 20, 300).astype(float)
+    values[::17] = np.nan
+    rows = [{"params": {"i": i}, "sharpe_ratio": v, "downside_deviation": v} for i, v in enumerate(values)]
+
+    for rank_by, sign in (("sharpe_ratio", 1.0), ("downside_deviation", -1.0)):
+        expected = sorted(rows, key=lambda r: sign * r[rank_by] if not np.isnan(r[rank_by]) else -np.inf, reverse=True)
+        for k in (1, 5, 50, 400, None):
+            top = TopK(k, rank_by)
+            for i, row in enumerate(rows):
+                top.push(i, row)
+            assert len(top) == min(k or len(rows), len(rows))
+            assert top.results() == expected[:k]
+
+
+def test_optimize_top_and_spill(tmp_path):
+    """top=K returns the first K of the full ranking; spill writes every row as JSON lines."""
+    import json
+
+    from meta_strategy.backtest import optimize_strategy
+
+    rng = np.random.default_rng(2)
+    data = _make_ohlcv(list(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 400)))))
+    grid = {"length": [10, 15, 20, 25, 30], "mult": [1.5, 2.0, 2.5]}
+
+    full = optimize_strategy("bollinger-bands", data=data, param_grid=grid, engine="fast")
+    spill = tmp_path / "rows.jsonl"
+    top = optimize_strategy("bollinger-bands", data=data, param_grid=grid, engine="fast", top=4, spill=spill)
+
+    assert top == full[:4]
+    rows = [json.loads(line) for line in spill.read_text().splitlines()]
+    assert len(rows) == len(full) == 15
+    assert rows[0]["params"] == {"length": 10, "mult": 1.5}
+    with pytest.raises(ValueError, match="top must be"):
+        optimize_strategy("bollinger-bands", data=data, param_grid=grid, top=0)
+
+
 def test_optimize_invalid_split_raises():
     """optimize_strategy raises ValueError for invalid split values."""
     from meta_strategy.backtest import optimize_strategy
@@ -731,3 +875,50 @@ def test_run_all_backtests_includes_bmsb_on_daily():
         assert "return_pct" in bmsb
     finally:
         bt_mod.fetch_data = original
+
+
+# === Data injection tests ===
+
+
+def test_run_all_backtests_fetches_once_with_provider():
+    """run_all_backtests fetches data once and shares it with every strategy."""
+    import meta_strategy.backtest as bt_mod
+    from meta_strategy.data import SharedDataProvider
+
+    data = _make_ohlcv([100 + i * 0.3 for i in range(500)])
+    calls = []
+    original = bt_mod.fetch_data
+
+    def mock_fetch(*args, **kwargs):
+        calls.append(args)
+        return data
+
+    bt_mod.fetch_data = mock_fetch
+    try:
+        provider = SharedDataProvider()
+        results = bt_mod.run_all_backtests(data=provider)
+        assert len(results) == len(STRATEGIES)
+        assert len(calls) == 1
+        assert provider.fetches == 1
+    finally:
+        bt_mod.fetch_data = original
+
+
+def test_run_backtest_uses_preloaded_dataframe():
+    """run_backtest never calls fetch_data when a DataFrame is injected."""
+    import meta_strategy.backtest as bt_mod
+
+    data = _make_ohlcv([100 + i * 0.3 for i in range(500)])
+    original = bt_mod.fetch_data
+
+    def fail_fetch(*args, **kwargs):
+        raise AssertionError("fetch_data should not be called")
+
+    bt_mod.fetch_data = fail_fetch
+    try:
+        result = bt_mod.run_backtest("bollinger-bands", data=data)
+        assert result["warmup_bars"] == 19
+        results = bt_mod.optimize_strategy("macd", param_grid={"fast": [8, 12], "slow": [26]}, data=data)
+        assert len(results) == 2
+    finally:
+        bt_mod.fetch_data = original
@@ -0,0 +1,136 @@
+"""Tests for the grid-aware indicator kernels and grid seeding in the optimizer."""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+import meta_strategy.backtest as backtest
+from meta_strategy.batch import ema_matrix, rolling_mean_matrix, rolling_std_matrix, rsi_matrix
+from meta_strategy.indicator_cache import DEFAULT_MAX_BYTES, configure_indicator_cache
+
+LENGTHS = [10, 15, 20, 25, 30]
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    configure_indicator_cache()
+    yield
+    configure_indicator_cache(DEFAULT_MAX_BYTES)
+
+
+def _prices(n: int = 3000, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 30_000e-8 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+
+
+def _frame(n: int = 500) -> pd.DataFrame:
+    close = 1e6 * _prices(n, seed=3)
+    return pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=n, freq="D"),
+    )
+
+
+def test_rolling_moments_match_two_pass_reference():
+    """Prefix-sum means and standard deviations agree with a direct two-pass computation."""
+    x = _prices()
+    means, stds = rolling_mean_matrix(x, LENGTHS), rolling_std_matrix(x, LENGTHS)
+
+    for j, length in enumerate(LENGTHS):
+        windows = sliding_window_view(x, length)
+        assert np.isnan(means[: length - 1, j]).all()
+        assert np.isnan(stds[: length - 1, j]).all()
+        np.testing.assert_allclose(means[length - 1 :, j], windows.mean(axis=1), rtol=1e-14)
+        np.testing.assert_allclose(stds[length - 1 :, j], windows.std(axis=1), rtol=1e-10)
+
+
+def test_rolling_moments_stay_within_the_documented_tolerance_of_pandas():
+    """Means agree with pandas to a few ulps; standard deviations to pandas' own cancellation error."""
+    x = 1e8 * _prices(5000, seed=4)
+    means, stds = rolling_mean_matrix(x, LENGTHS), rolling_std_matrix(x, LENGTHS)
+
+    for j, length in enumerate(LENGTHS):
+        rolling = pd.Series(x).rolling(length)
+        np.testing.assert_allclose(means[:, j], rolling.mean().to_numpy(), rtol=1e-13)
+        np.testing.assert_allclose(stds[:, j], rolling.std(ddof=0).to_numpy(), rtol=1e-6)
+
+
+def test_ewm_kernels_match_pandas():
+    """EMA is bit-identical to ewm(span=, adjust=False); RSI matches the pandas formulation."""
+    x = _prices()
+    close = pd.Series(x)
+    emas = ema_matrix(x, LENGTHS)
+    rsis = rsi_matrix(x, [7, 14, 21])
+
+    for j, length in enumerate(LENGTHS):
+        np.testing.assert_array_equal(emas[:, j], close.ewm(span=length, adjust=False).mean().to_numpy())
+    for j, length in enumerate([7, 14, 21]):
+        delta = close.diff()
+        gain = delta.clip(lower=0).ewm(alpha=1 / length, min_periods=length, adjust=False).mean()
+        loss = (-delta).clip(lower=0).ewm(alpha=1 / length, min_periods=length, adjust=False).mean()
+        np.testing.assert_allclose(rsis[:, j], (100 - 100 / (1 + gain / loss)).to_numpy(), rtol=1e-12)
+
+
+@pytest.mark.parametrize("kernel", [rolling_mean_matrix, rolling_std_matrix, ema_matrix, rsi_matrix])
+def test_columns_do_not_depend_on_the_batch(kernel):
+    """Each column is bit-identical to a single-length call, so seeded and direct values agree."""
+    x = _prices(1000, seed=1)
+    batched = kernel(x, LENGTHS)
+
+    for j, length in enumerate(LENGTHS):
+        np.testing.assert_array_equal(batched[:, j], kernel(x, [length])[:, 0])
+
+
+def test_flat_windows_are_exact():
+    """A run of identical prices gives back the price and a zero deviation, as pandas does."""
+    x = np.concatenate([_prices(200), np.full(50, 0.000123456789), _prices(100, seed=2)])
+
+    mean = rolling_mean_matrix(x, [20])[:, 0]
+    std = rolling_std_matrix(x, [20])[:, 0]
+
+    assert (mean[219:250] == 0.000123456789).all()
+    assert (std[219:250] == 0.0).all()
+
+
+def test_non_finite_input_falls_back_to_pandas():
+    """NaNs inside the series keep pandas' window semantics."""
+    x = _prices(300)
+    x[100] = np.nan
+    expected = pd.Series(x).rolling(20).mean().to_numpy()
+
+    np.testing.assert_array_equal(rolling_mean_matrix(x, [20])[:, 0], expected)
+
+
+def test_invalid_lengths_raise():
+    with pytest.raises(ValueError, match="positive integer"):
+        rolling_mean_matrix(_prices(100), [20, -5])
+    with pytest.raises(ValueError, match="positive integer"):
+        rsi_matrix(_prices(100), [2.5])
+
+
+def test_short_series_is_all_nan():
+    """A window longer than the data yields an all-NaN column instead of an error."""
+    out = rolling_std_matrix(_prices(10), [5, 20])
+
+    assert not np.isnan(out[4:, 0]).any()
+    assert np.isnan(out[:, 1]).all()
+
+
+@pytest.mark.parametrize("engine", ["fast", "reference"])
+def test_optimizer_reuses_seeded_columns(monkeypatch, engine):
+    """A seeded grid leaves no per-combination rolling computations, for any number of mults."""
+    calls: list[str] = []
+    for name in ("rolling_mean_matrix", "rolling_std_matrix"):
+        kernel = getattr(backtest, name)
+        monkeypatch.setattr(backtest, name, lambda *a, _k=kernel, _n=name: calls.append(_n) or _k(*a))
+
+    grid = {"length": [10, 15, 20, 25, 30], "mult": [1.5, 2.0, 2.5, 3.0]}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results = backtest.optimize_strategy("bollinger-bands", data=_frame(), param_grid=grid, engine=engine)
+
+    assert len(results) == 20
+    assert calls == []
@@ -107,3 +107,198 @@ def test_validate_pine_with_issues(tmp_path):
     result = runner.invoke(app, ["validate-pine", str(pine)])
     assert result.exit_code == 1
     assert "no-lookahead" in result.stdout
+
+
+def test_backtest_with_offline_data_source(tmp_path):
+    """--data-source dir runs a backtest from local CSV files without yfinance."""
+    import numpy as np
+    import pandas as pd
+
+    from meta_strategy.data import configure_data_source
+
+    n = 300
+    close = 100 + np.cumsum(np.random.default_rng(7).normal(0, 1, n))
+    frame = pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=n, freq="D"),
+    )
+    frame.to_csv(tmp_path / "TEST_1d.csv", index_label="Date")
+
+    try:
+        result = runner.invoke(
+            app,
+            ["--data-source", "dir", "--data-path", str(tmp_path), "backtest", "bollinger-bands", "--symbol", "TEST"],
+        )
+    finally:
+        configure_data_source()
+    assert result.exit_code == 0, result.output
+    assert "Strategy:        bollinger-bands" in result.stdout
+
+
+def test_unknown_data_source_fails():
+    """An unknown --data-source exits with an error."""
+    result = runner.invoke(app, ["--data-source", "ftp", "list"])
+    assert result.exit_code == 1
+
+
+def test_backtest_unknown_engine_fails():
+    """An unknown --engine exits with an error before any data is loaded."""
+    result = runner.invoke(app, ["backtest", "bollinger-bands", "--engine", "turbo"])
+    assert result.exit_code == 1
+    assert "Unknown engine" in result.output
+
+
+def test_monte_carlo_paths_with_block_bootstrap(tmp_path):
+    """--paths --block-size prints drawdown, time-under-water and fan-chart rows."""
+    import numpy as np
+    import pandas as pd
+
+    from meta_strategy.data import configure_data_source
+
+    n = 600
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(3).normal(0, 0.03, n)))
+    frame = pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=n, freq="D"),
+    )
+    frame.to_csv(tmp_path / "TEST_1d.csv", index_label="Date")
+
+    args = ["--data-source", "dir", "--data-path", str(tmp_path), "monte-carlo", "rsi", "--symbol", "TEST"]
+    try:
+        result = runner.invoke(app, [*args, "--simulations", "200", "--paths", "--block-size", "3"])
+        adaptive = runner.invoke(app, [*args, "--simulations", "5000", "--tolerance", "50"])
+    finally:
+        configure_data_source()
+    assert result.exit_code == 0, result.output
+    assert "Max Drawdown:" in result.stdout
+    assert "Time Under Water:" in result.stdout
+    assert "Fan chart" in result.stdout
+    assert adaptive.exit_code == 0, adaptive.output
+    assert "Convergence:        converged" in adaptive.stdout
+
+
+def test_monte_carlo_unknown_bootstrap_fails():
+    """An unknown --bootstrap exits with an error before any data is loaded."""
+    result = runner.invoke(app, ["monte-carlo", "rsi", "--bootstrap", "jackknife", "--block-size", "2"])
+    assert result.exit_code == 1
+    assert "Unknown bootstrap" in result.output
+
+
+def test_analyze_runs_one_backtest(tmp_path, monkeypatch):
+    """`analyze --json` backtests once and reports core stats, risk metrics and Monte Carlo."""
+    import json
+
+    import numpy as np
+    import pandas as pd
+
+    import meta_strategy.backtest as backtest
+    from meta_strategy.data import configure_data_source
+
+    n = 600
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(3).normal(0, 0.03, n)))
+    frame = pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=n, freq="D"),
+    )
+    frame.to_csv(tmp_path / "TEST_1d.csv", index_label="Date")
+    runs = []
+    run_strategy = backtest.run_strategy
+    monkeypatch.setattr(backtest, "run_strategy", lambda *a, **k: runs.append(1) or run_strategy(*a, **k))
+
+    args = ["--data-source", "dir", "--data-path", str(tmp_path), "analyze", "rsi", "--symbol", "TEST"]
+    try:
+        result = runner.invoke(app, [*args, "--simulations", "200", "--json"])
+    finally:
+        configure_data_source()
+    assert result.exit_code == 0, result.output
+    report = json.loads(result.stdout)
+    assert set(report) == {"backtest", "risk_metrics", "monte_carlo"}
+    assert report["backtest"]["num_trades"] == report["risk_metrics"]["num_trades"] == report["monte_carlo"]["n_trades"]
+    assert report["monte_carlo"]["n_simulations"] == 200
+    assert runs == [1]
+
+
+def test_risk_metrics_rolling(tmp_path):
+    """risk-metrics --rolling prints one row per window."""
+    import numpy as np
+    import pandas as pd
+
+    from meta_strategy.data import configure_data_source
+
+    n = 400
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(3).normal(0, 0.03, n)))
+    frame = pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=n, freq="D"),
+    )
+    frame.to_csv(tmp_path / "TEST_1d.csv", index_label="Date")
+
+    args = ["--data-source", "dir", "--data-path", str(tmp_path), "risk-metrics", "macd", "--symbol", "TEST"]
+    try:
+        result = runner.invoke(app, [*args, "--rolling", "--windows", "30,90"])
+        bad = runner.invoke(app, [*args, "--rolling", "--windows", "30,ninety"])
+    finally:
+        configure_data_source()
+    assert result.exit_code == 0, result.output
+    assert "Rolling (latest / median / worst)" in result.stdout
+    rows = [line.split() for line in result.stdout.splitlines() if line.strip().split(" ")[0] in ("30", "90")]
+    assert [row[0] for row in rows] == ["30", "90"]
+    assert bad.exit_code == 1
+
+
+def test_events_jsonl_and_live_progress(tmp_path):
+    """--events jsonl makes stdout pure JSON lines, one per combination or fold; everything else goes to stderr."""
+    import json
+
+    import numpy as np
+    import pandas as pd
+
+    from meta_strategy.data import configure_data_source
+
+    n = 800
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(3).normal(0, 0.03, n)))
+    frame = pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=n, freq="D"),
+    )
+    frame.to_csv(tmp_path / "TEST_1d.csv", index_label="Date")
+
+    args = ["--no-store", "--data-source", "dir", "--data-path", str(tmp_path)]
+    try:
+        optimize = runner.invoke(
+            app, [*args, "optimize", "macd", "--symbol", "TEST", "--engine", "fast", "--events", "jsonl"]
+        )
+        walk = runner.invoke(
+            app,
+            [
+                *args,
+                "walk-forward",
+                "macd",
+                "--symbol",
+                "TEST",
+                "--engine",
+                "fast",
+                "--splits",
+                "3",
+                "--events",
+                "jsonl",
+            ],
+        )
+        bad = runner.invoke(app, [*args, "optimize", "macd", "--symbol", "TEST", "--events", "xml"])
+    finally:
+        configure_data_source()
+
+    assert optimize.exit_code == 0, optimize.output
+    events = [json.loads(line) for line in optimize.stdout.splitlines()]  # every stdout line parses
+    combos = [e for e in events if e["event"] == "combo"]
+    assert len(combos) == events[0]["total"] and events[-1]["event"] == "end"
+    assert {"params", "metrics", "seconds", "worker", "rate_per_s", "eta_s"} <= combos[0].keys()
+    assert "combos/s" in optimize.stderr and "ETA" in optimize.stderr
+    assert "Optimizing macd" in optimize.stderr and "Best params" in optimize.stderr
+
+    assert walk.exit_code == 0, walk.output
+    folds = [event for line in walk.stdout.splitlines() if (event := json.loads(line))["event"] == "fold"]
+    assert [f["fold"] for f in folds] == [1, 2, 3]
+    assert "folds/s" in walk.stderr
+    assert "[3/3]" in walk.stderr and "Average out-of-sample" in walk.stderr
+    assert bad.exit_code == 1
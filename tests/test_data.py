@@ -0,0 +1,293 @@
+"""Tests for the on-disk OHLCV cache behind fetch_data."""
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from meta_strategy.backtest import fetch_data
+from meta_strategy.data import bar_start, cache_path, cached_history, configure_cache, read_cache
+
+FULL_INDEX = pd.date_range("2020-01-01", periods=120, freq="D", tz="UTC")
+FULL = pd.DataFrame(
+    {
+        "Open": np.linspace(100, 220, 120),
+        "High": np.linspace(102, 222, 120),
+        "Low": np.linspace(98, 218, 120),
+        "Close": np.linspace(101, 221, 120),
+        "Volume": np.full(120, 1000.0),
+        "Dividends": np.zeros(120),
+    },
+    index=FULL_INDEX,
+)
+
+
+class FakeTicker:
+    """Stand-in for yfinance.Ticker that records every history() call."""
+
+    calls: list[tuple[str, str | None]] = []
+    offline = False
+
+    def __init__(self, symbol: str) -> None:
+        self.symbol = symbol
+
+    def history(self, start: str, end: str | None = None, **kwargs: object) -> pd.DataFrame:
+        if FakeTicker.offline:
+            raise ConnectionError("no network")
+        FakeTicker.calls.append((start, end))
+        mask = FULL.index >= pd.Timestamp(start, tz="UTC")
+        if end is not None:
+            mask &= FULL.index < pd.Timestamp(end, tz="UTC")
+        return FULL.loc[mask]
+
+
+@pytest.fixture
+def fake_yf(monkeypatch, tmp_path):
+    import yfinance
+
+    FakeTicker.calls = []
+    FakeTicker.offline = False
+    monkeypatch.setattr(yfinance, "Ticker", FakeTicker)
+    configure_cache(directory=tmp_path)
+    yield FakeTicker
+    configure_cache()
+
+
+def test_first_fetch_writes_columnar_cache(fake_yf):
+    """A cold fetch downloads the range and stores one .npy file per column."""
+    df = fetch_data("BTC-USD", "2020-01-01", "2020-03-01")
+
+    assert len(df) == 60
+    assert list(df.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    path = cache_path("BTC-USD", "1d")
+    assert (path / "Close.npy").exists()
+    assert (path / "index.npy").exists()
+    cached, meta = read_cache("BTC-USD", "1d")
+    assert len(cached) == 60
+    assert meta["start"] == "2020-01-01"
+
+
+def test_covered_range_served_offline(fake_yf):
+    """Once cached, a covered range is read from disk without any download."""
+    fetch_data("BTC-USD", "2020-01-01", "2020-03-01")
+    fake_yf.offline = True
+
+    df = fetch_data("BTC-USD", "2020-01-15", "2020-02-01")
+
+    assert len(df) == 17
+    assert df.index[0] == pd.Timestamp("2020-01-15", tz="UTC")
+    expected = FULL.loc["2020-01-15":"2020-01-31", ["Open", "High", "Low", "Close", "Volume"]]
+    np.testing.assert_array_equal(df.to_numpy(), expected.to_numpy())
+    assert (df.index == expected.index).all()
+
+
+def test_incremental_top_up_downloads_only_new_bars(fake_yf):
+    """Extending the end date only downloads bars after the last cached timestamp."""
+    fetch_data("BTC-USD", "2020-01-01", "2020-03-01")
+    fake_yf.calls.clear()
+
+    df = fetch_data("BTC-USD", "2020-01-01", "2020-04-01")
+
+    assert fake_yf.calls == [("2020-02-29", "2020-04-01")]
+    assert len(df) == 91
+    assert df.index.is_unique
+    cached, _ = read_cache("BTC-USD", "1d")
+    assert len(cached) == 91
+
+
+def test_top_up_failure_falls_back_to_cache(fake_yf):
+    """Without network, an open-ended request still returns the cached bars."""
+    fetch_data("BTC-USD", "2020-01-01", "2020-03-01")
+    fake_yf.offline = True
+
+    with pytest.warns(UserWarning, match="using cached bars"):
+        df = fetch_data("BTC-USD", "2020-01-01")
+
+    assert len(df) == 60
+
+
+@pytest.mark.parametrize(
+    ("last", "now", "downloads"),
+    [
+        ("2024-05-01 10:05", "2024-05-01 10:50", 0),  # still inside the 10:00 bar
+        ("2024-05-01 10:59", "2024-05-01 11:30", 1),  # the 10:00 bar closed in between
+        ("2024-05-01 10:05", "2024-05-01 12:10", 1),
+    ],
+)
+def test_open_ended_top_up_follows_bar_boundaries(monkeypatch, tmp_path, last, now, downloads):
+    """An open-ended request tops up only once a bar has closed since the last top-up."""
+    import meta_strategy.data as data_mod
+
+    class Clock(datetime):
+        current = datetime.fromisoformat(last)
+
+        @classmethod
+        def now(cls, tz=None):
+            return Clock.current.replace(tzinfo=tz)
+
+    calls = []
+
+    def download(start, end):
+        calls.append((start, end))
+        return FULL.iloc[:10]
+
+    monkeypatch.setattr(data_mod, "datetime", Clock)
+    configure_cache(directory=tmp_path)
+    try:
+        cached_history(download, "BTC-USD", "2020-01-01", None, "1h")
+        Clock.current = datetime.fromisoformat(now)
+        cached_history(download, "BTC-USD", "2020-01-01", None, "1h")
+    finally:
+        configure_cache()
+
+    assert len(calls) == 1 + downloads
+
+
+@pytest.mark.parametrize(
+    ("interval", "expected"),
+    [
+        ("15m", "2024-05-01 10:45"),
+        ("1h", "2024-05-01 10:00"),
+        ("4h", "2024-05-01 08:00"),
+        ("1d", "2024-05-01"),
+        ("1wk", "2024-04-29"),
+        ("1mo", "2024-05-01"),
+        ("3mo", "2024-04-01"),
+    ],
+)
+def test_bar_start_aligns_to_the_clock(interval, expected):
+    assert bar_start(pd.Timestamp("2024-05-01 10:59"), interval) == pd.Timestamp(expected)
+    assert bar_start(pd.Timestamp("2024-05-01 10:59"), "tick") is None
+
+
+def test_no_cache_bypasses_disk(fake_yf):
+    """use_cache=False downloads directly and leaves no cache behind."""
+    fetch_data("BTC-USD", "2020-01-01", "2020-03-01", use_cache=False)
+
+    assert read_cache("BTC-USD", "1d") is None
+
+
+def test_refresh_redownloads_full_range(fake_yf, tmp_path):
+    """refresh=True ignores the cached bars and downloads the requested range again."""
+    fetch_data("BTC-USD", "2020-01-01", "2020-03-01")
+    configure_cache(refresh=True, directory=tmp_path)
+    fake_yf.calls.clear()
+
+    fetch_data("BTC-USD", "2020-01-01", "2020-03-01")
+
+    assert fake_yf.calls == [("2020-01-01", "2020-03-01")]
+
+
+def test_shared_provider_fetches_each_request_once(monkeypatch):
+    """SharedDataProvider memoizes by (symbol, start, end, interval) and counts real fetches."""
+    import meta_strategy.backtest as bt_mod
+    from meta_strategy.data import SharedDataProvider, YFinanceProvider
+
+    monkeypatch.setattr(bt_mod, "fetch_data", lambda *a, **kw: FULL)
+    provider = SharedDataProvider(YFinanceProvider())
+
+    for _ in range(3):
+        provider.load("BTC-USD", "2020-01-01")
+    provider.load("ETH-USD", "2020-01-01")
+
+    assert provider.requests == 4
+    assert provider.fetches == 2
+
+
+# === Offline providers ===
+
+
+def _ohlcv_frame(n: int = 50) -> pd.DataFrame:
+    idx = pd.date_range("2021-01-01", periods=n, freq="h", tz="UTC")
+    close = np.linspace(100, 150, n)
+    return pd.DataFrame(
+        {"Open": close - 0.5, "High": close + 1, "Low": close - 1, "Close": close, "Volume": np.full(n, 10.0)},
+        index=idx,
+    )
+
+
+def test_directory_provider_reads_csv(tmp_path):
+    """DirectoryProvider loads <root>/<interval>/<symbol>.csv with lowercase headers."""
+    from meta_strategy.data import DirectoryProvider
+
+    frame = _ohlcv_frame()
+    (tmp_path / "1h").mkdir()
+    frame.rename(columns=str.lower).rename_axis("timestamp").to_csv(tmp_path / "1h" / "BTC-USD.csv")
+
+    df = DirectoryProvider(tmp_path).load("BTC-USD", "2021-01-01", "2021-01-02", interval="1h")
+
+    assert list(df.columns) == ["Open", "High", "Low", "Close", "Volume"]
+    assert len(df) == 24
+    np.testing.assert_allclose(df["Close"].to_numpy(), frame["Close"].to_numpy()[:24])
+
+
+def test_directory_provider_missing_file(tmp_path):
+    """DirectoryProvider names the paths it tried when no file exists."""
+    from meta_strategy.data import DirectoryProvider
+
+    with pytest.raises(FileNotFoundError, match="BTC-USD_1d.csv"):
+        DirectoryProvider(tmp_path).load("BTC-USD", "2021-01-01")
+
+
+def test_directory_provider_names_the_parquet_extra(monkeypatch, tmp_path):
+    """Without a Parquet engine, loading a .parquet file says which extra to install."""
+    from meta_strategy.data import DirectoryProvider
+
+    def no_engine(*args, **kwargs):
+        raise ImportError("Unable to find a usable engine")
+
+    monkeypatch.setattr(pd, "read_parquet", no_engine)
+    (tmp_path / "BTC-USD_1d.parquet").touch()
+
+    with pytest.raises(ImportError, match=r"meta-strategy\[parquet\]"):
+        DirectoryProvider(tmp_path).load("BTC-USD", "2021-01-01")
+
+
+def test_npy_provider_returns_mmap_views(tmp_path):
+    """NpyMmapProvider slices the mapped columns without copying them."""
+    from meta_strategy.data import NpyMmapProvider, write_cache
+
+    configure_cache(directory=tmp_path)
+    try:
+        write_cache("BTC-USD", "1h", _ohlcv_frame(), {"start": "2021-01-01", "covered_until": "2021-01-03"})
+    finally:
+        configure_cache()
+
+    df = NpyMmapProvider(tmp_path).load("BTC-USD", "2021-01-01 10:00", "2021-01-02", interval="1h")
+
+    assert len(df) == 14
+    assert df.index[0] == pd.Timestamp("2021-01-01 10:00", tz="UTC")
+    close = df["Close"].to_numpy()
+    assert not close.flags.owndata
+    assert not close.flags.writeable
+
+
+def test_npy_provider_feeds_backtest(tmp_path):
+    """A memory-mapped frame runs through run_backtest unchanged."""
+    from meta_strategy.backtest import run_backtest
+    from meta_strategy.data import NpyMmapProvider, write_cache
+
+    configure_cache(directory=tmp_path)
+    try:
+        write_cache("BTC-USD", "1h", _ohlcv_frame(300), {"start": "2021-01-01", "covered_until": "2021-02-01"})
+    finally:
+        configure_cache()
+
+    provider = NpyMmapProvider(tmp_path)
+    result = run_backtest("bollinger-bands", start="2021-01-01", interval="1h", data=provider)
+    in_memory = provider.load("BTC-USD", "2021-01-01", None, "1h").copy()
+    expected = run_backtest("bollinger-bands", start="2021-01-01", interval="1h", data=in_memory)
+
+    assert result == expected
+
+
+def test_make_provider_validates_source(tmp_path):
+    """make_provider rejects unknown sources and offline sources without a path."""
+    from meta_strategy.data import DirectoryProvider, make_provider
+
+    assert isinstance(make_provider("dir", tmp_path), DirectoryProvider)
+    with pytest.raises(ValueError, match="Unknown data source"):
+        make_provider("ftp")
+    with pytest.raises(ValueError, match="requires a data path"):
+        make_provider("npy")
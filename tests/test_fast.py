@@ -0,0 +1,111 @@
+"""Parity tests: the vectorized fast engine against backtesting.py's Backtest.run."""
+
+import itertools
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from backtesting import Strategy
+
+from meta_strategy.backtest import PARAM_GRIDS, STRATEGIES, optimize_strategy, run_backtest, run_strategy
+from meta_strategy.fast import prepare, run_fast
+
+STATS_KEYS = [
+    "Return [%]",
+    "Buy & Hold Return [%]",
+    "Max. Drawdown [%]",
+    "Sharpe Ratio",
+    "# Trades",
+    "Win Rate [%]",
+    "Equity Final [$]",
+]
+TRADE_COLUMNS = ["Size", "EntryBar", "ExitBar", "EntryPrice", "ExitPrice", "PnL", "ReturnPct"]
+
+
+def _random_walk(n: int, seed: int, freq: str = "D") -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.03, n)))
+    opn = close * (1 + rng.normal(0, 0.005, n))
+    return pd.DataFrame(
+        {
+            "Open": opn,
+            "High": np.maximum(opn, close) * 1.01,
+            "Low": np.minimum(opn, close) * 0.99,
+            "Close": close,
+            "Volume": np.full(n, 1000.0),
+        },
+        index=pd.date_range("2019-01-01", periods=n, freq=freq, tz="UTC"),
+    )
+
+
+def _assert_parity(reference: pd.Series, fast: dict) -> None:
+    for key in STATS_KEYS:
+        if pd.isna(reference[key]):
+            assert pd.isna(fast[key]), key
+        else:
+            assert fast[key] == reference[key], key
+    np.testing.assert_array_equal(fast["_equity_curve"]["Equity"], reference["_equity_curve"]["Equity"])
+    for col in TRADE_COLUMNS:
+        np.testing.assert_array_equal(fast["_trades"][col], reference["_trades"][col], err_msg=col)
+
+
+@pytest.mark.parametrize("strategy_name", list(STRATEGIES))
+@pytest.mark.parametrize(("seed", "freq"), [(1, "D"), (3, "h"), (4, "B")])
+def test_fast_engine_matches_reference(strategy_name, seed, freq):
+    """Every built-in strategy produces identical trades, equity and stats on both engines."""
+    data = _random_walk(700, seed, freq)
+    prepared = prepare(data)
+    strategy_cls = STRATEGIES[strategy_name]
+    grid = PARAM_GRIDS[strategy_name]
+    combos = [{}] + [dict(zip(grid, c, strict=True)) for c in itertools.islice(itertools.product(*grid.values()), 3)]
+
+    for params in combos:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            reference = run_strategy(data, strategy_cls, engine="reference", **params)
+        _assert_parity(reference, run_fast(strategy_cls, prepared, **params))
+
+
+def test_fast_engine_short_data_has_no_trades():
+    """Data shorter than the warmup yields flat equity and NaN win rate, like the reference."""
+    data = _random_walk(30, 5)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        reference = run_strategy(data, STRATEGIES["rsi"])
+    fast = run_fast(STRATEGIES["rsi"], data)
+
+    _assert_parity(reference, fast)
+    assert fast["# Trades"] == 0
+
+
+def test_fast_engine_rejects_unknown_params_and_strategies():
+    """Unknown parameters raise like Backtest.run(); strategies without signals() are refused."""
+
+    class NoSignals(Strategy):
+        def init(self) -> None:
+            pass
+
+        def next(self) -> None:
+            pass
+
+    data = _random_walk(100, 6)
+    with pytest.raises(AttributeError, match="missing parameter"):
+        run_fast(STRATEGIES["macd"], data, nope=1)
+    with pytest.raises(ValueError, match="no signals"):
+        run_fast(NoSignals, data)
+
+
+def test_engine_switch_through_public_api():
+    """run_backtest and optimize_strategy give the same results on either engine."""
+    data = _random_walk(600, 8)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        assert run_backtest("supertrend", data=data, engine="fast") == run_backtest("supertrend", data=data)
+        grid = {"length": [15, 20], "mult": [2.0, 2.5]}
+        fast = optimize_strategy("bollinger-bands", data=data, param_grid=grid, engine="fast")
+        reference = optimize_strategy("bollinger-bands", data=data, param_grid=grid)
+
+    assert fast == reference
+    with pytest.raises(ValueError, match="engine must be one of"):
+        run_backtest("supertrend", data=data, engine="turbo")
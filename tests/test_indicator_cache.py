@@ -0,0 +1,121 @@
+"""Tests for the memoizing indicator cache."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from meta_strategy.backtest import (
+    ConfluenceStrategy,
+    detect_warmup,
+    macd_signal,
+    rsi,
+    run_backtest,
+    supertrend,
+)
+from meta_strategy.indicator_cache import (
+    DEFAULT_MAX_BYTES,
+    INDICATOR_CACHE,
+    IndicatorCache,
+    configure_indicator_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    configure_indicator_cache()
+    yield INDICATOR_CACHE
+    configure_indicator_cache(DEFAULT_MAX_BYTES)
+
+
+def _close(n: int = 500, seed: int = 0) -> pd.Series:
+    rng = np.random.default_rng(seed)
+    return pd.Series(100 + np.cumsum(rng.normal(0, 1, n)), index=pd.date_range("2020-01-01", periods=n), name="Close")
+
+
+def test_repeat_call_hits_and_matches(fresh_cache):
+    """A second identical call is a hit and returns an equal, independent Series."""
+    close = _close()
+    first = rsi(close, 14)
+    second = rsi(close, 14)
+
+    pd.testing.assert_series_equal(first, second, check_exact=True)
+    assert fresh_cache.hits == 1
+    second.iloc[20] = -1.0
+    pd.testing.assert_series_equal(rsi(close, 14), first, check_exact=True)
+
+
+def test_key_covers_params_and_data(fresh_cache):
+    """Different parameters or different input values are separate entries."""
+    close = _close()
+    rsi(close, 14)
+    rsi(close, 21)
+    rsi(_close(seed=1), 14)
+
+    assert fresh_cache.stats()["misses"] == 3
+    assert fresh_cache.stats()["hits"] == 0
+
+
+def test_shared_building_blocks_are_reused(fresh_cache):
+    """macd_signal reuses the EMAs and MACD line computed for macd_line."""
+    close = _close()
+    from meta_strategy.backtest import macd_line
+
+    macd_line(close, 12, 26)
+    hits_before = fresh_cache.hits
+    macd_signal(close, 12, 26, 9)
+
+    assert fresh_cache.hits == hits_before + 1  # macd_line served from cache
+
+
+def test_lru_eviction_respects_byte_budget():
+    """Entries are evicted least-recently-used first once the byte budget is exceeded."""
+    cache = IndicatorCache(max_bytes=2 * 800)
+    block = np.zeros(100)  # 800 bytes
+    cache.put("a", block, block.nbytes)
+    cache.put("b", block, block.nbytes)
+    cache.get("a")
+    cache.put("c", block, block.nbytes)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.nbytes <= cache.max_bytes
+
+
+def test_namedtuple_results_are_cached(fresh_cache):
+    """The SuperTrend kernel's tuple of arrays round-trips through the cache."""
+    close = _close().to_numpy()
+    first = supertrend(close + 1, close - 1, close, 10, 3.0)
+    second = supertrend(close + 1, close - 1, close, 10, 3.0)
+
+    assert fresh_cache.hits == 1
+    for a, b in zip(first, second, strict=True):
+        np.testing.assert_array_equal(a, b)
+    assert second.direction.flags.writeable
+
+
+def test_disabled_cache_recomputes(fresh_cache):
+    """A zero budget bypasses the cache entirely."""
+    configure_indicator_cache(0)
+    close = _close()
+    rsi(close, 14)
+    rsi(close, 14)
+
+    assert fresh_cache.stats()["hits"] == fresh_cache.stats()["misses"] == 0
+
+
+def test_backtest_and_warmup_share_indicators(fresh_cache):
+    """After one Confluence backtest, warmup detection and a re-run compute no indicator again."""
+    close = _close(400).to_numpy()
+    data = pd.DataFrame(
+        {"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": np.full(400, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=400),
+    )
+    first = run_backtest("confluence", data=data)
+    misses = fresh_cache.misses
+
+    detect_warmup(ConfluenceStrategy, data)
+    second = run_backtest("confluence", data=data)
+
+    assert fresh_cache.misses == misses
+    assert second == first
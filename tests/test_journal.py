@@ -0,0 +1,130 @@
+"""Checkpoint/resume tests: interrupted optimize and walk-forward runs finish with identical output."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from meta_strategy import backtest
+from meta_strategy.backtest import optimize_strategy, walk_forward
+from meta_strategy.cli import app
+from meta_strategy.journal import Journal
+
+GRID = {"fast": [8, 12, 16], "slow": [21, 26], "signal_length": [5, 9]}
+
+
+def _frame(n: int = 900, seed: int = 4) -> pd.DataFrame:
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.03, n)))
+    return pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=n, freq="D"),
+    )
+
+
+@pytest.fixture
+def evaluations(monkeypatch):
+    """Count the optimizer combinations actually run."""
+    seen: list[dict] = []
+    original = backtest._evaluate_params
+
+    def counting(train_run, test_run, params, curves=None):
+        seen.append(params)
+        return original(train_run, test_run, params, curves)
+
+    monkeypatch.setattr(backtest, "_evaluate_params", counting)
+    return seen
+
+
+def test_journal_drops_a_torn_last_line_and_rejects_other_runs(tmp_path):
+    path = tmp_path / "run.jsonl"
+    with Journal(path, "abc") as log:
+        log.record_many([(0, {"entry": 1}), (1, None)])
+    with open(path, "a") as f:
+        f.write('{"key": 2, "val')
+
+    with Journal(path, "abc", resume=True) as log:
+        assert log.done == {0: {"entry": 1}, 1: None}
+        log.record_many([(2, {"entry": 3})])
+    assert [json.loads(line) for line in path.read_text().splitlines()][-1] == {"key": 2, "value": {"entry": 3}}
+
+    with pytest.raises(ValueError, match="different run"):
+        Journal(path, "xyz", resume=True)
+    with Journal(path, "xyz") as log:  # without resume the journal starts over
+        assert log.done == {}
+
+
+def test_optimize_resumes_from_the_journal(tmp_path, evaluations):
+    data = _frame()
+    path = tmp_path / "optimize.jsonl"
+    expected = optimize_strategy("macd", data=data, param_grid=GRID, engine="fast", rank_by="sortino_ratio")
+    optimize_strategy("macd", data=data, param_grid=GRID, engine="fast", rank_by="sortino_ratio", journal=path)
+    assert len(evaluations) == 24
+
+    # Keep the header and 5 combinations, as if the run died mid-way
+    lines = path.read_text().splitlines(keepends=True)
+    path.write_text("".join(lines[:6]) + lines[6][:10])
+    resumed = optimize_strategy(
+        "macd", data=data, param_grid=GRID, engine="fast", rank_by="sortino_ratio", journal=path, resume=True, top=3
+    )
+
+    assert len(evaluations) == 24 + 7
+    assert resumed == expected[:3]
+    with pytest.raises(ValueError, match="different run"):
+        optimize_strategy("macd", data=data, param_grid=GRID, engine="fast", journal=path, resume=True, cash=1.0)
+    with pytest.raises(ValueError, match="keep_equity"):
+        optimize_strategy("macd", data=data, param_grid=GRID, journal=path, keep_equity=True)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_interrupted_walk_forward_resumes_identically(tmp_path, jobs):
+    data = _frame(1500)
+    kwargs = {"data": data, "mode": "rolling", "train_bars": 300, "step": 100, "engine": "fast", "jobs": jobs}
+    expected = walk_forward("macd", **kwargs)
+    path = tmp_path / "wf.jsonl"
+
+    def interrupt(done, total, fold):
+        if done == 4:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        walk_forward("macd", journal=path, progress=interrupt, **{**kwargs, "jobs": 1})
+    assert len(path.read_text().splitlines()) == 1 + 4
+
+    calls = []
+    resumed = walk_forward("macd", journal=path, resume=True, progress=lambda *a: calls.append(a[0]), **kwargs)
+    assert resumed == expected
+    assert calls[0] == 5 and calls[-1] == len(expected["folds"])
+
+
+def test_cli_resume_options(tmp_path):
+    from meta_strategy.data import configure_data_source
+
+    _frame().to_csv(tmp_path / "TEST_1d.csv", index_label="Date")
+    args = ["--no-store", "--data-source", "dir", "--data-path", str(tmp_path)]
+    optimize = [*args, "optimize", "macd", "--symbol", "TEST", "--engine", "fast"]
+    walk = [*args, "walk-forward", "macd", "--symbol", "TEST", "--engine", "fast", "--splits", "3"]
+    try:
+        plain = CliRunner().invoke(app, optimize)
+        first = CliRunner().invoke(app, [*optimize, "--resume"])
+        again = CliRunner().invoke(app, [*optimize, "--resume"])
+        conflict = CliRunner().invoke(app, [*optimize, "--resume", "--overfitting"])
+        journal_conflict = CliRunner().invoke(app, [*optimize, "--journal", str(tmp_path / "o.jsonl"), "--overfitting"])
+        mismatch = CliRunner().invoke(app, [*optimize, "--resume", "--cash", "5000"])
+        folds = CliRunner().invoke(app, [*walk, "--journal", str(tmp_path / "wf.jsonl")])
+        folds_again = CliRunner().invoke(app, [*walk, "--journal", str(tmp_path / "wf.jsonl"), "--resume"])
+    finally:
+        configure_data_source()
+
+    assert plain.exit_code == 0 and first.exit_code == 0 and again.exit_code == 0, again.output
+    assert first.stdout == again.stdout
+    assert plain.stdout.split("🧮")[0] == first.stdout.split("🧮")[0]
+    assert "already done" not in first.stderr  # journaling is opt-in: the plain run left no journal behind
+    assert "already done" in again.stderr
+    assert conflict.exit_code == 1 and mismatch.exit_code == 1
+    assert journal_conflict.exit_code == 1 and "--journal cannot be combined" in journal_conflict.stderr
+    assert not (tmp_path / "o.jsonl").exists()
+    assert "different run" in mismatch.output
+    assert folds_again.exit_code == 0, folds_again.output
+    assert folds.output.split("📊")[1] == folds_again.output.split("📊")[1]
@@ -0,0 +1,212 @@
+"""Tests for the shared-memory process pool behind --jobs."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from meta_strategy.backtest import optimize_strategy
+from meta_strategy.parallel import SharedFrame, Throughput, attach_frame, iter_tasks, run_tasks
+
+
+def _frame(n: int = 400, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.001, 0.03, n)))
+    return pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=n, freq="D", tz="America/New_York"),
+    )
+
+
+def _tail_close(data: pd.DataFrame, task: int) -> float:
+    if task < 0:
+        raise ValueError(f"bad task {task}")
+    return float(data["Close"].iloc[task])
+
+
+def test_shared_frame_round_trip():
+    """Workers see the same values and tz-aware index through the shared block."""
+    frame = _frame()
+    with SharedFrame(frame) as shared:
+        shm, attached = attach_frame(shared.spec)
+        try:
+            np.testing.assert_array_equal(attached.to_numpy(), frame.to_numpy())
+            assert (attached.index == frame.index).all()
+            assert str(attached.index.tz) == "America/New_York"
+            assert not attached["Close"].to_numpy().flags.owndata
+        finally:
+            del attached
+            shm.close()
+
+
+def test_run_tasks_keeps_order_and_returns_errors():
+    """Results come back in task order on the pool, with exceptions in place of failed tasks."""
+    frame = _frame()
+    tasks = [5, -1, 0, 399]
+    seen: list[int] = []
+
+    results = run_tasks(frame, _tail_close, tasks, jobs=2, on_result=lambda i, r: seen.append(i))
+
+    assert results[0] == frame["Close"].iloc[5]
+    assert isinstance(results[1], ValueError)
+    assert results[2:] == [frame["Close"].iloc[0], frame["Close"].iloc[399]]
+    assert sorted(seen) == [0, 1, 2, 3]
+    assert run_tasks(frame, _tail_close, [5, 0, 399], jobs=1) == [results[0], *results[2:]]
+
+
+def test_iter_tasks_streams_every_result():
+    frame = _frame()
+    tasks = [5, -1, 0, 399]
+
+    pooled = dict(iter_tasks(frame, _tail_close, tasks, jobs=2))
+    serial = list(iter_tasks(frame, _tail_close, tasks, jobs=1))
+
+    assert sorted(pooled) == [0, 1, 2, 3]
+    assert [i for i, _ in serial] == [0, 1, 2, 3]
+    assert pooled[3] == serial[3][1] == frame["Close"].iloc[399]
+    assert isinstance(pooled[1], ValueError)
+
+
+def test_optimize_jobs_matches_serial():
+    """A pooled grid search returns exactly the serial results, in the same order."""
+    frame = _frame(500)
+    grid = {"length": [10, 15, 20], "mult": [1.5, 2.0, 2.5]}
+
+    serial = optimize_strategy("bollinger-bands", data=frame, param_grid=grid, engine="fast")
+    pooled = optimize_strategy("bollinger-bands", data=frame, param_grid=grid, engine="fast", jobs=3)
+
+    assert pooled == serial
+    assert optimize_strategy("bollinger-bands", data=frame, param_grid=grid, engine="fast", jobs=3, top=2) == serial[:2]
+
+
+def test_optimize_reports_failed_combinations():
+    """A combination that raises is reported as a warning instead of being silently dropped."""
+    frame = _frame()
+
+    with pytest.warns(RuntimeWarning, match=r"'length': -5.*ValueError"):
+        results = optimize_strategy("bollinger-bands", data=frame, param_grid={"length": [20, -5]}, engine="fast")
+
+    assert [r["params"] for r in results] == [{"length": 20}]
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_walk_forward_reports_failed_combinations(monkeypatch, jobs):
+    """Failing grid combinations of a fold are reported, from worker processes too."""
+    import meta_strategy.backtest as backtest
+
+    monkeypatch.setitem(backtest.PARAM_GRIDS, "bollinger-bands", {"length": [20, -5]})
+    events: list[dict] = []
+    with pytest.warns(RuntimeWarning, match=r"bollinger-bands fold 1 \{'length': -5\} failed: ValueError"):
+        result = backtest.walk_forward(
+            "bollinger-bands", data=_frame(900), n_splits=2, engine="fast", jobs=jobs, on_event=events.append
+        )
+
+    assert [f["best_params"] for f in result["folds"]] == [{"length": 20}] * 2
+    fold_events = [e for e in events if e["event"] == "fold"]
+    assert all(e["errors"][0]["params"] == {"length": -5} for e in fold_events)
+
+
+def test_walk_forward_reports_failed_folds(monkeypatch):
+    """A fold whose out-of-sample run raises is reported instead of silently dropped."""
+    import meta_strategy.backtest as backtest
+
+    def _broken(*args, **kwargs):
+        raise RuntimeError("no test data")
+
+    monkeypatch.setattr(backtest, "run_strategy", _broken)
+    with pytest.warns(RuntimeWarning, match=r"bollinger-bands fold 2 failed: RuntimeError: no test data"):
+        result = backtest.walk_forward("bollinger-bands", data=_frame(900), n_splits=2, engine="fast")
+
+    assert result["folds"] == []
+
+
+def test_walk_forward_jobs_matches_serial():
+    """Pooled folds merge back in order, so folds and the stability report are unchanged."""
+    from meta_strategy.backtest import walk_forward
+
+    frame = _frame(900)
+    calls: list[tuple[int, int]] = []
+
+    serial = walk_forward("macd", data=frame, mode="rolling", train_bars=300, step=100, engine="fast")
+    pooled = walk_forward(
+        "macd",
+        data=frame,
+        mode="rolling",
+        train_bars=300,
+        step=100,
+        engine="fast",
+        jobs=2,
+        progress=lambda done, total, fold: calls.append((done, total)),
+    )
+
+    assert pooled == serial
+    assert [f["fold"] for f in pooled["folds"]] == list(range(1, 7))
+    assert calls == [(i, 6) for i in range(1, 7)]
+
+
+def test_walk_forward_splits_fold_grids_across_spare_workers():
+    """With fewer folds than workers, each fold's grid is searched in chunks; the folds do not change."""
+    from meta_strategy.backtest import _fold_chunks, walk_forward
+
+    assert _fold_chunks(9, 6, 2) == [(0, 9)]
+    assert _fold_chunks(9, 2, 4) == [(0, 4), (4, 9)]
+    assert _fold_chunks(2, 1, 8) == [(0, 1), (1, 2)]
+
+    frame = _frame(900)
+    serial = walk_forward("macd", data=frame, n_splits=2, engine="fast")
+    pooled = walk_forward("macd", data=frame, n_splits=2, engine="fast", jobs=4)
+
+    assert pooled == serial and len(serial["folds"]) == 2
+
+
+def test_throughput_rate_ignores_units_done_before_the_run():
+    counter = Throughput(total=10, done=4)
+    first = counter.step(2)
+
+    assert (first["done"], first["total"]) == (6, 10)
+    assert first["rate_per_s"] > 0 and first["eta_s"] >= 0
+    assert Throughput(total=3).step(3)["eta_s"] == 0.0
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_optimize_and_walk_forward_stream_events(jobs):
+    """One event per combination or fold, with its metrics, wall time, worker and progress."""
+    import json
+    import os
+
+    from meta_strategy.backtest import walk_forward
+
+    frame = _frame(900)
+    grid = {"length": [10, 20, -5], "mult": [1.5, 2.0, 2.5]}
+    events: list[dict] = []
+    with pytest.warns(RuntimeWarning):
+        results = optimize_strategy(
+            "bollinger-bands", data=frame, param_grid=grid, engine="fast", jobs=jobs, on_event=events.append
+        )
+
+    start, *combos, end = events
+    assert start == {
+        "event": "start",
+        "kind": "optimize",
+        "strategy": "bollinger-bands",
+        "search": "grid",
+        "pruned": 0,
+        "total": 9,
+    }
+    assert sorted(e["seq"] for e in combos) == list(range(9))
+    assert sum("error" in e for e in combos) == 3
+    assert [e["done"] for e in combos] == list(range(1, 10))
+    ok = {json.dumps(e["params"]): e["metrics"] for e in combos if "metrics" in e}
+    assert all(ok[json.dumps(r["params"])]["sharpe_ratio"] == r["sharpe_ratio"] for r in results)
+    assert all(e["seconds"] >= 0 for e in combos)
+    assert ({e["worker"] for e in combos} == {os.getpid()}) == (jobs == 1)
+    assert end["event"] == "end" and end["evaluated"] == 9 and end["eta_s"] == 0.0
+    json.dumps(events)
+
+    events.clear()
+    result = walk_forward(
+        "macd", data=frame, mode="rolling", train_bars=300, step=100, engine="fast", jobs=jobs, on_event=events.append
+    )
+    folds = [e for e in events if e["event"] == "fold"]
+    assert sorted(e["fold"] for e in folds) == list(range(1, 7))
+    assert sorted((e["result"] for e in folds), key=lambda f: f["fold"]) == result["folds"]
+    assert events[-1]["done"] == events[-1]["total"] == 6
@@ -4,12 +4,14 @@ import json
 import os
 import tempfile
 
+import numpy as np
 import pandas as pd
 
 from meta_strategy.reports import (
     _svg_equity_chart,
     export_results_csv,
     export_results_json,
+    generate_html_report,
 )
 
 
@@ -82,3 +84,18 @@ def test_export_csv_empty():
         # File should not have been written (or exist from temp)
     finally:
         os.unlink(path)
+
+
+def test_html_report_includes_rolling_risk():
+    """The single-strategy report has a rolling-risk row per window that fits the data."""
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(3).normal(0, 0.03, 300)))
+    data = pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(300, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=300, freq="D"),
+    )
+
+    html = generate_html_report("macd", data=data, rolling_windows=(30, 90, 365))
+
+    assert "Rolling Risk" in html
+    assert "30 bars" in html and "90 bars" in html
+    assert "365 bars" not in html
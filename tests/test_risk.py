@@ -2,8 +2,22 @@
 
 import numpy as np
 import pandas as pd
+import pytest
 
-from meta_strategy.risk import _max_consecutive, compute_risk_metrics
+import meta_strategy.risk as risk
+from meta_strategy.backtest import STRATEGIES, run_strategy
+from meta_strategy.risk import (
+    _max_consecutive,
+    _resample_indices,
+    compute_risk_metrics,
+    compute_risk_metrics_batch,
+    longest_runs,
+    rolling_max,
+    rolling_risk_metrics,
+    simulate_compounded_returns,
+    simulate_equity_paths,
+    simulate_until_converged,
+)
 
 
 def test_compute_risk_metrics_uptrend():
@@ -52,6 +66,37 @@ def test_compute_risk_metrics_too_short():
     assert m["sortino_ratio"] == 0.0
 
 
+def test_batch_risk_metrics_match_per_curve():
+    """Every row of the batch equals compute_risk_metrics on that curve, to its rounding."""
+    rng = np.random.default_rng(1)
+    equity = 100_000 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, (50, 300)), axis=1))
+    equity[1] = 100_000.0  # flat
+    equity[2] = np.linspace(100_000, 200_000, 300)  # no losses: infinite profit factor
+    equity[3, 150:] = equity[3, 149] * 0.99  # a single losing bar: NaN downside deviation
+
+    batch = compute_risk_metrics_batch(equity)
+
+    for i, row in enumerate(equity):
+        expected = compute_risk_metrics(pd.Series(row))
+        for key, value in expected.items():
+            digits = len(str(value).split(".")[1]) if isinstance(value, float) and np.isfinite(value) else 0
+            if isinstance(value, int):
+                assert batch[key][i] == value, (i, key)
+            elif np.isnan(value) or np.isinf(value):
+                np.testing.assert_array_equal(batch[key][i], value)
+            else:
+                assert abs(batch[key][i] - value) <= 0.5 * 10.0 ** -max(digits, 2) + 1e-12, (i, key)
+
+
+def test_batch_risk_metrics_short_curves():
+    assert compute_risk_metrics_batch(np.ones((3, 2)))["sortino_ratio"].tolist() == [0.0, 0.0, 0.0]
+
+
+def test_longest_runs():
+    mask = np.array([[1, 1, 0, 1, 1, 1, 0, 1], [0, 0, 0, 0, 0, 0, 0, 0], [1, 1, 1, 1, 1, 1, 1, 1]], dtype=bool)
+    assert longest_runs(mask).tolist() == [3, 0, 8]
+
+
 def test_max_consecutive():
     """Max consecutive 1s in binary series."""
     s = pd.Series([1, 1, 0, 1, 1, 1, 0, 1])
@@ -68,3 +113,206 @@ def test_max_consecutive_empty():
     """Max consecutive with empty series."""
     s = pd.Series([], dtype=int)
     assert _max_consecutive(s) == 0
+
+
+def _legacy_monte_carlo(trade_returns: np.ndarray, n_simulations: int, seed: int) -> np.ndarray:
+    """The former one-simulation-per-iteration loop."""
+    rng = np.random.default_rng(seed)
+    return np.array(
+        [
+            (np.prod(1 + rng.choice(trade_returns, size=len(trade_returns), replace=True)) - 1) * 100
+            for _ in range(n_simulations)
+        ]
+    )
+
+
+@pytest.mark.parametrize("n_trades", [1, 7, 40])
+def test_simulate_compounded_returns_matches_loop(n_trades):
+    """Chunked draws resample the same trades as the per-simulation loop for a given seed."""
+    trade_returns = np.random.default_rng(n_trades).normal(0.01, 0.08, n_trades)
+    expected = _legacy_monte_carlo(trade_returns, 500, seed=42)
+
+    for budget in (16, 16 * n_trades * 33, 1 << 26):
+        sims = simulate_compounded_returns(trade_returns, 500, seed=42, memory_budget=budget)
+        np.testing.assert_allclose(sims, expected, rtol=1e-12, atol=1e-10)
+        for q in (5, 25, 50, 75, 95):
+            assert round(float(np.percentile(sims, q)), 2) == round(float(np.percentile(expected, q)), 2)
+
+
+def test_simulate_compounded_returns_is_budget_independent():
+    """The memory budget only changes chunking, never the result."""
+    trade_returns = np.random.default_rng(0).normal(0.0, 0.05, 25)
+    small = simulate_compounded_returns(trade_returns, 1000, seed=7, memory_budget=16 * 25 * 3)
+    large = simulate_compounded_returns(trade_returns, 1000, seed=7)
+
+    np.testing.assert_array_equal(small, large)
+
+
+def test_simulate_compounded_returns_total_loss():
+    """Losses of -100% or worse compound without a log of zero or a negative."""
+    sims = simulate_compounded_returns(np.array([-1.0, 0.5]), 200, seed=1)
+    assert np.isfinite(sims).all()
+    assert sims.min() == -100.0
+
+    sims = simulate_compounded_returns(np.array([-1.5, 0.5]), 200, seed=1)
+    assert np.isfinite(sims).all()
+
+
+def _brute_force_paths(trade_returns: np.ndarray, idx: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Materialized equity paths, drawdowns and longest under-water runs."""
+    equity = np.cumprod(1 + trade_returns[idx], axis=1)
+    peak = np.maximum.accumulate(np.maximum(equity, 1.0), axis=1)
+    runs = []
+    for row in equity < peak:
+        longest = current = 0
+        for below in row:
+            current = current + 1 if below else 0
+            longest = max(longest, current)
+        runs.append(longest)
+    return equity, (1 - equity / peak).max(axis=1) * 100, np.array(runs)
+
+
+def test_equity_paths_match_materialized_paths():
+    """Chunked path statistics equal a full path matrix; fan bands are within one histogram bin."""
+    trade_returns = np.random.default_rng(0).normal(0.01, 0.06, 30)
+    idx = np.random.default_rng(3).integers(0, 30, size=(2000, 30))
+    equity, max_dd, under_water = _brute_force_paths(trade_returns, idx)
+
+    out = simulate_equity_paths(trade_returns, 2000, seed=3, memory_budget=30 * 48 * 70)
+
+    np.testing.assert_array_equal(out["final_return_pct"], simulate_compounded_returns(trade_returns, 2000, seed=3))
+    np.testing.assert_allclose(out["max_drawdown_pct"], max_dd, atol=1e-9)
+    np.testing.assert_array_equal(out["time_under_water"], under_water)
+    log_equity = np.log(equity)
+    bin_width = (log_equity.max(axis=0) - log_equity.min(axis=0)) / 2048
+    for q in (5, 50, 95):
+        fan = np.log1p(out["fan"][f"p{q}"][1:] / 100)
+        assert out["fan"][f"p{q}"][0] == 0.0
+        assert (np.abs(fan - np.percentile(log_equity, q, axis=0)) <= bin_width + 1e-12).all()
+
+
+def test_equity_paths_absorb_ruin():
+    """A -100% trade ends the path at zero equity: 100% drawdown, -100% return."""
+    out = simulate_equity_paths(np.array([-1.0, 0.2, 0.1]), 500, seed=1)
+
+    ruined = out["final_return_pct"] == -100.0
+    assert ruined.any()
+    assert (out["max_drawdown_pct"][ruined] == 100.0).all()
+    assert out["fan"]["p5"][-1] == -100.0
+    assert np.isfinite(out["fan"]["p95"]).all()
+
+
+@pytest.mark.parametrize("bootstrap", ["stationary", "block"])
+def test_block_bootstrap_preserves_serial_dependence(bootstrap):
+    """Block resampling keeps runs of consecutive trades; i.i.d. resampling does not."""
+    n = 200
+    rng = np.random.default_rng(0)
+    idx = _resample_indices(rng, 500, n, block_size=10, bootstrap=bootstrap)
+    iid = _resample_indices(rng, 500, n, block_size=1, bootstrap=bootstrap)
+
+    assert idx.shape == (500, n)
+    assert ((idx >= 0) & (idx < n)).all()
+    consecutive = (np.diff(idx, axis=1) % n == 1).mean()
+    assert 0.85 < consecutive < 0.95  # a new block starts every ~10 trades
+    assert (np.diff(iid, axis=1) % n == 1).mean() < 0.05
+
+
+def test_invalid_bootstrap_raises():
+    with pytest.raises(ValueError, match="block_size"):
+        simulate_compounded_returns(np.array([0.1]), 10, block_size=0)
+    with pytest.raises(ValueError, match="Unknown bootstrap"):
+        simulate_equity_paths(np.array([0.1]), 10, bootstrap="jackknife")
+
+
+def test_adaptive_monte_carlo_stops_early():
+    """A loose tolerance stops at a checkpoint; the draws are a prefix of the fixed-size run."""
+    trade_returns = np.random.default_rng(0).normal(0.01, 0.02, 20)
+
+    sims, info = simulate_until_converged(trade_returns, tolerance=2.0, max_simulations=50_000, batch_size=500)
+
+    assert info["converged"]
+    assert len(sims) < 50_000
+    assert max(info["half_widths"].values()) <= 2.0
+    assert set(info["half_widths"]) == {"p5", "p50", "p95", "prob_profit"}
+    np.testing.assert_array_equal(sims, simulate_compounded_returns(trade_returns, len(sims)))
+
+
+def test_adaptive_monte_carlo_reports_cap():
+    """An unreachable tolerance runs to the cap and says it did not converge."""
+    trade_returns = np.random.default_rng(0).normal(0.05, 0.3, 20)
+
+    sims, info = simulate_until_converged(trade_returns, tolerance=1e-6, max_simulations=3000, batch_size=1000)
+
+    assert len(sims) == 3000
+    assert not info["converged"]
+    assert info["checks"] == 3
+    with pytest.raises(ValueError, match="tolerance"):
+        simulate_until_converged(trade_returns, tolerance=0.0)
+
+
+def _btc_like_frame(n: int = 500) -> pd.DataFrame:
+    close = 300_000 * np.exp(np.cumsum(np.random.default_rng(4).normal(0, 0.03, n)))
+    return pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=n, freq="D"),
+    )
+
+
+def test_risk_functions_reuse_prior_stats(monkeypatch):
+    """Given a run's stats, monte_carlo and run_risk_analysis load no data and match a fresh run."""
+    data = _btc_like_frame()
+    fresh_mc = risk.monte_carlo("macd", data=data, n_simulations=300)
+    fresh_metrics = risk.run_risk_analysis("macd", data=data)
+    stats = run_strategy(data, STRATEGIES["macd"])
+
+    def no_load(*args, **kwargs):
+        raise AssertionError("data was loaded despite prior stats")
+
+    monkeypatch.setattr(risk, "load_data", no_load)
+    assert risk.monte_carlo("macd", n_simulations=300, stats=stats) == fresh_mc
+    assert risk.run_risk_analysis("macd", stats=stats) == fresh_metrics
+    # the fractional engine trades a $300k asset with $100k cash
+    assert fresh_mc["n_trades"] == len(stats["_trades"]) > 0
+
+
+@pytest.mark.parametrize("engine", ["reference", "fast"])
+def test_monte_carlo_resamples_trades_on_the_backtest_scale(engine):
+    """ReturnPct is a fraction per trade: the simulated median is of the order of the backtest's Return [%]."""
+    stats = run_strategy(_btc_like_frame(), STRATEGIES["bollinger-bands"], engine=engine)
+
+    mc = risk.monte_carlo("bollinger-bands", n_simulations=500, stats=stats, engine=engine)
+
+    assert stats["Return [%]"] > 10
+    assert stats["Return [%]"] / 2 < mc["median_return_pct"] < stats["Return [%]"] * 2
+
+
+@pytest.mark.parametrize("length", [1, 5, 64, 90, 500, 501])
+def test_rolling_max_matches_pandas(length):
+    x = np.random.default_rng(length).normal(0, 1, 500).cumsum()
+    x[100:150] = x[100]
+
+    np.testing.assert_array_equal(rolling_max(x, length), pd.Series(x).rolling(length).max().to_numpy())
+
+
+def test_rolling_risk_metrics_match_window_slices():
+    """Each rolling value equals the metric recomputed on that window's slice of the curve."""
+    rng = np.random.default_rng(0)
+    equity = pd.Series(100_000 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, 800))))
+    returns = equity.pct_change()
+
+    rolling = rolling_risk_metrics(equity, windows=[30, 90])
+
+    for w in (30, 90):
+        assert rolling[[f"sharpe_{w}", f"sortino_{w}", f"drawdown_pct_{w}"]].iloc[:w].isna().all().all()
+        sharpe = returns.rolling(w).mean() / returns.rolling(w).std() * np.sqrt(252)
+        np.testing.assert_allclose(rolling[f"sharpe_{w}"].iloc[w:], sharpe.iloc[w:], rtol=1e-9)
+        for t in range(w, len(equity), 41):
+            window = equity.iloc[t - w : t + 1]
+            assert round(rolling[f"sortino_{w}"].iloc[t], 3) == compute_risk_metrics(window)["sortino_ratio"]
+            expected_dd = (1 - window.iloc[-1] / window.max()) * 100
+            assert rolling[f"drawdown_pct_{w}"].iloc[t] == pytest.approx(expected_dd, abs=1e-12)
+
+
+def test_rolling_risk_metrics_rejects_tiny_windows():
+    with pytest.raises(ValueError, match=">= 2 bars"):
+        rolling_risk_metrics(pd.Series([1.0, 2.0, 3.0]), windows=[1])
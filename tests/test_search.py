@@ -0,0 +1,150 @@
+"""Tests for the budgeted search strategies: grid addressing, random, successive halving and Bayesian search."""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from meta_strategy.backtest import optimize_strategy
+from meta_strategy.cli import app
+from meta_strategy.search import (
+    BAYES_INITIAL,
+    bayes_suggest,
+    grid_combo,
+    grid_size,
+    halving_rungs,
+    random_sample,
+    survivors,
+)
+
+GRID = {"fast": list(range(4, 30, 2)), "slow": list(range(20, 80, 4)), "signal_length": list(range(3, 15, 2))}
+
+
+def _frame(n: int = 2000, seed: int = 3) -> pd.DataFrame:
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0.0003, 0.03, n)))
+    return pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=pd.date_range("2018-01-01", periods=n, freq="D"),
+    )
+
+
+def test_grid_combo_follows_product_order():
+    grid = {"a": [1, 2], "b": ["x", "y", "z"], "c": [0.5]}
+    expected = [dict(zip(grid, c, strict=True)) for c in itertools.product(*grid.values())]
+
+    assert grid_size(grid) == 6
+    assert [grid_combo(grid, seq) for seq in range(6)] == expected
+
+
+def test_random_sample_and_halving_schedule():
+    sample = random_sample(10**12, 50, seed=1)
+    assert sample == sorted(set(sample)) and len(sample) == 50
+    assert sample == random_sample(10**12, 50, seed=1) != random_sample(10**12, 50, seed=2)
+    assert random_sample(5, 50) == [0, 1, 2, 3, 4]
+
+    assert halving_rungs(60, 2000) == [(222, 60), (666, 20), (2000, 7)]
+    assert halving_rungs(60, 150) == [(150, 60)]
+    assert survivors({3: 1.0, 1: 2.0, 2: 1.0, 0: -np.inf}, 2) == [1, 2]
+
+
+def test_bayes_suggest_prefers_the_promising_region():
+    grid = {"x": list(range(50)), "y": list(range(50))}
+    # Scores peak at (40, 40); the GP should look near the best sampled point rather than far away
+    scores = {
+        seq: -((grid_combo(grid, seq)["x"] - 40) ** 2 + (grid_combo(grid, seq)["y"] - 40) ** 2)
+        for seq in random_sample(2500, 15, seed=4)
+    }
+    best = grid_combo(grid, max(scores, key=scores.get))
+    for seq in bayes_suggest(grid, scores, 3):
+        combo = grid_combo(grid, seq)
+        assert seq not in scores
+        assert abs(combo["x"] - best["x"]) + abs(combo["y"] - best["y"]) < 30
+
+
+def test_searches_share_the_grid_result_schema():
+    data = _frame(1200)
+    full = optimize_strategy("macd", data=data, param_grid=GRID, engine="fast")
+    by_params = {str(r["params"]): r for r in full}
+
+    for search in ("random", "halving", "bayes"):
+        results = optimize_strategy("macd", data=data, param_grid=GRID, engine="fast", search=search, budget=30)
+        assert results, search
+        assert all(r == by_params[str(r["params"])] for r in results), search
+
+
+def test_budgeted_searches_spend_their_budget():
+    data = _frame()
+    events: dict[str, list[dict]] = {}
+    best = {}
+    for search in ("random", "halving", "bayes"):
+        events[search] = []
+        results = optimize_strategy(
+            "macd",
+            data=data,
+            param_grid=GRID,
+            engine="fast",
+            split=1.0,
+            search=search,
+            budget=60,
+            on_event=events[search].append,
+        )
+        best[search] = results[0]["sharpe_ratio"]
+    combos = {search: [e for e in evs if e["event"] == "combo"] for search, evs in events.items()}
+
+    assert len(combos["random"]) == len(combos["bayes"]) == 60
+    # Halving: 60 candidates on 222 bars, 20 on 666, 7 on all 2000
+    assert [sum(e.get("bars") == bars for e in combos["halving"]) for bars in (222, 666, None)] == [60, 20, 7]
+    assert events["halving"][-1]["done"] == events["halving"][-1]["total"] == 87
+
+    grid_best = optimize_strategy("macd", data=data, param_grid=GRID, engine="fast", split=1.0, top=1)[0]
+    assert best["bayes"] == grid_best["sharpe_ratio"]  # 60 of 1,170 combinations find the optimum here
+    assert best["random"] <= best["bayes"]
+
+
+def test_bayes_stops_when_no_new_combination_is_left(monkeypatch):
+    import meta_strategy.backtest as bt_mod
+
+    data = _frame(600)
+    grid = {"fast": [4, 8, 12], "slow": [10, 14, 26], "signal_length": [9]}
+    constraints = ["fast < slow"]
+    results = optimize_strategy(
+        "macd", data=data, param_grid=grid, constraints=constraints, engine="fast", search="bayes", budget=50
+    )
+    assert len(results) == 8  # the budget exceeds the 8 feasible combinations: each runs once
+
+    # A proposal of already evaluated combinations ends the search instead of looping forever
+    monkeypatch.setattr(bt_mod, "bayes_suggest", lambda grid, scores, *args: sorted(scores)[:1])
+    events: list[dict] = []
+    optimize_strategy(
+        "macd", data=data, param_grid=GRID, engine="fast", search="bayes", budget=50, on_event=events.append
+    )
+    assert sum(e["event"] == "combo" for e in events) == BAYES_INITIAL
+
+
+def test_search_validation():
+    data = _frame(400)
+    with pytest.raises(ValueError, match="Unknown search"):
+        optimize_strategy("macd", data=data, search="anneal", budget=5)
+    with pytest.raises(ValueError, match="needs a budget"):
+        optimize_strategy("macd", data=data, search="random")
+    with pytest.raises(ValueError, match="budget applies"):
+        optimize_strategy("macd", data=data, budget=5)
+
+
+def test_optimize_search_option(tmp_path):
+    from meta_strategy.data import configure_data_source
+
+    _frame(800).to_csv(tmp_path / "TEST_1d.csv", index_label="Date")
+    args = ["--no-store", "--data-source", "dir", "--data-path", str(tmp_path), "optimize", "macd", "--symbol", "TEST"]
+    try:
+        result = CliRunner().invoke(app, [*args, "--engine", "fast", "--search", "random", "--budget", "4"])
+        missing = CliRunner().invoke(app, [*args, "--search", "bayes"])
+    finally:
+        configure_data_source()
+
+    assert result.exit_code == 0, result.output
+    assert "random search, budget 4 of 9 combinations" in result.stdout
+    assert len([line for line in result.stdout.splitlines() if line[:1].isdigit()]) == 4
+    assert missing.exit_code == 1 and "needs a budget" in missing.output
@@ -0,0 +1,220 @@
+"""Tests for the significance module: classical tests, shared bootstrap counts, Reality Check / SPA."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats as sps
+from typer.testing import CliRunner
+
+from meta_strategy.backtest import STRATEGIES, optimize_strategy, run_strategy
+from meta_strategy.cli import app
+from meta_strategy.risk import _resample_indices
+from meta_strategy.significance import (
+    bar_returns,
+    bootstrap_counts,
+    cscv,
+    deflated_sharpe,
+    grid_returns,
+    grid_significance,
+    overfitting_report,
+    paired_ttest,
+    reality_check,
+    run_significance,
+    sharpe_confidence_interval,
+    sharpe_ttest,
+    trade_ttest,
+    win_rate_test,
+)
+
+
+def _frame(n: int = 600, seed: int = 3) -> pd.DataFrame:
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.03, n)))
+    return pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=n, freq="D"),
+    )
+
+
+def test_classical_tests_match_scipy():
+    rng = np.random.default_rng(0)
+    returns = rng.normal(0.001, 0.01, (5, 300))
+    benchmark = rng.normal(0.0005, 0.01, 300)
+
+    sharpe = sharpe_ttest(returns)
+    paired = paired_ttest(returns, benchmark)
+    for k in range(5):
+        one = sps.ttest_1samp(returns[k], 0.0, alternative="greater")
+        both = sps.ttest_rel(returns[k], benchmark, alternative="greater")
+        assert sharpe["t_stat"][k] == pytest.approx(one.statistic)
+        assert sharpe["p_value"][k] == pytest.approx(one.pvalue)
+        assert paired["p_value"][k] == pytest.approx(both.pvalue)
+        assert sharpe["sharpe"][k] == pytest.approx(returns[k].mean() / returns[k].std(ddof=1) * np.sqrt(252))
+
+    trades = rng.normal(0.01, 0.05, 40)
+    assert trade_ttest(trades)["p_value"] == pytest.approx(sps.ttest_1samp(trades, 0.0, alternative="greater").pvalue)
+    assert trade_ttest(trades[:1])["p_value"] == 1.0
+    np.testing.assert_allclose(
+        win_rate_test(np.array([5, 14, 20]), 20),
+        [sps.binomtest(w, 20, 0.5, alternative="greater").pvalue for w in (5, 14, 20)],
+    )
+
+
+def test_bootstrap_counts_equal_explicit_resamples():
+    """counts @ returns gives the same resampled means as indexing each resample."""
+    returns = np.random.default_rng(1).normal(0, 0.01, (4, 250))
+    counts = bootstrap_counts(250, n_resamples=50, block_size=7, seed=9)
+    idx = _resample_indices(np.random.default_rng(9), 50, 250, 7, "stationary")
+
+    assert counts.shape == (50, 250)
+    assert (counts.sum(axis=1) == 250).all()
+    np.testing.assert_allclose(counts @ returns.T / 250, returns[:, idx].mean(axis=2).T)
+
+
+def test_sharpe_interval_covers_the_point_estimate():
+    returns = np.random.default_rng(2).normal(0.001, 0.01, (3, 500))
+    ci = sharpe_confidence_interval(returns, bootstrap_counts(500, 500))
+    sharpe = sharpe_ttest(returns)["sharpe"]
+
+    assert (ci["low"] < sharpe).all() and (sharpe < ci["high"]).all()
+
+
+def test_reality_check_separates_skill_from_snooping():
+    """A grid of pure noise is not significant; one candidate with a real edge is."""
+    noise = np.random.default_rng(4).normal(0, 0.01, (100, 750))
+    counts = bootstrap_counts(750, 500)
+
+    null = reality_check(noise, counts)
+    assert null["rc_p_value"] > 0.1 and null["spa_p_value"] > 0.1
+    # The best noise candidate looks significant on its own
+    assert sharpe_ttest(noise)["p_value"].min() < 0.05
+
+    edge = noise.copy()
+    edge[42] += 0.003
+    strong = reality_check(edge, counts)
+    assert strong["best"] == 42
+    assert strong["rc_p_value"] < 0.01 and strong["spa_p_value"] < 0.01
+    # Against a benchmark equal to the edge, it disappears again
+    assert reality_check(edge, counts, benchmark=edge[42])["rc_p_value"] > 0.05
+
+
+@pytest.mark.parametrize("engine", ["fast", "reference"])
+def test_run_significance_on_backtest_stats(engine):
+    data = _frame()
+    stats = run_strategy(data, STRATEGIES["macd"], 100_000.0, 0.001, engine)
+    report = run_significance(stats, data["Close"], n_resamples=200)
+
+    assert report["num_trades"] == len(stats["_trades"]) > 0
+    # ReturnPct is a fraction in both engines
+    assert report["mean_trade_pct"] == round(stats["_trades"]["ReturnPct"].mean() * 100, 2)
+    assert report["sharpe_ci_low"] <= report["sharpe"] <= report["sharpe_ci_high"]
+    assert 0 <= report["paired_p_value"] <= 1 and 0 <= report["win_rate_p_value"] <= 1
+
+
+def test_grid_significance_uses_kept_equity():
+    data = _frame()
+    results = optimize_strategy("macd", data=data, engine="fast", split=0.7, keep_equity=True)
+    assert all(len(r["_equity"]) == len(data) - int(len(data) * 0.7) for r in results)
+    assert all(len(r["_is_equity"]) == int(len(data) * 0.7) for r in results)
+
+    benchmark = bar_returns(data["Close"].to_numpy()[int(len(data) * 0.7) :])
+    report = grid_significance(results, benchmark, n_resamples=200)
+    assert len(report["candidates"]) == len(results)
+    assert report["reality_check"]["best_params"] in [r["params"] for r in results]
+
+    with pytest.raises(ValueError, match="keep_equity"):
+        grid_significance(optimize_strategy("macd", data=data, engine="fast", split=1.0))
+
+
+@pytest.mark.parametrize("grid", [False, True])
+def test_significance_command(tmp_path, grid):
+    from meta_strategy.data import configure_data_source
+
+    _frame().to_csv(tmp_path / "TEST_1d.csv", index_label="Date")
+    args = ["--data-source", "dir", "--data-path", str(tmp_path), "significance", "macd", "--symbol", "TEST"]
+    args += ["--engine", "fast", "--resamples", "100"] + (["--grid"] if grid else [])
+    try:
+        text = CliRunner().invoke(app, args)
+        as_json = CliRunner().invoke(app, [*args, "--json"])
+    finally:
+        configure_data_source()
+
+    assert text.exit_code == 0, text.output
+    assert ("Reality Check" in text.output) == grid
+    report = json.loads(as_json.stdout)
+    assert ("reality_check" in report) == grid
+
+
+def _cscv_brute_force(returns: np.ndarray, n_partitions: int) -> float:
+    """PBO with every split's Sharpe ratios recomputed from the raw bars."""
+    from itertools import combinations
+
+    blocks = np.array_split(np.arange(returns.shape[1]), n_partitions)
+    logits = []
+    for chosen in combinations(range(n_partitions), n_partitions // 2):
+        is_bars = np.concatenate([blocks[i] for i in chosen])
+        oos_bars = np.setdiff1d(np.arange(returns.shape[1]), is_bars)
+        is_sr = returns[:, is_bars].mean(axis=1) / returns[:, is_bars].std(axis=1, ddof=1)
+        oos_sr = returns[:, oos_bars].mean(axis=1) / returns[:, oos_bars].std(axis=1, ddof=1)
+        best = is_sr.argmax()
+        omega = ((oos_sr < oos_sr[best]).sum() + 1) / (len(returns) + 1)
+        logits.append(np.log(omega / (1 - omega)))
+    return float((np.array(logits) <= 0).mean())
+
+
+def test_cscv_matches_brute_force():
+    returns = np.random.default_rng(5).normal(0, 0.01, (12, 200))
+    result = cscv(returns, n_partitions=8)
+
+    assert result["n_splits"] == 70
+    assert result["pbo"] == pytest.approx(_cscv_brute_force(returns, 8))
+
+
+def test_pbo_and_deflated_sharpe_separate_noise_from_edge():
+    """100 combos × 16 partitions: noise overfits, a real edge does not; the analysis itself is fast."""
+    import time
+
+    noise = np.random.default_rng(6).normal(0, 0.01, (100, 2000))
+    started = time.perf_counter()
+    null, null_dsr = cscv(noise, 16), deflated_sharpe(noise)
+    assert time.perf_counter() - started < 1.0
+
+    assert null["n_splits"] == 12870
+    assert null["pbo"] > 0.3
+    assert null_dsr["deflated_sharpe"] < 0.95
+    assert null_dsr["expected_max_sharpe"] > 0
+
+    edge = noise.copy()
+    edge[7] += 0.002
+    assert cscv(edge, 16)["pbo"] < 0.05
+    assert deflated_sharpe(edge)["best"] == 7
+    assert deflated_sharpe(edge)["deflated_sharpe"] > 0.99
+
+    with pytest.raises(ValueError, match="even"):
+        cscv(noise, 5)
+
+
+def test_overfitting_report_joins_train_and_test_bars():
+    data = _frame()
+    results = optimize_strategy("macd", data=data, engine="fast", split=0.7, keep_equity=True)
+    assert grid_returns(results).shape == (len(results), len(data) - 2)
+
+    report = overfitting_report(results, n_partitions=8)
+    assert report["n_splits"] == 70
+    assert 0 <= report["pbo"] <= 1 and 0 <= report["deflated_sharpe"] <= 1
+    assert report["best_params"] in [r["params"] for r in results]
+
+
+def test_optimize_overfitting_option(tmp_path):
+    from meta_strategy.data import configure_data_source
+
+    _frame().to_csv(tmp_path / "TEST_1d.csv", index_label="Date")
+    args = ["--data-source", "dir", "--data-path", str(tmp_path), "optimize", "macd", "--symbol", "TEST"]
+    try:
+        result = CliRunner().invoke(app, [*args, "--engine", "fast", "--overfitting", "--partitions", "8"])
+    finally:
+        configure_data_source()
+
+    assert result.exit_code == 0, result.output
+    assert "PBO" in result.output and "Deflated Sharpe" in result.output
@@ -0,0 +1,142 @@
+"""Tests for the declarative parameter space: ranges, log spacing and constraint pruning."""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+from typer.testing import CliRunner
+
+from meta_strategy.backtest import optimize_strategy
+from meta_strategy.cli import app
+from meta_strategy.models import ParamRange, StrategyDefinition
+from meta_strategy.space import feasible_mask, feasible_seqs, load_space, parameter_space, prune_report
+
+BASE = {"name": "MACD", "indicator_source": "macd.pine", "entry_condition": "up", "exit_condition": "down"}
+
+
+def _frame(n: int = 600, seed: int = 5) -> pd.DataFrame:
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0.0005, 0.02, n)))
+    return pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=n, freq="D"),
+    )
+
+
+def test_param_range_expansion():
+    assert ParamRange(min=5, max=20, step=5).expand() == [5, 10, 15, 20]
+    assert ParamRange(min=1.5, max=3, step=0.5).expand() == [1.5, 2.0, 2.5, 3.0]
+    assert ParamRange(min=0, max=1, num=3).expand() == [0.0, 0.5, 1.0]
+    assert ParamRange(min=0.5, max=8, num=5, log=True).expand() == [0.5, 1.0, 2.0, 4.0, 8.0]
+    # Integer log ranges round and drop duplicates
+    assert ParamRange(min=2, max=10, num=8, log=True).expand() == [2, 3, 4, 5, 6, 8, 10]
+    assert ParamRange(values=["ema", "sma"]).expand() == ["ema", "sma"]
+
+    for bad in (
+        {"min": 5},
+        {"min": 5, "max": 1, "step": 1},
+        {"min": 1, "max": 5},
+        {"min": 0, "max": 5, "num": 3, "log": True},
+        {"values": [1], "min": 1},
+        {"values": []},
+    ):
+        with pytest.raises(ValidationError):
+            ParamRange(**bad)
+
+
+def test_definition_parameter_space():
+    defn = StrategyDefinition(
+        **BASE,
+        strategy_params={"fast": {"min": 4, "max": 8, "step": 2}, "slow": [6, 10], "signal_length": 9},
+        constraints=["fast < slow"],
+    )
+    grid, constraints = parameter_space(defn)
+
+    assert grid == {"fast": [4, 6, 8], "slow": [6, 10], "signal_length": [9]}
+    assert constraints == ["fast < slow"]
+    assert prune_report(grid, constraints) == {"combinations": 6, "feasible": 4, "pruned": 2}
+    assert StrategyDefinition(**BASE, strategy_params={"length": 30, "use_ema": True}).strategy_params == {
+        "length": 30,
+        "use_ema": True,
+    }
+
+
+@pytest.mark.parametrize(
+    "constraint, match",
+    [
+        ("fast < medium", "unknown parameter 'medium'"),
+        ("__import__('os').system('true')", "unsupported syntax Call"),
+        ("fast.real > 1", "unsupported syntax Attribute"),
+        ("fast in slow", "unsupported operator In"),
+        ("fast <", "Invalid constraint"),
+        ("9**9**9 > fast", "exponent must be a number"),
+        ("fast ** slow > 1", "exponent must be a number"),
+        ("(9**8)**8 > fast", "powers cannot be nested"),
+    ],
+)
+def test_constraints_are_validated(constraint, match):
+    with pytest.raises(ValidationError, match=match):
+        StrategyDefinition(**BASE, strategy_params={"fast": [1, 2], "slow": [3]}, constraints=[constraint])
+
+
+def test_feasible_mask_matches_product_order():
+    grid = {"a": [1, 2, 3, 4], "b": [1.0, 2.5, 4.0], "c": [0, 1]}
+    constraints = ["a < b <= 4 or c == 1", "not (a * 2 - b == 0)", "a % 2 == 0 or -c < 0", "a**2 + b**0.5 < 17"]
+    expected = [
+        (a < b <= 4 or c == 1) and a * 2 - b != 0 and (a % 2 == 0 or -c < 0) and a**2 + b**0.5 < 17
+        for a, b, c in itertools.product(*grid.values())
+    ]
+
+    assert feasible_mask(grid, constraints).tolist() == expected
+    assert feasible_seqs(grid, constraints) == [i for i, ok in enumerate(expected) if ok]
+    assert feasible_seqs(grid, []) is None
+
+
+def test_optimize_prunes_before_running():
+    data = _frame()
+    grid = {"fast": [6, 12, 20, 30], "slow": [10, 26, 40]}
+    events: list[dict] = []
+    results = optimize_strategy(
+        "macd", data=data, param_grid=grid, engine="fast", constraints=["fast < slow"], on_event=events.append
+    )
+    unconstrained = {str(r["params"]): r for r in optimize_strategy("macd", data=data, param_grid=grid, engine="fast")}
+
+    assert events[0]["pruned"] == 4 and events[0]["total"] == 8
+    assert len([e for e in events if e["event"] == "combo"]) == len(results) == 8
+    assert all(r["params"]["fast"] < r["params"]["slow"] and r == unconstrained[str(r["params"])] for r in results)
+
+    sampled = optimize_strategy(
+        "macd", data=data, param_grid=grid, engine="fast", constraints=["fast < slow"], search="bayes", budget=20
+    )
+    assert len(sampled) == 8  # the budget is capped by the feasible combinations
+    with pytest.raises(ValueError, match="No combination"):
+        optimize_strategy("macd", data=data, param_grid=grid, constraints=["fast > 100"])
+
+
+def test_shipped_macd_space_and_cli(tmp_path):
+    from meta_strategy.data import configure_data_source
+
+    grid, constraints = load_space("strategies/definitions/macd.yml")
+    report = prune_report(grid, constraints)
+    assert constraints == ["fast < slow"] and report["pruned"] > 0
+
+    space = tmp_path / "space.yml"
+    space.write_text(
+        "name: MACD\nindicator_source: macd.pine\nentry_condition: up\nexit_condition: down\n"
+        "strategy_params:\n  fast: {min: 10, max: 30, step: 10}\n  slow: [15, 25]\nconstraints: ['fast < slow']\n"
+    )
+    bogus = tmp_path / "bogus.yml"
+    bogus.write_text(space.read_text().replace("slow", "slowest"))
+    _frame().to_csv(tmp_path / "TEST_1d.csv", index_label="Date")
+    args = ["--no-store", "--data-source", "dir", "--data-path", str(tmp_path), "optimize", "macd", "--symbol", "TEST"]
+    try:
+        result = CliRunner().invoke(app, [*args, "--engine", "fast", "--space", str(space)])
+        unknown = CliRunner().invoke(app, [*args, "--space", str(bogus)])
+    finally:
+        configure_data_source()
+
+    assert result.exit_code == 0, result.output
+    assert "(3 combinations, 70% train" in result.stdout
+    assert "Constraints pruned 3 of 6 combinations (50%): 3 backtests saved" in result.stdout
+    assert unknown.exit_code == 1 and "does not have: slowest" in unknown.output
@@ -0,0 +1,184 @@
+"""Tests for the result store: fingerprints, reuse across runs, invalidation and queries."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from meta_strategy import backtest
+from meta_strategy.backtest import STRATEGIES, optimize_strategy, run_backtest
+from meta_strategy.cli import app
+from meta_strategy.store import (
+    ResultStore,
+    configure_result_store,
+    data_hash,
+    engine_identity,
+    fingerprint_base,
+    run_fingerprint,
+    source_hash,
+    store_path,
+)
+
+GRID = {"fast": [8, 12], "slow": [21, 26], "signal_length": [9]}
+
+
+def _frame(n: int = 500, seed: int = 3) -> pd.DataFrame:
+    close = 100 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.03, n)))
+    return pd.DataFrame(
+        {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": np.full(n, 1000.0)},
+        index=pd.date_range("2020-01-01", periods=n, freq="D"),
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    configure_result_store(path=tmp_path / "results.sqlite")
+    yield tmp_path / "results.sqlite"
+    configure_result_store(enabled=False)
+
+
+@pytest.fixture
+def evaluations(monkeypatch):
+    """Count the combinations actually run by the optimizer."""
+    seen: list[dict] = []
+    original = backtest._evaluate_params
+
+    def counting(train_run, test_run, params, curves=None):
+        seen.append(params)
+        return original(train_run, test_run, params, curves)
+
+    monkeypatch.setattr(backtest, "_evaluate_params", counting)
+    return seen
+
+
+def test_fingerprint_changes_with_every_input():
+    data = _frame()
+    args = ("optimize", STRATEGIES["macd"], data_hash(data), 100_000.0, 0.001, "1d", "TEST", "fast")
+    reference = run_fingerprint(fingerprint_base(*args, split=350), {"fast": 8})
+
+    assert reference == run_fingerprint(fingerprint_base(*args, split=350), {"fast": 8})
+    variants = [
+        run_fingerprint(fingerprint_base(*args, split=350), {"fast": 9}),
+        run_fingerprint(fingerprint_base(*args, split=None), {"fast": 8}),
+        run_fingerprint(fingerprint_base(*args[:3], 50_000.0, *args[4:], split=350), {"fast": 8}),
+        run_fingerprint(fingerprint_base(*args[:4], 0.002, *args[5:], split=350), {"fast": 8}),
+        run_fingerprint(fingerprint_base(*args[:5], "1h", *args[6:], split=350), {"fast": 8}),
+        run_fingerprint(fingerprint_base(*args[:7], "reference", split=350), {"fast": 8}),
+        run_fingerprint(fingerprint_base(args[0], STRATEGIES["rsi"], *args[2:], split=350), {"fast": 8}),
+    ]
+    assert len({reference, *variants}) == len(variants) + 1
+
+    changed = data.copy()
+    changed.iloc[-1, changed.columns.get_loc("Close")] += 0.01
+    assert data_hash(changed) != data_hash(data)
+    assert data_hash(data.copy()) == data_hash(data)
+
+
+def test_fingerprint_tracks_indicator_and_engine_sources(tmp_path, monkeypatch):
+    """Editing an indicator, kernel or engine module yields new fingerprints, so stale rows are not served."""
+    module = tmp_path / "fake_indicators.py"
+    module.write_text("def sma(x):\n    return x\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    before = source_hash(["fake_indicators"])
+    module.write_text("def sma(x):\n    return x * 1.0\n")
+    assert source_hash(["fake_indicators"]) != before
+
+    args = ("optimize", STRATEGIES["macd"], "bars", 100_000.0, 0.001, "1d", "TEST", "fast")
+    reference = run_fingerprint(fingerprint_base(*args), {"fast": 8})
+    monkeypatch.setattr("meta_strategy.store.engine_identity", lambda: "edited " + engine_identity())
+    assert run_fingerprint(fingerprint_base(*args), {"fast": 8}) != reference
+
+
+def test_repeated_optimize_is_served_from_the_store(store, evaluations):
+    data = _frame()
+    first = optimize_strategy("macd", data=data, param_grid=GRID, engine="fast", symbol="TEST")
+    assert len(evaluations) == 4
+
+    again = optimize_strategy("macd", data=data, param_grid=GRID, engine="fast", symbol="TEST")
+    assert len(evaluations) == 4
+    assert again == first
+
+    # A wider grid only runs the new combinations; other inputs start over
+    optimize_strategy("macd", data=data, param_grid={**GRID, "signal_length": [9, 5]}, engine="fast", symbol="TEST")
+    assert len(evaluations) == 8
+    optimize_strategy("macd", data=data, param_grid=GRID, engine="fast", symbol="TEST", commission=0.002)
+    assert len(evaluations) == 12
+    optimize_strategy("macd", data=data.iloc[1:], param_grid=GRID, engine="fast", symbol="TEST")
+    assert len(evaluations) == 16
+
+    with ResultStore(store) as results:
+        assert results.count() == 16
+
+
+def test_store_preserves_ranking_with_top(store):
+    data = _frame()
+    expected = optimize_strategy("macd", data=data, param_grid=GRID, engine="fast", rank_by="sortino_ratio")
+    optimize_strategy("macd", data=data, param_grid={**GRID, "fast": [8]}, engine="fast", rank_by="sortino_ratio")
+    served = optimize_strategy("macd", data=data, param_grid=GRID, engine="fast", rank_by="sortino_ratio", top=2)
+
+    assert served == expected[:2]
+
+
+def test_run_backtest_is_served_from_the_store(store, monkeypatch):
+    data = _frame()
+    first = run_backtest("macd", data=data, symbol="TEST", engine="fast")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("ran again")
+
+    monkeypatch.setattr(backtest, "run_strategy", fail)
+    assert run_backtest("macd", data=data, symbol="TEST", engine="fast") == first
+    closed: list[bool] = []
+    monkeypatch.setattr(ResultStore, "close", lambda self: closed.append(True) or self._conn.close())
+    with pytest.raises(AssertionError, match="ran again"):
+        run_backtest("macd", data=data, symbol="TEST", engine="fast", cash=50_000.0)
+    assert closed == [True]  # a failing run still closes the store
+
+
+def test_query_best_per_strategy_and_symbol(store):
+    for symbol, seed in (("AAA", 1), ("BBB", 2)):
+        for name in ("macd", "rsi"):
+            optimize_strategy(name, data=_frame(seed=seed), engine="fast", symbol=symbol, split=1.0)
+
+    with ResultStore(store) as results:
+        best = results.query("sharpe_ratio", ("strategy", "symbol"))
+        everything = results.query("sharpe_ratio", (), kind="optimize", strategy="rsi", symbol="AAA")
+        with pytest.raises(ValueError, match="Unknown metric"):
+            results.query("profit")
+        with pytest.raises(ValueError, match="Unknown column"):
+            results.query(best_per=("params",))
+
+    assert {(r["strategy"], r["symbol"]) for r in best} == {(s, y) for s in ("macd", "rsi") for y in ("AAA", "BBB")}
+    assert [r["sharpe_ratio"] for r in best] == sorted((r["sharpe_ratio"] for r in best), reverse=True)
+    assert max(r["sharpe_ratio"] for r in everything) == next(
+        r["sharpe_ratio"] for r in best if (r["strategy"], r["symbol"]) == ("rsi", "AAA")
+    )
+
+
+def test_results_query_command(tmp_path):
+    from meta_strategy.data import configure_data_source
+
+    _frame().to_csv(tmp_path / "TEST_1d.csv", index_label="Date")
+    args = ["--data-source", "dir", "--data-path", str(tmp_path)]
+    try:
+        ran = CliRunner().invoke(app, [*args, "optimize", "macd", "--symbol", "TEST", "--engine", "fast"])
+        assert ran.exit_code == 0, ran.output
+        assert store_path().exists()
+        text = CliRunner().invoke(app, ["results", "query"])
+        as_json = CliRunner().invoke(app, ["results", "query", "--per", "", "--json", "--limit", "3"])
+        bad = CliRunner().invoke(app, ["results", "query", "--metric", "profit"])
+        cleared = CliRunner().invoke(app, ["results", "clear"])
+        skipped = CliRunner().invoke(app, [*args, "--no-store", "backtest", "macd", "--symbol", "TEST"])
+    finally:
+        configure_data_source()
+
+    assert text.exit_code == 0, text.output
+    assert "macd" in text.output and "TEST" in text.output
+    assert len(json.loads(as_json.stdout)) == 3
+    assert bad.exit_code == 1
+    assert "Removed" in cleared.output
+    assert skipped.exit_code == 0, skipped.output
+    with ResultStore(store_path()) as results:
+        assert results.count() == 0
@@ -0,0 +1,150 @@
+"""Replay tests: incremental indicators and signal streams against the batch functions."""
+
+import itertools
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from meta_strategy.backtest import PARAM_GRIDS, STRATEGIES, macd_line, macd_signal, supertrend
+from meta_strategy.batch import ema_matrix, rolling_mean_matrix, rolling_std_matrix, rsi_matrix
+from meta_strategy.cli import app
+from meta_strategy.fast import prepare, run_fast
+from meta_strategy.stream import (
+    EMA,
+    MACD,
+    RSI,
+    Bar,
+    RollingWindow,
+    SignalStream,
+    SuperTrendState,
+    parse_bars,
+)
+
+
+def _prices(n: int = 2000, seed: int = 1) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    x = 3e-4 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    x[500:560] = x[500]  # a flat stretch exercises the identical-window path
+    return x
+
+
+def _bars(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.03, n)))
+    opn = close * (1 + rng.normal(0, 0.005, n))
+    return pd.DataFrame(
+        {
+            "Open": opn,
+            "High": np.maximum(opn, close) * 1.01,
+            "Low": np.minimum(opn, close) * 0.99,
+            "Close": close,
+            "Volume": np.full(n, 1000.0),
+        },
+        index=pd.date_range("2019-01-01", periods=n, freq="h", tz="UTC"),
+    )
+
+
+def _replay(data: pd.DataFrame) -> list[Bar]:
+    return [Bar(str(r.Index), r.Open, r.High, r.Low, r.Close, r.Volume) for r in data.itertuples()]
+
+
+@pytest.mark.parametrize("length", [1, 2, 5, 20, 100])
+def test_rolling_window_replays_batch_exactly(length):
+    """Mean and std match rolling_mean_matrix / rolling_std_matrix bit for bit, across segment boundaries."""
+    x = _prices()
+    window = RollingWindow(length)
+    out = np.array([window.update(v) for v in x])
+
+    np.testing.assert_array_equal(out[:, 0], rolling_mean_matrix(x, [length])[:, 0])
+    np.testing.assert_array_equal(out[:, 1], rolling_std_matrix(x, [length])[:, 0])
+
+
+@pytest.mark.parametrize("length", [2, 12, 26])
+def test_ewm_states_replay_batch_exactly(length):
+    x = _prices()
+    ema, rsi = EMA(length), RSI(length)
+
+    np.testing.assert_array_equal([ema.update(v) for v in x], ema_matrix(x, [length])[:, 0])
+    np.testing.assert_array_equal([rsi.update(v) for v in x], rsi_matrix(x, [length])[:, 0])
+
+
+def test_macd_and_supertrend_replay_batch_exactly():
+    x = _prices()
+    close = pd.Series(x)
+    state = MACD(8, 21, 5)
+    macd = np.array([state.update(v) for v in x])
+    np.testing.assert_array_equal(macd[:, 0], macd_line(close, 8, 21).to_numpy())
+    np.testing.assert_array_equal(macd[:, 1], macd_signal(close, 8, 21, 5).to_numpy())
+
+    high, low = x * 1.01, x * 0.99
+    for period, factor in [(10, 3.0), (1, 1.5)]:
+        trend = SuperTrendState(period, factor)
+        line, direction = zip(*(trend.update(h, lo, c) for h, lo, c in zip(high, low, x, strict=True)), strict=True)
+        expected = supertrend(high, low, x, period, factor)
+        np.testing.assert_array_equal(line, expected.line)
+        np.testing.assert_array_equal(direction, expected.direction)
+
+
+@pytest.mark.parametrize("strategy_name", list(STRATEGIES))
+def test_signal_stream_matches_fast_engine(strategy_name):
+    """Per-bar signals equal signals(), and the events are exactly the fast engine's trades."""
+    data = _bars(1200, seed=3)
+    prepared = prepare(data)
+    grid = PARAM_GRIDS[strategy_name]
+    combos = [{}] + [dict(zip(grid, c, strict=True)) for c in itertools.islice(itertools.product(*grid.values()), 2)]
+
+    for params in combos:
+        entries, exits, indicators = STRATEGIES[strategy_name].signals(prepared.frame, **params)
+        steps = list(map(SignalStream(strategy_name, **params).step, _replay(data)))
+        np.testing.assert_array_equal([s[0] for s in steps], entries)
+        np.testing.assert_array_equal([s[1] for s in steps], exits)
+        for k, indicator in enumerate(indicators):
+            np.testing.assert_array_equal([s[2][k] for s in steps], np.asarray(indicator, dtype=float))
+
+        stream = SignalStream(strategy_name, **params)
+        events = [e for e in map(stream.update, _replay(data)) if e is not None]
+        trades = run_fast(STRATEGIES[strategy_name], prepared, **params)["_trades"]
+        expected = [
+            pair
+            for entry_bar, exit_bar in zip(trades["EntryBar"], trades["ExitBar"], strict=True)
+            for pair in (("entry", entry_bar - 1), ("exit", exit_bar - 1))
+        ]
+        assert [(e["event"], e["bar"]) for e in events][: len(expected)] == expected
+        assert len(events) - len(expected) <= 2  # a position still open at the end
+        assert stream.latency_stats()["bars"] == len(data)
+
+
+def test_signal_stream_rejects_bad_input():
+    with pytest.raises(AttributeError, match="missing parameter"):
+        SignalStream("macd", nope=1)
+    with pytest.raises(ValueError, match="Unknown strategy"):
+        SignalStream("turbo")
+    with pytest.raises(ValueError, match="non-finite"):
+        SignalStream("rsi").update(Bar("t", 1.0, 1.0, float("nan"), 1.0))
+
+
+def test_parse_bars_with_and_without_header():
+    with_header = list(parse_bars(["Timestamp,Open,High,Low,Close,Volume", "2024-01-01,1,2,0.5,1.5,10", ""]))
+    positional = list(parse_bars(["2024-01-01,1,2,0.5,1.5"]))
+
+    assert with_header == [Bar("2024-01-01", 1.0, 2.0, 0.5, 1.5, 10.0)]
+    assert positional == [Bar("2024-01-01", 1.0, 2.0, 0.5, 1.5, 0.0)]
+    with pytest.raises(ValueError, match="Malformed"):
+        list(parse_bars(["2024-01-01,1,2"]))
+
+
+def test_stream_command_prints_json_events():
+    """`stream` reads CSV bars from stdin and prints one JSON object per event."""
+    data = _bars(400, seed=5)
+    csv = data.to_csv(index_label="Timestamp")
+
+    result = CliRunner().invoke(app, ["stream", "macd", "--param", "fast=8"], input=csv)
+
+    assert result.exit_code == 0, result.output
+    events = [json.loads(line) for line in result.stdout.splitlines() if line.startswith("{")]
+    assert events and events[0]["event"] == "entry"
+    assert {e["event"] for e in events} <= {"entry", "exit"}
+    assert "latency per bar" in result.output